@@ -10,14 +10,22 @@ from .settings import (
     LOGS_DIR,
     DATA_DIR,
     MODELS_DIR,
+    DEFAULTS_PATH,
+    USER_AGENTS_PATH,
     DB_CONFIG,
     LOG_CONFIG,
     CRAWLER_CONFIG,
     ML_CONFIG,
+    DEFAULT_USER_AGENTS,
+    env,
+    env_bool,
+    invalidate_env,
     load_defaults,
     load_domain_config,
     get_user_agent_list,
+    clear_config_cache,
     get_connection_string,
+    reset_connection_string,
     DEFAULT_CONFIG,
 )
 
@@ -27,13 +35,21 @@ __all__ = [
     "LOGS_DIR",
     "DATA_DIR",
     "MODELS_DIR",
+    "DEFAULTS_PATH",
+    "USER_AGENTS_PATH",
     "DB_CONFIG",
     "LOG_CONFIG",
     "CRAWLER_CONFIG",
     "ML_CONFIG",
+    "DEFAULT_USER_AGENTS",
+    "env",
+    "env_bool",
+    "invalidate_env",
     "load_defaults",
     "load_domain_config",
     "get_user_agent_list",
+    "clear_config_cache",
     "get_connection_string",
+    "reset_connection_string",
     "DEFAULT_CONFIG",
 ]
@@ -0,0 +1,109 @@
+"""
+ماژول کش فایل‌های پیکربندی JSON
+
+این ماژول نسخه تجزیه‌شده فایل‌های JSON را به صورت pickle روی دیسک ذخیره می‌کند
+تا در اجراهای بعدی نیازی به تجزیه مجدد JSON نباشد. کلید کش از مسیر فایل و
+زمان آخرین تغییر آن ساخته می‌شود، بنابراین با تغییر فایل کش خودبه‌خود نامعتبر می‌شود.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import functools
+from pathlib import Path
+
+# تلاش برای import orjson (تجزیه سریع‌تر JSON)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# مسیر پوشه کش روی دیسک
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'legal_crawler')
+
+
+def _cache_key(path, mtime):
+    """
+    ساخت کلید کش بر اساس مسیر و زمان تغییر فایل
+
+    Args:
+        path: مسیر فایل
+        mtime: زمان آخرین تغییر فایل
+
+    Returns:
+        str: کلید هش‌شده
+    """
+    return hashlib.sha1(f"{path}{mtime}".encode('utf-8')).hexdigest()
+
+
+def _read_json(path):
+    """
+    خواندن و تجزیه یک فایل JSON (با orjson در صورت وجود)
+
+    Args:
+        path: مسیر فایل JSON
+
+    Returns:
+        داده تجزیه‌شده فایل
+    """
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_by_key(path, key):
+    """
+    بارگذاری فایل JSON از کش دیسک یا خود فایل
+
+    Args:
+        path: مسیر فایل JSON
+        key: کلید کش فایل
+
+    Returns:
+        داده تجزیه‌شده فایل
+    """
+    cache_path = os.path.join(CACHE_DIR, f"{key}.pkl")
+
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass
+
+    data = _read_json(path)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # خطای نوشتن کش نباید مانع بارگذاری تنظیمات شود
+        pass
+
+    return data
+
+
+def load_json_cached(path):
+    """
+    بارگذاری یک فایل JSON با استفاده از کش حافظه و دیسک
+
+    Args:
+        path: مسیر فایل JSON
+
+    Returns:
+        داده تجزیه‌شده فایل
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    return _load_by_key(path, _cache_key(path, mtime))
+
+
+def clear_memory_cache():
+    """پاک‌سازی کش حافظه (کش دیسک دست‌نخورده باقی می‌ماند)"""
+    _load_by_key.cache_clear()
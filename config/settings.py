@@ -6,154 +6,264 @@
 """
 
 import os
-import json
 import logging
+import functools
+from types import MappingProxyType
 from pathlib import Path
 from dotenv import load_dotenv
 
+from config._cache import load_json_cached, clear_memory_cache, _read_json
+
 # بارگذاری متغیرهای محیطی از فایل .env
 load_dotenv()
 
+# کش مقادیر خام متغیرهای محیطی (پس از اولین خواندن)
+_env_cache = {}
+_MISSING = object()
+
+
+def _read_env(name):
+    """
+    خواندن مقدار خام یک متغیر محیطی با استفاده از کش
+
+    Args:
+        name: نام متغیر محیطی
+
+    Returns:
+        str: مقدار متغیر یا None در صورت عدم وجود
+    """
+    value = _env_cache.get(name, _MISSING)
+    if value is _MISSING:
+        value = os.getenv(name)
+        _env_cache[name] = value
+    return value
+
+
+def env(name, default=None, cast=str):
+    """
+    دریافت مقدار یک متغیر محیطی با تبدیل نوع
+
+    Args:
+        name: نام متغیر محیطی
+        default: مقدار پیش‌فرض در صورت عدم وجود متغیر
+        cast: تابع تبدیل نوع (مانند int یا float)
+
+    Returns:
+        مقدار تبدیل‌شده متغیر یا مقدار پیش‌فرض
+    """
+    value = _read_env(name)
+    if value is None:
+        value = default
+    if value is None or cast is None:
+        return value
+    return cast(value)
+
+
+def env_bool(name, default=False):
+    """
+    دریافت مقدار بولی یک متغیر محیطی
+
+    Args:
+        name: نام متغیر محیطی
+        default: مقدار پیش‌فرض در صورت عدم وجود متغیر
+
+    Returns:
+        bool: مقدار بولی متغیر
+    """
+    value = _read_env(name)
+    if value is None:
+        return default
+    return value.lower() in ('true', '1', 't')
+
+
+def invalidate_env(name=None):
+    """
+    حذف مقدار کش‌شده یک متغیر محیطی (یا همه متغیرها)
+
+    Args:
+        name: نام متغیر محیطی (None برای پاک‌سازی کامل کش)
+    """
+    if name is None:
+        _env_cache.clear()
+    else:
+        _env_cache.pop(name, None)
+
+
 # مسیرهای پایه پروژه
 BASE_DIR = Path(__file__).resolve().parent.parent
-CONFIG_DIR = os.path.join(BASE_DIR, 'config')
-LOGS_DIR = os.path.join(BASE_DIR, 'logs')
-DATA_DIR = os.path.join(BASE_DIR, 'data')
-MODELS_DIR = os.path.join(BASE_DIR, 'ml', 'models')
+CONFIG_DIR = BASE_DIR / 'config'
+LOGS_DIR = BASE_DIR / 'logs'
+DATA_DIR = BASE_DIR / 'data'
+MODELS_DIR = BASE_DIR / 'ml' / 'models'
+
+# مسیر فایل‌های پیکربندی
+DEFAULTS_PATH = CONFIG_DIR / 'defaults.json'
+USER_AGENTS_PATH = CONFIG_DIR / 'user_agents.json'
 
 # ایجاد دایرکتوری‌های مورد نیاز
-os.makedirs(LOGS_DIR, exist_ok=True)
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(MODELS_DIR, exist_ok=True)
+LOGS_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+MODELS_DIR.mkdir(parents=True, exist_ok=True)
+
+# لیست پیش‌فرض User-Agent ها (در صورت نبود فایل پیکربندی)
+DEFAULT_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36 Edg/92.0.902.55",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36",
+)
 
 # تنظیمات پایگاه داده
 DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': int(os.getenv('DB_PORT', 3306)),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', ''),
-    'name': os.getenv('DB_NAME', 'legal_crawler'),
+    'host': env('DB_HOST', 'localhost'),
+    'port': env('DB_PORT', 3306, int),
+    'user': env('DB_USER', 'root'),
+    'password': env('DB_PASSWORD', ''),
+    'name': env('DB_NAME', 'legal_crawler'),
     'charset': 'utf8mb4',
-    'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
-    'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
-    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+    'pool_size': env('DB_POOL_SIZE', 10, int),
+    'max_overflow': env('DB_MAX_OVERFLOW', 20, int),
+    'pool_recycle': env('DB_POOL_RECYCLE', 3600, int),
 }
 
 # تنظیمات لاگ‌گیری
 LOG_CONFIG = {
-    'level': os.getenv('LOG_LEVEL', 'INFO'),
+    'level': env('LOG_LEVEL', 'INFO'),
     'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
     'date_format': '%Y-%m-%d %H:%M:%S',
-    'file_size': int(os.getenv('LOG_FILE_SIZE', 10 * 1024 * 1024)),  # 10 مگابایت
-    'backup_count': int(os.getenv('LOG_BACKUP_COUNT', 5)),
+    'file_size': env('LOG_FILE_SIZE', 10 * 1024 * 1024, int),  # 10 مگابایت
+    'backup_count': env('LOG_BACKUP_COUNT', 5, int),
 }
 
 # تنظیمات خزشگر
 CRAWLER_CONFIG = {
-    'max_threads': int(os.getenv('MAX_THREADS', 4)),
-    'max_depth': int(os.getenv('MAX_DEPTH', 5)),
-    'politeness_delay': float(os.getenv('CRAWL_DELAY', 1.0)),
-    'respect_robots': os.getenv('RESPECT_ROBOTS', 'True').lower() in ('true', '1', 't'),
-    'max_retries': int(os.getenv('MAX_RETRIES', 3)),
-    'timeout': int(os.getenv('REQUEST_TIMEOUT', 30)),
-    'checkpoint_interval': int(os.getenv('CHECKPOINT_INTERVAL', 300)),  # 5 دقیقه
-    'use_selenium': os.getenv('USE_SELENIUM', 'False').lower() in ('true', '1', 't'),
+    'max_threads': env('MAX_THREADS', 4, int),
+    'max_depth': env('MAX_DEPTH', 5, int),
+    'politeness_delay': env('CRAWL_DELAY', 1.0, float),
+    'respect_robots': env_bool('RESPECT_ROBOTS', True),
+    'max_retries': env('MAX_RETRIES', 3, int),
+    'timeout': env('REQUEST_TIMEOUT', 30, int),
+    'checkpoint_interval': env('CHECKPOINT_INTERVAL', 300, int),  # 5 دقیقه
+    'use_selenium': env_bool('USE_SELENIUM', False),
+    'classifier_parallel': env_bool('CLASSIFIER_PARALLEL', True),
 }
 
 # تنظیمات هوش مصنوعی و یادگیری ماشین
 ML_CONFIG = {
-    'content_model_path': os.getenv('CONTENT_MODEL_PATH', os.path.join(MODELS_DIR, 'content_type_classifier.pkl')),
-    'domain_model_path': os.getenv('DOMAIN_MODEL_PATH', os.path.join(MODELS_DIR, 'domain_classifier.pkl')),
-    'features_path': os.getenv('FEATURES_PATH', os.path.join(MODELS_DIR, 'features')),
-    'min_confidence': float(os.getenv('MIN_CONFIDENCE', 0.6)),
-    'model_update_interval': int(os.getenv('MODEL_UPDATE_INTERVAL', 24 * 60 * 60)),  # 24 ساعت
-    'auto_train': os.getenv('AUTO_TRAIN', 'False').lower() in ('true', '1', 't'),
+    'content_model_path': env('CONTENT_MODEL_PATH', MODELS_DIR / 'content_type_classifier.pkl'),
+    'domain_model_path': env('DOMAIN_MODEL_PATH', MODELS_DIR / 'domain_classifier.pkl'),
+    'features_path': env('FEATURES_PATH', MODELS_DIR / 'features'),
+    'min_confidence': env('MIN_CONFIDENCE', 0.6, float),
+    'model_update_interval': env('MODEL_UPDATE_INTERVAL', 24 * 60 * 60, int),  # 24 ساعت
+    'auto_train': env_bool('AUTO_TRAIN', False),
 }
 
 
+@functools.lru_cache(maxsize=None)
 def load_defaults():
     """
     بارگذاری تنظیمات پیش‌فرض از فایل JSON
 
+    نتیجه یک بار در هر فرایند خوانده و به صورت فقط‌خواندنی کش می‌شود.
+
     Returns:
-        dict: دیکشنری تنظیمات پیش‌فرض
+        MappingProxyType: دیکشنری فقط‌خواندنی تنظیمات پیش‌فرض
     """
-    default_path = os.path.join(CONFIG_DIR, 'defaults.json')
-
     try:
-        if os.path.exists(default_path):
-            with open(default_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        if DEFAULTS_PATH.exists():
+            return MappingProxyType(load_json_cached(DEFAULTS_PATH))
         else:
-            print(f"فایل تنظیمات پیش‌فرض یافت نشد: {default_path}")
-            return {}
+            print(f"فایل تنظیمات پیش‌فرض یافت نشد: {DEFAULTS_PATH}")
+            return MappingProxyType({})
     except Exception as e:
         print(f"خطا در بارگذاری تنظیمات پیش‌فرض: {str(e)}")
-        return {}
+        return MappingProxyType({})
 
 
+@functools.lru_cache(maxsize=None)
 def load_domain_config(domain):
     """
     بارگذاری تنظیمات مخصوص دامنه از فایل JSON
 
+    نتیجه برای هر دامنه یک بار خوانده و به صورت فقط‌خواندنی کش می‌شود.
+
     Args:
         domain: نام دامنه
 
     Returns:
-        dict: دیکشنری تنظیمات دامنه
+        MappingProxyType: دیکشنری فقط‌خواندنی تنظیمات دامنه
     """
-    domain_config_path = os.path.join(CONFIG_DIR, f"{domain}_config.json")
+    domain_config_path = CONFIG_DIR / f"{domain}_config.json"
 
     try:
-        if os.path.exists(domain_config_path):
-            with open(domain_config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        if domain_config_path.exists():
+            return MappingProxyType(load_json_cached(domain_config_path))
         else:
-            return {}
+            return MappingProxyType({})
     except Exception as e:
         print(f"خطا در بارگذاری تنظیمات دامنه {domain}: {str(e)}")
-        return {}
+        return MappingProxyType({})
 
 
+@functools.lru_cache(maxsize=None)
 def get_user_agent_list():
     """
     دریافت لیست User-Agent ها از فایل پیکربندی یا مقادیر پیش‌فرض
 
     Returns:
-        list: لیست User-Agent ها
+        tuple: لیست User-Agent ها
     """
-    user_agents_path = os.path.join(CONFIG_DIR, 'user_agents.json')
-
-    default_user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36 Edg/92.0.902.55",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-    ]
-
     try:
-        if os.path.exists(user_agents_path):
-            with open(user_agents_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        if USER_AGENTS_PATH.exists():
+            return tuple(_read_json(USER_AGENTS_PATH))
         else:
-            return default_user_agents
+            return DEFAULT_USER_AGENTS
     except Exception as e:
         print(f"خطا در بارگذاری لیست User-Agent ها: {str(e)}")
-        return default_user_agents
+        return DEFAULT_USER_AGENTS
+
+
+def clear_config_cache():
+    """
+    پاک‌سازی کش فایل‌های پیکربندی تا خواندن بعدی دوباره از دیسک انجام شود
+    """
+    load_defaults.cache_clear()
+    load_domain_config.cache_clear()
+    get_user_agent_list.cache_clear()
+    clear_memory_cache()
 
 
+@functools.lru_cache(maxsize=1)
 def get_connection_string():
     """
     ایجاد رشته اتصال پایگاه داده بر اساس تنظیمات
 
+    رشته اتصال یک بار ساخته و کش می‌شود؛ پس از تغییر DB_CONFIG باید
+    reset_connection_string فراخوانی شود.
+
     Returns:
         str: رشته اتصال SQLAlchemy
     """
-    return (f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@"
-            f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['name']}?"
-            f"charset={DB_CONFIG['charset']}")
+    db_config = DB_CONFIG
+    user = db_config['user']
+    password = db_config['password']
+    host = db_config['host']
+    port = db_config['port']
+    name = db_config['name']
+    charset = db_config['charset']
+
+    return (f"mysql+pymysql://{user}:{password}@"
+            f"{host}:{port}/{name}?"
+            f"charset={charset}")
+
+
+def reset_connection_string():
+    """
+    پاک‌سازی رشته اتصال کش‌شده (پس از بارگذاری مجدد تنظیمات پایگاه داده)
+    """
+    get_connection_string.cache_clear()
 
 
 # بارگذاری تنظیمات پیش‌فرض
@@ -6,13 +6,35 @@
 """
 
 import os
+import re
+import copy
 import pickle
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from collections import OrderedDict
+import joblib
 import numpy as np
+from scipy.special import expit, softmax
 from typing import List, Dict, Tuple, Union, Optional, Any
 
 from sklearn.base import BaseEstimator
 
+# تلاش برای import pyahocorasick (جستجوی چندالگویی در یک گذر)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# تلاش برای import re2 (موتور عبارت منظم خطی بدون backtracking)
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 from utils.logger import get_logger
+from config.settings import CRAWLER_CONFIG
 from ml.features import (DomainFeatures, ContentTypeFeatures,
                         LEGAL_DOMAINS_KEYWORDS, CONTENT_TYPE_KEYWORDS)
 
@@ -22,6 +44,78 @@ logger = get_logger(__name__)
 # مسیر پیش‌فرض مدل‌های ذخیره شده
 MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
 
+# حداکثر تعداد نتایج پیش‌بینی کش‌شده برای هر طبقه‌بندی کننده
+PREDICTION_CACHE_SIZE = 4096
+
+# کلیدواژه‌های تحلیل اضافی محتواهای سؤال و پاسخ
+_QUESTION_INDICATORS = ('آیا', 'چرا', 'چگونه', 'چطور', 'چیست', 'کیست', 'کجاست')
+_LAW_REFERENCES = ('ماده', 'قانون', 'آیین‌نامه', 'بخشنامه', 'دستورالعمل')
+
+
+def _build_matcher(keywords):
+    """
+    ساخت جستجوگر چندالگویی برای مجموعه‌ای از کلیدواژه‌ها
+
+    در صورت وجود pyahocorasick از خودکار Aho-Corasick و در غیر این صورت از یک
+    عبارت منظم ترکیبی (با re2 در صورت وجود) استفاده می‌شود.
+
+    Args:
+        keywords: لیست کلیدواژه‌ها
+
+    Returns:
+        خودکار Aho-Corasick یا عبارت منظم کامپایل‌شده
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for index, keyword in enumerate(keywords):
+            automaton.add_word(keyword, index)
+        automaton.make_automaton()
+        return automaton
+
+    # کلیدواژه‌های بلندتر ابتدا قرار می‌گیرند تا پیشوندهای کوتاه‌تر آن‌ها را نپوشانند
+    pattern = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return (re2 or re).compile(pattern)
+
+
+def _find_keywords(text, keywords, matcher):
+    """
+    یافتن کلیدواژه‌های موجود در متن با یک گذر روی متن
+
+    Args:
+        text: متن ورودی
+        keywords: لیست کلیدواژه‌ها
+        matcher: جستجوگر ساخته‌شده با _build_matcher
+
+    Returns:
+        list: کلیدواژه‌های یافت‌شده به ترتیب لیست کلیدواژه‌ها
+    """
+    if ahocorasick is not None:
+        found = {index for _, index in matcher.iter(text)}
+        return [keywords[index] for index in sorted(found)]
+
+    found = {match.group() for match in matcher.finditer(text)}
+    return [keyword for keyword in keywords if keyword in found]
+
+
+_QUESTION_MATCHER = _build_matcher(_QUESTION_INDICATORS)
+_LAW_MATCHER = _build_matcher(_LAW_REFERENCES)
+
+
+@functools.lru_cache(maxsize=1)
+def _list_model_files() -> Tuple[Tuple[float, str, str], ...]:
+    """
+    فهرست فایل‌های مدل موجود در پوشه مدل‌ها (یک بار برای همه طبقه‌بندی کننده‌ها)
+
+    Returns:
+        Tuple: سه‌تایی‌های (زمان تغییر، نام فایل، مسیر فایل)
+    """
+    if not os.path.exists(MODEL_DIR):
+        return ()
+
+    with os.scandir(MODEL_DIR) as it:
+        return tuple((entry.stat().st_mtime, entry.name, entry.path) for entry in it
+                     if entry.name.endswith('.pkl'))
+
 
 class BaseClassifier:
     """کلاس پایه برای طبقه‌بندی کننده‌ها"""
@@ -36,11 +130,31 @@ class BaseClassifier:
         self.model = None
         self.feature_extractor = None
         self.label_transformer = None  # encoder یا binarizer
+        self._classes = ()  # برچسب‌های مدل به صورت tuple (پس از بارگذاری)
+        self._n_classes = 0
         self.model_path = model_path
         self.model_loaded = False
 
-        # بارگذاری مدل در صورت ارائه مسیر
-        if model_path:
+        # کش LRU نتایج پیش‌بینی برای متون تکراری (کلید: هش متن تا خود متن‌ها در حافظه نمانند)
+        self._pred_cache: OrderedDict = OrderedDict()
+        self._pred_cache_lock = threading.Lock()
+
+        # بارگذاری مدل تا اولین استفاده به تعویق می‌افتد
+        self._pending_model_path = model_path
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """
+        بارگذاری مدل معوق در اولین استفاده (فقط یک بار تلاش می‌شود)
+        """
+        if self.model_loaded or not self._pending_model_path:
+            return
+
+        with self._load_lock:
+            model_path = self._pending_model_path
+            if self.model_loaded or not model_path:
+                return
+            self._pending_model_path = None
             self.load_model(model_path)
 
     def load_model(self, model_path: str) -> bool:
@@ -58,11 +172,19 @@ class BaseClassifier:
                 logger.error(f"فایل مدل {model_path} یافت نشد")
                 return False
 
-            with open(model_path, 'rb') as f:
-                model_package = pickle.load(f)
+            try:
+                # نگاشت حافظه آرایه‌های بزرگ مدل به جای بارگذاری کامل در heap
+                model_package = joblib.load(model_path, mmap_mode='r')
+            except (KeyError, pickle.UnpicklingError):
+                # سازگاری با مدل‌های قدیمی ذخیره‌شده با pickle
+                with open(model_path, 'rb') as f:
+                    model_package = pickle.load(f)
 
             self.model = model_package.get('model')
             self.label_transformer = model_package.get('label_encoder') or model_package.get('mlb')
+            if self.label_transformer is not None:
+                self._classes = tuple(self.label_transformer.classes_.tolist())
+                self._n_classes = len(self._classes)
 
             # بارگذاری استخراج‌کننده ویژگی
             feature_extractor_path = model_package.get('feature_extractor_path')
@@ -75,6 +197,8 @@ class BaseClassifier:
 
             self.model_path = model_path
             self.model_loaded = True
+            with self._pred_cache_lock:
+                self._pred_cache.clear()
             logger.info(f"مدل با موفقیت از {model_path} بارگذاری شد")
             return True
 
@@ -83,6 +207,31 @@ class BaseClassifier:
             self.model_loaded = False
             return False
 
+    @classmethod
+    def _find_latest_model(cls, prefix: str) -> Optional[str]:
+        """
+        یافتن جدیدترین فایل مدل با پیشوند مشخص
+
+        Args:
+            prefix: پیشوند نام فایل
+
+        Returns:
+            str: مسیر فایل یا None در صورت عدم وجود
+        """
+        # یافتن تمام فایل‌های با پیشوند مشخص به همراه زمان تغییر
+        entries = [(mtime, path) for mtime, name, path in _list_model_files()
+                   if name.startswith(prefix)]
+
+        # انتخاب جدیدترین فایل
+        return max(entries)[1] if entries else None
+
+    @classmethod
+    def clear_model_cache(cls):
+        """
+        پاک‌سازی فهرست کش‌شده فایل‌های مدل (پس از افزودن یا جایگزینی مدل‌ها)
+        """
+        _list_model_files.cache_clear()
+
     def _load_feature_extractor(self, path: str):
         """
         بارگذاری استخراج‌کننده ویژگی (در زیرکلاس‌ها پیاده‌سازی می‌شود)
@@ -100,7 +249,34 @@ class BaseClassifier:
 
     def predict(self, text: str) -> Dict:
         """
-        پیش‌بینی برای یک متن
+        پیش‌بینی برای یک متن (با استفاده از کش نتایج متون تکراری)
+
+        Args:
+            text: متن ورودی
+
+        Returns:
+            Dict: نتیجه پیش‌بینی
+        """
+        self._ensure_loaded()
+
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        with self._pred_cache_lock:
+            result = self._pred_cache.get(key)
+            if result is not None:
+                self._pred_cache.move_to_end(key)
+
+        if result is None:
+            result = self._predict_uncached(text)
+            with self._pred_cache_lock:
+                self._pred_cache[key] = result
+                if len(self._pred_cache) > PREDICTION_CACHE_SIZE:
+                    self._pred_cache.popitem(last=False)
+
+        return copy.deepcopy(result)
+
+    def _predict_uncached(self, text: str) -> Dict:
+        """
+        پیش‌بینی برای یک متن بدون کش (در زیرکلاس‌ها پیاده‌سازی می‌شود)
 
         Args:
             text: متن ورودی
@@ -129,6 +305,7 @@ class BaseClassifier:
         Returns:
             bool: آیا طبقه‌بندی کننده آماده است؟
         """
+        self._ensure_loaded()
         return (self.model is not None and
                 self.feature_extractor is not None and
                 self.label_transformer is not None and
@@ -151,33 +328,6 @@ class DomainClassifier(BaseClassifier):
 
         super().__init__(model_path)
 
-    def _find_latest_model(self, prefix: str) -> Optional[str]:
-        """
-        یافتن جدیدترین فایل مدل با پیشوند مشخص
-
-        Args:
-            prefix: پیشوند نام فایل
-
-        Returns:
-            str: مسیر فایل یا None در صورت عدم وجود
-        """
-        if not os.path.exists(MODEL_DIR):
-            return None
-
-        # یافتن تمام فایل‌های با پیشوند مشخص
-        matching_files = [f for f in os.listdir(MODEL_DIR)
-                         if f.startswith(prefix) and f.endswith('.pkl')]
-
-        if not matching_files:
-            return None
-
-        # مرتب‌سازی بر اساس زمان تغییر فایل (نزولی)
-        matching_files.sort(key=lambda f: os.path.getmtime(os.path.join(MODEL_DIR, f)),
-                           reverse=True)
-
-        # انتخاب جدیدترین فایل
-        return os.path.join(MODEL_DIR, matching_files[0])
-
     def _load_feature_extractor(self, path: str):
         """
         بارگذاری استخراج‌کننده ویژگی حوزه تخصصی
@@ -197,7 +347,7 @@ class DomainClassifier(BaseClassifier):
         logger.info("ایجاد استخراج‌کننده ویژگی پیش‌فرض حوزه تخصصی")
         self.feature_extractor = DomainFeatures()
 
-    def predict(self, text: str) -> Dict:
+    def _predict_uncached(self, text: str) -> Dict:
         """
         پیش‌بینی حوزه‌های تخصصی برای یک متن
 
@@ -207,40 +357,65 @@ class DomainClassifier(BaseClassifier):
         Returns:
             Dict: نتیجه پیش‌بینی شامل حوزه‌های تخصصی و امتیازات
         """
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: List[str]) -> List[Dict]:
+        """
+        پیش‌بینی حوزه‌های تخصصی برای مجموعه‌ای از متون با یک فراخوانی مدل
+
+        Args:
+            texts: لیست متون ورودی
+
+        Returns:
+            List[Dict]: لیست نتایج پیش‌بینی به ترتیب متون ورودی
+        """
         if not self.is_ready():
             raise ValueError("طبقه‌بندی کننده آماده نیست. ابتدا یک مدل بارگذاری کنید.")
 
-        # استخراج ویژگی‌ها
-        features = self.feature_extractor.transform([text])
+        if not texts:
+            return []
+
+        # استخراج ویژگی‌ها برای کل دسته
+        features = self.feature_extractor.transform(texts)
 
         # پیش‌بینی برچسب‌های چندتایی
-        y_pred = self.model.predict(features)[0]
+        y_pred = self.model.predict(features)
 
         # دریافت احتمالات (در صورت پشتیبانی)
-        probabilities = {}
-        domains = []
-
+        y_prob = None
         if hasattr(self.model, 'predict_proba'):
             y_prob = self.model.predict_proba(features)
 
-            # برای هر حوزه تخصصی، احتمال پیش‌بینی را ذخیره می‌کنیم
-            for i, label in enumerate(self.label_transformer.classes_):
-                prob = y_prob[0, i]
-                probabilities[label] = float(prob)
-
-                # اگر برچسب مثبت است، حوزه را اضافه می‌کنیم
-                if y_pred[i] == 1:
-                    domains.append({
-                        'domain': label,
-                        'probability': float(prob)
-                    })
+        return [self._build_result(y_pred[row], None if y_prob is None else y_prob[row])
+                for row in range(len(texts))]
+
+    def _build_result(self, y_pred, y_prob) -> Dict:
+        """
+        ساخت دیکشنری نتیجه برای یک نمونه
+
+        Args:
+            y_pred: بردار برچسب‌های پیش‌بینی شده نمونه
+            y_prob: بردار احتمالات نمونه (یا None)
+
+        Returns:
+            Dict: نتیجه پیش‌بینی شامل حوزه‌های تخصصی و امتیازات
+        """
+        classes = self._classes
+        positive = np.nonzero(np.asarray(y_pred) == 1)[0]
+
+        if y_prob is not None:
+            probs = np.asarray(y_prob, dtype=np.float64)
+
+            # احتمال هر حوزه تخصصی
+            probabilities = dict(zip(classes, probs.tolist()))
+
+            # حوزه‌های با برچسب مثبت، مرتب‌شده بر اساس احتمال (نزولی)
+            order = positive[np.argsort(-probs[positive], kind='stable')]
+            domains = [{'domain': classes[i], 'probability': float(probs[i])} for i in order]
         else:
             # در صورتی که احتمالات در دسترس نیست، فقط برچسب‌ها را برمی‌گردانیم
-            domains = [{'domain': self.label_transformer.classes_[i], 'probability': 1.0}
-                      for i, val in enumerate(y_pred) if val == 1]
-
-        # مرتب‌سازی حوزه‌ها بر اساس احتمال
-        domains.sort(key=lambda x: x['probability'], reverse=True)
+            probabilities = {}
+            domains = [{'domain': classes[i], 'probability': 1.0} for i in positive]
 
         return {
             'domains': [d['domain'] for d in domains],
@@ -248,6 +423,18 @@ class DomainClassifier(BaseClassifier):
             'probabilities': probabilities
         }
 
+    def predict_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        پیش‌بینی برای مجموعه‌ای از متون
+
+        Args:
+            texts: لیست متون ورودی
+
+        Returns:
+            List[Dict]: لیست نتایج پیش‌بینی
+        """
+        return self.predict_many(texts)
+
 
 class ContentTypeClassifier(BaseClassifier):
     """کلاس طبقه‌بندی کننده نوع محتوا"""
@@ -265,33 +452,6 @@ class ContentTypeClassifier(BaseClassifier):
 
         super().__init__(model_path)
 
-    def _find_latest_model(self, prefix: str) -> Optional[str]:
-        """
-        یافتن جدیدترین فایل مدل با پیشوند مشخص
-
-        Args:
-            prefix: پیشوند نام فایل
-
-        Returns:
-            str: مسیر فایل یا None در صورت عدم وجود
-        """
-        if not os.path.exists(MODEL_DIR):
-            return None
-
-        # یافتن تمام فایل‌های با پیشوند مشخص
-        matching_files = [f for f in os.listdir(MODEL_DIR)
-                         if f.startswith(prefix) and f.endswith('.pkl')]
-
-        if not matching_files:
-            return None
-
-        # مرتب‌سازی بر اساس زمان تغییر فایل (نزولی)
-        matching_files.sort(key=lambda f: os.path.getmtime(os.path.join(MODEL_DIR, f)),
-                           reverse=True)
-
-        # انتخاب جدیدترین فایل
-        return os.path.join(MODEL_DIR, matching_files[0])
-
     def _load_feature_extractor(self, path: str):
         """
         بارگذاری استخراج‌کننده ویژگی نوع محتوا
@@ -311,7 +471,7 @@ class ContentTypeClassifier(BaseClassifier):
         logger.info("ایجاد استخراج‌کننده ویژگی پیش‌فرض نوع محتوا")
         self.feature_extractor = ContentTypeFeatures()
 
-    def predict(self, text: str) -> Dict:
+    def _predict_uncached(self, text: str) -> Dict:
         """
         پیش‌بینی نوع محتوا برای یک متن
 
@@ -321,88 +481,171 @@ class ContentTypeClassifier(BaseClassifier):
         Returns:
             Dict: نتیجه پیش‌بینی شامل نوع محتوا و احتمالات
         """
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: List[str]) -> List[Dict]:
+        """
+        پیش‌بینی نوع محتوا برای مجموعه‌ای از متون با یک فراخوانی مدل
+
+        Args:
+            texts: لیست متون ورودی
+
+        Returns:
+            List[Dict]: لیست نتایج پیش‌بینی به ترتیب متون ورودی
+        """
         if not self.is_ready():
             raise ValueError("طبقه‌بندی کننده آماده نیست. ابتدا یک مدل بارگذاری کنید.")
 
-        # استخراج ویژگی‌ها
-        features = self.feature_extractor.transform([text])
+        if not texts:
+            return []
+
+        # استخراج ویژگی‌ها برای کل دسته
+        features = self.feature_extractor.transform(texts)
 
         # پیش‌بینی نوع محتوا
-        y_pred = self.model.predict(features)[0]
-        content_type = self.label_transformer.inverse_transform([y_pred])[0]
+        y_pred = self.model.predict(features)
+        content_types = self.label_transformer.inverse_transform(y_pred)
 
-        # دریافت احتمالات (در صورت پشتیبانی)
-        probabilities = {}
+        # دریافت احتمالات یا امتیازات تصمیم (در صورت پشتیبانی)
+        y_prob = None
         if hasattr(self.model, 'predict_proba'):
-            y_prob = self.model.predict_proba(features)[0]
+            y_prob = self.model.predict_proba(features)
+        elif hasattr(self.model, 'decision_function'):
+            y_prob = self._scores_to_probabilities(self.model.decision_function(features))
+
+        results = []
+        for row, text in enumerate(texts):
+            content_type = content_types[row]
+            probabilities = self._build_probabilities(
+                content_type,
+                None if y_prob is None else y_prob[row]
+            )
+            results.append({
+                'content_type': content_type,
+                'probabilities': probabilities,
+                'analysis': self._analyze(text, content_type)
+            })
+
+        return results
+
+    def _scores_to_probabilities(self, decision_scores) -> np.ndarray:
+        """
+        تبدیل امتیازات تصمیم کل دسته به احتمالات
+
+        Args:
+            decision_scores: خروجی decision_function مدل
+
+        Returns:
+            np.ndarray: ماتریس احتمالات (نمونه × کلاس)
+        """
+        decision_scores = np.asarray(decision_scores, dtype=np.float64)
 
+        if self._n_classes == 2:
+            # طبقه‌بندی باینری - امتیاز مثبت متعلق به کلاس دوم است
+            positive = expit(decision_scores.reshape(-1))
+            return np.column_stack((1.0 - positive, positive))
+
+        # طبقه‌بندی چندکلاسه - نرمال‌سازی امتیازات تصمیم
+        return softmax(decision_scores, axis=1)
+
+    def _build_probabilities(self, content_type, y_prob) -> Dict:
+        """
+        ساخت دیکشنری احتمالات برای یک نمونه
+
+        Args:
+            content_type: نوع محتوای پیش‌بینی شده
+            y_prob: بردار احتمالات نمونه (یا None)
+
+        Returns:
+            Dict: احتمال هر نوع محتوا
+        """
+        if y_prob is not None:
             # ذخیره احتمال هر نوع محتوا
-            for i, label in enumerate(self.label_transformer.classes_):
-                probabilities[label] = float(y_prob[i])
-        else:
-            # در صورتی که احتمالات در دسترس نیست، امتیاز تصمیم را برمی‌گردانیم
-            if hasattr(self.model, 'decision_function'):
-                decision_scores = self.model.decision_function(features)[0]
-
-                if len(self.label_transformer.classes_) == 2:
-                    # طبقه‌بندی باینری
-                    probabilities[self.label_transformer.classes_[0]] = 1.0 / (1.0 + np.exp(-decision_scores))
-                    probabilities[self.label_transformer.classes_[1]] = 1.0 / (1.0 + np.exp(decision_scores))
-                else:
-                    # طبقه‌بندی چندکلاسه - نرمال‌سازی امتیازات تصمیم
-                    exp_scores = np.exp(decision_scores - np.max(decision_scores))
-                    softmax = exp_scores / exp_scores.sum()
+            return dict(zip(self._classes, np.asarray(y_prob, dtype=np.float64).tolist()))
 
-                    for i, label in enumerate(self.label_transformer.classes_):
-                        probabilities[label] = float(softmax[i])
-            else:
-                # فقط برچسب پیش‌بینی شده
-                probabilities = {label: 1.0 if label == content_type else 0.0
-                               for label in self.label_transformer.classes_}
+        # فقط برچسب پیش‌بینی شده
+        return {label: 1.0 if label == content_type else 0.0
+                for label in self._classes}
+
+    @staticmethod
+    def _analyze(text: str, content_type: str) -> Dict:
+        """
+        تحلیل اضافی برای محتواهای سؤال و پاسخ
+
+        Args:
+            text: متن ورودی
+            content_type: نوع محتوای پیش‌بینی شده
 
-        # تحلیل اضافی برای محتواهای سؤال و پاسخ
+        Returns:
+            Dict: نتایج تحلیل
+        """
         analysis = {}
         if content_type == 'question':
             # بررسی نوع سؤال
             if '؟' in text:
                 analysis['has_question_mark'] = True
 
-            question_indicators = ['آیا', 'چرا', 'چگونه', 'چطور', 'چیست', 'کیست', 'کجاست']
-            found_indicators = [ind for ind in question_indicators if ind in text.lower()]
+            # کلیدواژه‌های فارسی حالت حروف ندارند، پس نیازی به lower() روی کل متن نیست
+            found_indicators = _find_keywords(text, _QUESTION_INDICATORS, _QUESTION_MATCHER)
 
             if found_indicators:
                 analysis['question_indicators'] = found_indicators
 
         elif content_type == 'answer':
             # بررسی استناد به قانون
-            law_references = ['ماده', 'قانون', 'آیین‌نامه', 'بخشنامه', 'دستورالعمل']
-            found_references = [ref for ref in law_references if ref in text]
+            found_references = _find_keywords(text, _LAW_REFERENCES, _LAW_MATCHER)
 
             if found_references:
                 analysis['law_references'] = found_references
 
-        return {
-            'content_type': content_type,
-            'probabilities': probabilities,
-            'analysis': analysis
-        }
+        return analysis
+
+    def predict_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        پیش‌بینی برای مجموعه‌ای از متون
+
+        Args:
+            texts: لیست متون ورودی
+
+        Returns:
+            List[Dict]: لیست نتایج پیش‌بینی
+        """
+        return self.predict_many(texts)
 
 
 class TextClassifier:
     """کلاس اصلی طبقه‌بندی متون حقوقی"""
 
-    def __init__(self, domain_model_path: Optional[str] = None, content_type_model_path: Optional[str] = None):
+    def __init__(self, domain_model_path: Optional[str] = None, content_type_model_path: Optional[str] = None,
+                 parallel: Optional[bool] = None):
         """
         مقداردهی اولیه طبقه‌بندی کننده متون
 
         Args:
             domain_model_path: مسیر فایل مدل حوزه تخصصی (اختیاری)
             content_type_model_path: مسیر فایل مدل نوع محتوا (اختیاری)
+            parallel: اجرای همزمان دو طبقه‌بندی کننده (پیش‌فرض از CRAWLER_CONFIG['classifier_parallel'])
         """
         # طبقه‌بندی کننده‌های تخصصی
         self.domain_classifier = DomainClassifier(domain_model_path)
         self.content_type_classifier = ContentTypeClassifier(content_type_model_path)
 
+        # اجرای همزمان پیش‌بینی‌ها (numpy/sklearn در حین محاسبه GIL را آزاد می‌کنند)؛ یکی از دو پیش‌بینی
+        # در نخ فراخواننده اجرا می‌شود و فقط دیگری به استخر سپرده می‌شود
+        if parallel is None:
+            parallel = CRAWLER_CONFIG['classifier_parallel']
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="classifier") if parallel else None
+
+    def close(self):
+        """توقف استخر نخ پیش‌بینی‌های همزمان و آزادسازی منابع"""
+        pool, self._pool = getattr(self, '_pool', None), None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __del__(self):
+        """فراخوانی خودکار close() هنگام حذف شیء"""
+        self.close()
+
     def classify_text(self, text: str) -> Dict:
         """
         طبقه‌بندی کامل یک متن
@@ -417,19 +660,38 @@ class TextClassifier:
             'text_summary': text[:100] + '...' if len(text) > 100 else text
         }
 
+        content_type_ready = self.content_type_classifier.is_ready()
+        domain_ready = self.domain_classifier.is_ready()
+
+        # پیش‌بینی حوزه به استخر سپرده می‌شود و نوع محتوا در همین نخ پیش‌بینی می‌شود
+        domain_future = None
+        pool = self._pool
+        if pool is not None and content_type_ready and domain_ready:
+            try:
+                domain_future = pool.submit(self.domain_classifier.predict, text)
+            except RuntimeError:
+                # استخر بسته شده است
+                domain_future = None
+
         # طبقه‌بندی نوع محتوا
-        if self.content_type_classifier.is_ready():
+        if content_type_ready:
             try:
-                content_type_results = self.content_type_classifier.predict(text)
-                results['content_type'] = content_type_results
+                results['content_type'] = self.content_type_classifier.predict(text)
             except Exception as e:
                 logger.error(f"خطا در طبقه‌بندی نوع محتوا: {str(e)}")
                 results['content_type_error'] = str(e)
 
+        # اگر نخ‌های استخر هنوز مشغول کارهای نخ‌های دیگرند، پیش‌بینی حوزه در همین نخ انجام می‌شود
+        if domain_future is not None and domain_future.cancel():
+            domain_future = None
+
         # طبقه‌بندی حوزه تخصصی
-        if self.domain_classifier.is_ready():
+        if domain_ready:
             try:
-                domain_results = self.domain_classifier.predict(text)
+                if domain_future is not None:
+                    domain_results = domain_future.result()
+                else:
+                    domain_results = self.domain_classifier.predict(text)
                 results['domains'] = domain_results
             except Exception as e:
                 logger.error(f"خطا در طبقه‌بندی حوزه تخصصی: {str(e)}")
@@ -441,13 +703,43 @@ class TextClassifier:
         """
         طبقه‌بندی دسته‌ای متون
 
+        هر طبقه‌بندی کننده تنها یک بار برای کل دسته فراخوانی می‌شود.
+
         Args:
             texts: لیست متون ورودی
 
         Returns:
             List[Dict]: لیست نتایج طبقه‌بندی
         """
-        return [self.classify_text(text) for text in texts]
+        results = [{'text_summary': text[:100] + '...' if len(text) > 100 else text}
+                   for text in texts]
+
+        if not texts:
+            return results
+
+        # طبقه‌بندی نوع محتوا
+        if self.content_type_classifier.is_ready():
+            try:
+                content_type_results = self.content_type_classifier.predict_many(texts)
+                for result, content_type_result in zip(results, content_type_results):
+                    result['content_type'] = content_type_result
+            except Exception as e:
+                logger.error(f"خطا در طبقه‌بندی نوع محتوا: {str(e)}")
+                for result in results:
+                    result['content_type_error'] = str(e)
+
+        # طبقه‌بندی حوزه تخصصی
+        if self.domain_classifier.is_ready():
+            try:
+                domain_results = self.domain_classifier.predict_many(texts)
+                for result, domain_result in zip(results, domain_results):
+                    result['domains'] = domain_result
+            except Exception as e:
+                logger.error(f"خطا در طبقه‌بندی حوزه تخصصی: {str(e)}")
+                for result in results:
+                    result['domains_error'] = str(e)
+
+        return results
 
     def is_ready(self) -> Dict:
         """
@@ -464,8 +756,16 @@ class TextClassifier:
         }
 
 
-# ایجاد نمونه طبقه‌بندی کننده برای استفاده سریع
-default_classifier = TextClassifier()
+@functools.lru_cache(maxsize=1)
+def get_default_classifier() -> TextClassifier:
+    """
+    دریافت نمونه مشترک طبقه‌بندی کننده (در اولین فراخوانی ایجاد می‌شود)
+
+    Returns:
+        TextClassifier: نمونه پیش‌فرض طبقه‌بندی کننده
+    """
+    return TextClassifier()
+
 
 def classify_text(text: str) -> Dict:
     """
@@ -477,7 +777,7 @@ def classify_text(text: str) -> Dict:
     Returns:
         Dict: نتیجه طبقه‌بندی
     """
-    return default_classifier.classify_text(text)
+    return get_default_classifier().classify_text(text)
 
 def predict_domain(text: str) -> Dict:
     """
@@ -489,6 +789,7 @@ def predict_domain(text: str) -> Dict:
     Returns:
         Dict: نتیجه پیش‌بینی حوزه تخصصی
     """
+    default_classifier = get_default_classifier()
     if default_classifier.domain_classifier.is_ready():
         return default_classifier.domain_classifier.predict(text)
     else:
@@ -504,6 +805,7 @@ def predict_content_type(text: str) -> Dict:
     Returns:
         Dict: نتیجه پیش‌بینی نوع محتوا
     """
+    default_classifier = get_default_classifier()
     if default_classifier.content_type_classifier.is_ready():
         return default_classifier.content_type_classifier.predict(text)
     else:
@@ -11,12 +11,21 @@
 
 import os
 import re
+import sys
+import html
+import time
+import atexit
+import hashlib
 import threading
+import multiprocessing
 import concurrent.futures
-from typing import Dict, List, Optional, Union, Any
-from datetime import datetime
+from itertools import islice
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Union, Any, Iterable, Tuple
+from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup, Tag
+import numpy as np
+from bs4 import BeautifulSoup, Tag, NavigableString, CData
 
 from utils.logger import get_logger
 from utils.text import normalize_persian_text
@@ -39,6 +48,520 @@ try:
 except ImportError:
     spacy = None
 
+# تلاش برای import pyahocorasick (جستجوی چندالگویی در یک گذر)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# تلاش برای import trafilatura (استخراج محتوای اصلی مبتنی بر lxml)
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+# حداکثر تعداد نتایج استخراج موجودیت کش‌شده (بر اساس هش متن)
+ENTITY_CACHE_SIZE = 4096
+
+# انواع صفحاتی که محتوای آن‌ها ارزش تحلیل موجودیت ندارد (عمدتاً پیمایشی)
+NER_SKIP_JOB_TYPES = frozenset(('list', 'index', 'sitemap'))
+
+# حداقل و حداکثر طول متن برای تحلیل موجودیت‌ها
+NER_MIN_CHARS = 200
+NER_MAX_CHARS = int(os.getenv('NER_MAX_CHARS', '4000'))
+
+# پایان‌دهنده‌های جمله برای کوتاه کردن متن در مرز جمله
+_SENTENCE_ENDS = ('.', '!', '?', '؟', '\n')
+
+# مدل پیش‌فرض spaCy و متن نمونه برای گرم کردن آن
+DEFAULT_NLP_MODEL = "fa_core_news_sm"
+TRANSFORMER_NLP_MODEL = "fa_core_news_trf"
+NLP_WARMUP_TEXT = "متن نمونه برای آماده‌سازی مدل در دادگاه تهران"
+
+# اجرای مدل NLP روی GPU (CRAWLER_NLP_DEVICE=gpu) و اندازه دسته متناسب با حافظه آن
+NLP_DEVICE = os.getenv('CRAWLER_NLP_DEVICE', 'cpu').lower()
+NLP_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', '32' if NLP_DEVICE == 'gpu' else '64'))
+
+# تعداد فرایندهای spaCy برای استخراج دسته‌ای موجودیت‌ها و نخ‌های مرحله پارس
+NLP_N_PROCESS = int(os.getenv('SPACY_N_PROCESS', str(max(1, (os.cpu_count() or 1) // 2))))
+# (بدون GIL نخ‌ها واقعاً موازی‌اند و بیش از تعداد هسته‌ها لازم نیست)
+_GIL_ENABLED = getattr(sys, '_is_gil_enabled', lambda: True)()
+PARSE_WORKERS = min(32, (os.cpu_count() or 1) * (4 if _GIL_ENABLED else 1))
+
+# حداقل تعداد صفحات bulk_extract برای استفاده از فرایندهای جداگانه به جای نخ‌ها
+BULK_PROCESS_MIN_DOCS = int(os.getenv('BULK_PROCESS_MIN_DOCS', '64'))
+
+# اجزای خط لوله spaCy که برای استخراج موجودیت‌ها (NER) لازم نیستند
+NER_EXCLUDED_PIPES = ("tagger", "parser", "attribute_ruler", "lemmatizer", "morphologizer")
+
+# تگ‌های کاندیدای محتوای اصلی و تگ‌های سرتیتر در امتیازدهی بلوک‌ها
+_CANDIDATE_TAGS = frozenset(('article', 'div', 'section'))
+_HEADING_TAGS = frozenset(('h1', 'h2', 'h3'))
+
+# تگ‌هایی که پیش از استخراج به همراه زیردرختشان حذف می‌شوند
+_DROP_TAGS = frozenset(('script', 'style', 'iframe', 'noscript', 'header', 'footer', 'nav', 'aside'))
+
+# انواع رشته‌هایی که get_text در متن صفحه لحاظ می‌کند
+_TEXT_TYPES = (NavigableString, CData)
+
+# کش مدل‌های spaCy بارگذاری‌شده در سطح فرایند (کلید: مسیر/نام مدل و اجزای حذف‌شده).
+# فرایندهای کارگری که با fork ساخته می‌شوند همین مدل‌ها را به ارث می‌برند.
+MODEL_CACHE_SIZE = 4
+_MODEL_CACHE: Dict[Tuple[str, Tuple[str, ...]], Any] = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+_GPU_ACTIVATED = False
+
+
+def _default_nlp_models() -> Tuple[str, ...]:
+    """
+    مدل‌های پیش‌فرض spaCy به ترتیب اولویت.
+    روی GPU ابتدا مدل ترنسفورمر و در صورت نبود آن مدل سبک امتحان می‌شود.
+    """
+    if NLP_DEVICE == 'gpu':
+        return (TRANSFORMER_NLP_MODEL, DEFAULT_NLP_MODEL)
+    return (DEFAULT_NLP_MODEL,)
+
+
+def _get_nlp(name_or_path: str, exclude: Tuple[str, ...] = ()):
+    """
+    دریافت مدل spaCy از کش فرایند یا بارگذاری آن در اولین درخواست.
+    همه نمونه‌های ContentExtractor در یک فرایند از یک مدل مشترک استفاده می‌کنند.
+
+    Args:
+        name_or_path: نام یا مسیر مدل spaCy.
+        exclude: اجزایی از خط لوله که نباید بارگذاری شوند.
+
+    Returns:
+        خط لوله spaCy بارگذاری‌شده.
+    """
+    global _GPU_ACTIVATED
+
+    key = (name_or_path, tuple(exclude))
+    nlp = _MODEL_CACHE.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _MODEL_CACHE_LOCK:
+        nlp = _MODEL_CACHE.get(key)
+        if nlp is None:
+            if NLP_DEVICE == 'gpu' and not _GPU_ACTIVATED:
+                # باید پیش از بارگذاری مدل فراخوانی شود تا وزن‌ها روی GPU قرار گیرند
+                spacy.require_gpu()
+                _GPU_ACTIVATED = True
+            nlp = spacy.load(name_or_path, exclude=list(exclude))
+            _MODEL_CACHE[key] = nlp
+
+            # هر مدل صدها مگابایت حافظه می‌گیرد؛ قدیمی‌ترین مدل کنار گذاشته می‌شود
+            while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+                _MODEL_CACHE.popitem(last=False)
+        return nlp
+
+
+def clear_model_cache() -> None:
+    """پاک‌سازی کش مدل‌های spaCy (مدل‌ها در درخواست بعدی دوباره بارگذاری می‌شوند)"""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+# کلیدواژه‌های کلاس عنوان، تاریخ و نویسنده (به ترتیب اولویت)
+_TITLE_CLASSES = ('title', 'heading', 'post-title', 'article-title', 'main-title')
+_DATE_CLASSES = ('date', 'time', 'published', 'pubdate', 'timestamp')
+_AUTHOR_CLASSES = ('author', 'writer', 'byline', 'by')
+_CLASS_KEYWORDS = tuple(dict.fromkeys(_TITLE_CLASSES + _DATE_CLASSES + _AUTHOR_CLASSES))
+
+# متاتگ‌های تاریخ (به ترتیب اولویت) و نویسنده
+_DATE_META_KEYS = (
+    ('property', 'article:published_time'),
+    ('property', 'article:modified_time'),
+    ('name', 'date'),
+    ('name', 'pubdate'),
+    ('name', 'publish_date'),
+)
+_AUTHOR_META_KEY = ('name', 'author')
+_META_KEYS = frozenset(_DATE_META_KEYS + (_AUTHOR_META_KEY,))
+
+# کلاس‌های کاندیدای محتوای اصلی در صفحات جزئیات
+_CONTENT_DIV_CLASS_RE = re.compile(r'(content|article|post|body|text|main)')
+_CONTENT_SECTION_CLASS_RE = re.compile(r'(content|article)')
+
+# کلاس‌های تبلیغات و محتوای اضافی که پیش از استخراج حذف می‌شوند
+_AD_CLASSES = ('ads', 'advertisement', 'banner', 'popup', 'social', 'sharing', 'footer', 'menu')
+_AD_CLASS_RE = re.compile(r'(ads|advertisement|banner|popup|social|sharing|footer|menu)', re.I)
+
+# کلاس‌های کانتینرها و آیتم‌های صفحات لیست و لینک‌های مرتبط
+_LIST_CLASS_RE = re.compile(r'(list|items|posts|articles)')
+_ITEM_CLASS_RE = re.compile(r'(item|post|article)')
+_SUMMARY_CLASS_RE = re.compile(r'(summary|excerpt|desc)')
+_RELATED_CLASS_RE = re.compile(r'(related|similar|suggested)')
+
+# حذف بخش‌های ثابت سایت از عنوان (مانند نام سایت)
+_TITLE_TAIL_PIPE_RE = re.compile(r'\s*[|]\s*.+$')
+_TITLE_TAIL_DASH_RE = re.compile(r'\s*[-]\s*.+$')
+
+# الگوهای تاریخ و نویسنده در متن صفحه (به ترتیب اولویت)
+_DATE_PATTERNS = (
+    re.compile(r'تاریخ(?:\s*انتشار)?[:]\s*(\d{4}/\d{1,2}/\d{1,2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}\s+[آ-یa-zA-Z]+\s+\d{4})'),
+    re.compile(r'(\d{4}/\d{1,2}/\d{1,2}|\d{1,2}/\d{1,2}/\d{4})'),
+    re.compile(r'(\d{1,2}\s+[آ-یa-zA-Z]+\s+\d{4})'),
+)
+# همه الگوهای تاریخ در یک عبارت برای یافتن اولین تطابق با یک گذر روی متن
+_DATE_COMBINED_RE = re.compile('|'.join(f'(?P<p{index}>{pattern.pattern})'
+                                        for index, pattern in enumerate(_DATE_PATTERNS)))
+_AUTHOR_PATTERNS = (
+    re.compile(r'نویسنده[:]\s*([آ-یA-Za-z\s]+)'),
+    re.compile(r'نگارنده[:]\s*([آ-یA-Za-z\s]+)'),
+    re.compile(r'نوشته[:]\s*([آ-یA-Za-z\s]+)'),
+)
+_AUTHOR_PREFIX_RE = re.compile(r'^(?:نویسنده|نگارنده|نوشته)[:]\s*', re.I)
+
+# تلاش برای import lxml (پارسر C برای BeautifulSoup)
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+# پیش‌پردازش سریع عنوان و متاتگ‌ها با عبارات منظم روی ابتدای سند
+HEAD_SCAN_BYTES = 8192
+_RE_TITLE = re.compile(r'<title\b([^>]*)>([^<]{1,512})</title>', re.I)
+_RE_TITLE_START = re.compile(r'<title\b', re.I)
+_RE_HEAD_END = re.compile(r'<(?!/?(?:html|head|title|meta|link|base)\b|!doctype)', re.I)
+_RE_META_TAG = re.compile(r'<meta\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>', re.I)
+_RE_ATTR = re.compile(r'([^\s=/>"\']+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_RE_CHARSET = re.compile(rb'charset\s*=\s*["\']?([\w-]+)', re.I)
+_RE_TIME_TAG = re.compile(r'<time\b', re.I)
+_RE_TIME_TAG_BYTES = re.compile(rb'<time\b', re.I)
+
+
+def _scan_head(html_content: Union[str, bytes]) -> Dict[str, str]:
+    """
+    یافتن عنوان، تاریخ متا و نویسنده متا در ابتدای سند بدون درخت DOM.
+    فقط مقادیری برگردانده می‌شوند که نتیجه آن‌ها با استخراج از DOM یکسان است؛
+    برای بقیه موارد باید از نمایه صفحه استفاده شود.
+
+    Args:
+        html_content: محتوای HTML صفحه (رشته یا بایت).
+
+    Returns:
+        دیکشنری شامل کلیدهای title، date و author (در صورت یافتن).
+    """
+    head = html_content[:HEAD_SCAN_BYTES]
+    if isinstance(head, bytes):
+        charset = _RE_CHARSET.search(head)
+        try:
+            head = head.decode(charset.group(1).decode('ascii') if charset else 'utf-8', 'replace')
+        except LookupError:
+            return {}
+        has_time = _RE_TIME_TAG_BYTES.search(html_content) is not None
+    else:
+        has_time = _RE_TIME_TAG.search(html_content) is not None
+
+    # پارسر HTML پایان خط‌ها را به \n تبدیل می‌کند
+    head = head.replace('\r\n', '\n').replace('\r', '\n')
+
+    # پویش فقط تا اولین تگی ادامه می‌یابد که ممکن است در DOM جایگاه دیگری داشته
+    # باشد یا توسط پاکسازی حذف شود (اسکریپت، توضیحات، عناصر بدنه و ...)
+    end = _RE_HEAD_END.search(head)
+    if end:
+        head = head[:end.start()]
+
+    found = {}
+
+    # فقط اولین تگ title معتبر است (محتوای آن تا </title> متن خام است)
+    start = _RE_TITLE_START.search(head)
+    if start:
+        match = _RE_TITLE.match(head, start.start())
+        if match and 'class' not in match.group(1).lower():
+            found['title'] = html.unescape(match.group(2)).strip()
+            start = _RE_TITLE_START.search(head, match.end())
+        if start:
+            head = head[:start.start()]
+
+    meta = {}
+    for match in _RE_META_TAG.finditer(head):
+        attrs = {}
+        for attr in _RE_ATTR.finditer(match.group(1)):
+            name = attr.group(1).lower()
+            if name not in attrs:
+                attrs[name] = next(v for v in attr.groups()[1:] if v is not None)
+        if 'class' in attrs:
+            # عناصر دارای کلاس ممکن است در پاکسازی تبلیغات حذف شوند
+            break
+        content = html.unescape(attrs.get('content', '')).strip()
+        for attr in ('property', 'name'):
+            key = (attr, attrs.get(attr))
+            if key in _META_KEYS and key not in meta:
+                meta[key] = content
+
+    if meta.get(_AUTHOR_META_KEY):
+        found['author'] = meta[_AUTHOR_META_KEY]
+
+    # تگ time بر متاتگ‌ها مقدم است و سایر متاتگ‌های تاریخ به DOM سپرده می‌شوند
+    if not has_time and meta.get(_DATE_META_KEYS[0]):
+        found['date'] = meta[_DATE_META_KEYS[0]]
+
+    # مقادیر دارای کاراکتر نامعتبر (کدگذاری ناشناخته) قابل اعتماد نیستند
+    return {key: value for key, value in found.items() if '\ufffd' not in value}
+
+
+def _build_automaton(keywords: Iterable[str]):
+    """
+    ساخت خودکار Aho-Corasick برای یافتن همه کلیدواژه‌ها (حتی هم‌پوشان) در یک گذر.
+
+    Args:
+        keywords: کلیدواژه‌ها (با حروف کوچک).
+
+    Returns:
+        خودکار ساخته‌شده یا None در صورت نصب نبودن pyahocorasick.
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_AD_AUTOMATON = _build_automaton(_AD_CLASSES)
+_CLASS_AUTOMATON = _build_automaton(_CLASS_KEYWORDS)
+
+
+def _has_token(value: Union[str, List[str], None], token: str) -> bool:
+    """
+    بررسی وجود یک توکن در مقدار ویژگی چندمقداری (مانند rel یا itemprop).
+
+    Args:
+        value: مقدار ویژگی (رشته جداشده با فاصله یا لیست).
+        token: توکن مورد نظر.
+
+    Returns:
+        آیا توکن در مقدار ویژگی وجود دارد؟
+    """
+    if not value:
+        return False
+    if isinstance(value, str):
+        value = value.split()
+    return token in value
+
+
+class _PageIndex:
+    """
+    نمایه عناصر مورد نیاز استخراج که در یک پیمایش درخت صفحه جمع‌آوری می‌شوند.
+    عنوان، تاریخ، نویسنده و محتوای اصلی همگی از این نمایه خوانده می‌شوند و
+    نیازی به پیمایش جداگانه درخت برای هر کدام نیست.
+    """
+
+    __slots__ = ('soup', 'title', 'h1_tags', 'h2', 'time_tags', 'meta', 'classes', 'author_ref',
+                 'article', 'main', 'content_div', 'content_section', '_block_stats', '_best_blocks',
+                 '_text', '_stripped')
+
+    def __init__(self, soup: BeautifulSoup) -> None:
+        """
+        ساخت نمایه با یک پیمایش درخت.
+
+        Args:
+            soup: شیء BeautifulSoup صفحه (پس از پاکسازی).
+        """
+        self.soup = soup
+        self.title: Optional[Tag] = None
+        self.h1_tags: List[Tag] = []
+        self.h2: Optional[Tag] = None
+        self.time_tags: List[Tag] = []
+        self.meta: Dict[Tuple[str, str], Tag] = {}
+        self.classes: Dict[str, Tag] = {}
+        self.author_ref: Optional[Tag] = None
+        self.article: Optional[Tag] = None
+        self.main: Optional[Tag] = None
+        self.content_div: Optional[Tag] = None
+        self.content_section: Optional[Tag] = None
+        # آمار بلوک‌های کاندیدا؛ امتیازدهی فقط در اولین دسترسی به best_blocks انجام می‌شود
+        self._block_stats: Optional[Tuple[List[Tag], List[int], List[int], List[bool], List[int]]] = None
+        self._best_blocks: Optional[List[Tag]] = None
+        self._text: Optional[str] = None
+        self._stripped: Dict[int, str] = {}
+
+        self._build()
+
+    @property
+    def best_blocks(self) -> List[Tag]:
+        """
+        بلوک‌های محتوایی دارای بیشترین امتیاز (یک بار و فقط در صورت نیاز محاسبه می‌شود).
+        وقتی trafilatura محتوای اصلی را می‌یابد، امتیازدهی اصلاً اجرا نمی‌شود.
+        """
+        if self._best_blocks is None:
+            self._best_blocks = self._score_blocks(*self._block_stats) if self._block_stats else []
+            self._block_stats = None
+        return self._best_blocks
+
+    @property
+    def text(self) -> str:
+        """متن کامل صفحه (یک بار محاسبه می‌شود)"""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+    def stripped_text(self, tag: Tag) -> str:
+        """
+        متن فشرده یک عنصر (معادل get_text(strip=True)) با حافظه‌گذاری.
+        یک عنصر ممکن است در چند استراتژی عنوان، تاریخ و نویسنده بررسی شود.
+
+        Args:
+            tag: عنصر مورد نظر.
+
+        Returns:
+            متن عنصر بدون فاصله‌های ابتدا و انتهای رشته‌ها.
+        """
+        text = self._stripped.get(id(tag))
+        if text is None:
+            text = self._stripped[id(tag)] = tag.get_text(strip=True)
+        return text
+
+    def _visit(self, node: Tag, pending_classes: List[str]) -> None:
+        """
+        ثبت یک عنصر در نمایه (به ترتیب ظاهر شدن در سند).
+
+        Args:
+            node: عنصر جاری.
+            pending_classes: کلیدواژه‌های کلاسی که هنوز عنصری برایشان یافت نشده است.
+        """
+        name = node.name
+
+        if name == 'meta':
+            for attr in ('property', 'name'):
+                key = (attr, node.get(attr))
+                if key in _META_KEYS and key not in self.meta:
+                    self.meta[key] = node
+        elif name == 'title':
+            if self.title is None:
+                self.title = node
+        elif name == 'h1':
+            self.h1_tags.append(node)
+        elif name == 'h2':
+            if self.h2 is None:
+                self.h2 = node
+        elif name == 'time':
+            self.time_tags.append(node)
+        elif name == 'article':
+            if self.article is None:
+                self.article = node
+        elif name == 'main':
+            if self.main is None:
+                self.main = node
+
+        # نشانه‌گذاری ساختاریافته نویسنده (rel="author" یا itemprop="author" در schema.org)
+        if self.author_ref is None and node.attrs and (
+                _has_token(node.get('rel'), 'author') or _has_token(node.get('itemprop'), 'author')):
+            self.author_ref = node
+
+        classes = node.get('class')
+        if not classes:
+            return
+
+        class_text = ' '.join(classes) if isinstance(classes, list) else classes
+
+        if name == 'div' and self.content_div is None and _CONTENT_DIV_CLASS_RE.search(class_text):
+            self.content_div = node
+        elif name == 'section' and self.content_section is None and _CONTENT_SECTION_CLASS_RE.search(class_text):
+            self.content_section = node
+
+        if pending_classes:
+            class_text = class_text.lower()
+            if _CLASS_AUTOMATON is not None:
+                found = {keyword for _, keyword in _CLASS_AUTOMATON.iter(class_text)
+                         if keyword in pending_classes}
+            else:
+                found = [keyword for keyword in pending_classes if keyword in class_text]
+            for keyword in found:
+                self.classes[keyword] = node
+                pending_classes.remove(keyword)
+
+    def _build(self) -> None:
+        """
+        پیمایش درخت: ثبت عناصر در پیش‌ترتیب و جمع‌آوری آمار بلوک‌های محتوایی
+        (article/div/section) در پس‌ترتیب. آمار هر گره (طول متن، تعداد پاراگراف‌ها،
+        سرتیترها و متن لینک‌ها) از فرزندان به والد منتقل می‌شود، بنابراین هر گره
+        متنی فقط یک بار دیده می‌شود.
+        """
+        pending_classes = list(_CLASS_KEYWORDS)
+
+        # آمار بلوک‌های کاندیدا (به ترتیب پس‌ترتیب) برای امتیازدهی برداری در صورت نیاز
+        candidates: List[Tag] = []
+        lengths: List[int] = []
+        p_counts: List[int] = []
+        headings: List[bool] = []
+        link_lengths: List[int] = []
+
+        # آمار هر گره: [طول متن، تعداد قطعات متن، تعداد p، وجود سرتیتر، طول متن لینک‌ها]
+        stack = [(self.soup, iter(self.soup.contents), [0, 0, 0, False, 0])]
+        while stack:
+            node, children, stats = stack[-1]
+
+            child = next(children, None)
+            if child is not None:
+                if isinstance(child, Tag):
+                    self._visit(child, pending_classes)
+                    stack.append((child, iter(child.contents), [0, 0, 0, False, 0]))
+                elif type(child) in _TEXT_TYPES:
+                    text = child.strip()
+                    if text:
+                        stats[0] += len(text)
+                        stats[1] += 1
+                continue
+
+            stack.pop()
+            text_len, pieces, p_count, has_heading, link_len = stats
+
+            if node.name in _CANDIDATE_TAGS:
+                # طول متن با جداکننده فاصله (معادل get_text(separator=" ", strip=True))
+                candidates.append(node)
+                lengths.append(text_len + max(pieces - 1, 0))
+                p_counts.append(p_count)
+                headings.append(has_heading)
+                link_lengths.append(link_len)
+
+            # انتقال آمار به والد
+            if stack:
+                parent = stack[-1][2]
+                parent[0] += text_len
+                parent[1] += pieces
+                parent[2] += p_count + (node.name == 'p')
+                parent[3] = parent[3] or has_heading or node.name in _HEADING_TAGS
+                parent[4] += link_len + (text_len if node.name == 'a' else 0)
+
+        if candidates:
+            self._block_stats = (candidates, lengths, p_counts, headings, link_lengths)
+
+    @staticmethod
+    def _score_blocks(candidates: List[Tag], lengths: List[int], p_counts: List[int],
+                     headings: List[bool], link_lengths: List[int]) -> List[Tag]:
+        """
+        امتیازدهی همه بلوک‌های کاندیدا با عملیات برداری numpy.
+
+        Args:
+            candidates: بلوک‌های کاندیدا.
+            lengths: طول متن هر بلوک.
+            p_counts: تعداد پاراگراف‌های هر بلوک.
+            headings: وجود سرتیتر در هر بلوک.
+            link_lengths: طول متن لینک‌های هر بلوک.
+
+        Returns:
+            بلوک‌های دارای بیشترین امتیاز (به ترتیب پیمایش).
+        """
+        length = np.array(lengths, dtype=np.int64)
+        p_count = np.array(p_counts, dtype=np.int64)
+
+        # امتیاز پایه: طول متن؛ افزایش برای پاراگراف‌های متعدد و تگ‌های معنایی
+        scores = length + np.where(p_count > 2, p_count * 50, 0)
+        scores += 100 * np.array(headings, dtype=np.int64)
+
+        # کاهش امتیاز برای محتوای با لینک‌های زیاد (نسبت متن لینک بیش از نصف)
+        scores -= 200 * (2 * np.array(link_lengths, dtype=np.int64) > np.maximum(length, 1))
+
+        return [candidates[index] for index in np.flatnonzero(scores == scores.max())]
+
 
 class ContentExtractor:
     """
@@ -49,16 +572,47 @@ class ContentExtractor:
     _instance = None
     _lock = threading.Lock()
 
+    # افزودن زمان استخراج (رشته ISO) به نتیجه هر صفحه؛ در پردازش‌های پرحجم
+    # که این فیلد لازم نیست می‌توان آن را غیرفعال کرد
+    emit_timestamp = True
+
     def __new__(cls, nlp_model_path: Optional[str] = None,
                 use_classifier: bool = True,
                 auto_store: bool = False) -> 'ContentExtractor':
         """پیاده‌سازی الگوی Singleton برای بهینه‌سازی منابع"""
+        # پس از ساخت نمونه، قفل دیگر گرفته نمی‌شود
+        instance = cls._instance
+        if instance is not None:
+            return instance
+
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super(ContentExtractor, cls).__new__(cls)
                 cls._instance._initialized = False
             return cls._instance
 
+    @classmethod
+    def create_private(cls, nlp_model_path: Optional[str] = None,
+                       use_classifier: bool = True,
+                       auto_store: bool = False) -> 'ContentExtractor':
+        """
+        ساخت یک نمونه مستقل (خارج از الگوی Singleton) با تنظیمات داده‌شده.
+        فرایندهای کارگر extract_batch از این نمونه استفاده می‌کنند تا تنظیمات
+        آن‌ها (مانند auto_store=False) به نمونه مشترک فرایند وابسته نباشد.
+
+        Args:
+            nlp_model_path: مسیر فایل مدل NLP برای تحلیل موجودیت‌ها.
+            use_classifier: آیا از طبقه‌بندی کننده استفاده شود؟
+            auto_store: آیا محتوا به صورت خودکار در پایگاه داده ذخیره شود؟
+
+        Returns:
+            نمونه جدید ContentExtractor.
+        """
+        instance = super(ContentExtractor, cls).__new__(cls)
+        instance._initialized = False
+        instance.__init__(nlp_model_path, use_classifier=use_classifier, auto_store=auto_store)
+        return instance
+
     def __init__(self, nlp_model_path: Optional[str] = None,
                  use_classifier: bool = True,
                  auto_store: bool = False) -> None:
@@ -81,6 +635,11 @@ class ContentExtractor:
         self.storage_manager = None
         self.use_classifier = use_classifier
         self.auto_store = auto_store
+        self.max_ner_chars = NER_MAX_CHARS
+
+        # کش LRU موجودیت‌ها برای متون تکراری (کلید: هش متن)
+        self._entity_cache: OrderedDict = OrderedDict()
+        self._entity_cache_lock = threading.Lock()
 
         # آمار استخراج
         self.stats: Dict[str, Union[int, float, datetime, None, str]] = {
@@ -90,8 +649,20 @@ class ContentExtractor:
             'last_extraction_time': None,
             'start_time': datetime.now()
         }
+        # زمان آخرین استخراج به صورت شمارنده یکنواخت (فقط در get_stats به datetime تبدیل می‌شود)
+        self._last_extraction_ns: Optional[int] = None
+        # شمارنده‌ها از چند نخ به‌روز می‌شوند (بدون GIL، += روی دیکشنری اتمیک نیست)
+        self._stats_lock = threading.Lock()
+
+        # استخر نخ مشترک bulk_extract (ساخت تنبل در اولین استفاده)
+        self._io_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+        # استخرهای فرایند extract_batch (کلید: تعداد کارگرها و طبقه‌بندی؛ ساخت تنبل در اولین استفاده)
+        self._process_pools: Dict[Tuple[int, bool], concurrent.futures.ProcessPoolExecutor] = {}
 
         # بارگذاری مدل NLP
+        self.nlp_model_path = nlp_model_path
         self._load_nlp_model(nlp_model_path)
 
         # بارگذاری طبقه‌بندی کننده در صورت نیاز
@@ -124,29 +695,97 @@ class ContentExtractor:
         if spacy is not None:
             try:
                 if nlp_model_path and os.path.exists(nlp_model_path):
-                    self.nlp = spacy.load(nlp_model_path)
+                    self.nlp = self._load_ner_pipeline(nlp_model_path)
                     self.logger.info(f"مدل NLP از {nlp_model_path} بارگذاری شد")
                 else:
-                    try:
-                        self.nlp = spacy.load("fa_core_news_sm")
-                        self.logger.info("مدل پیش‌فرض fa_core_news_sm بارگذاری شد")
-                    except Exception as e:
+                    for model_name in _default_nlp_models():
+                        try:
+                            self.nlp = self._load_ner_pipeline(model_name)
+                            self.logger.info(f"مدل پیش‌فرض {model_name} بارگذاری شد")
+                            break
+                        except Exception as e:
+                            self.nlp = None
+
+                    if self.nlp is None:
                         self.logger.warning("مدل NLP فارسی یافت نشد. تحلیل موجودیت‌ها غیرفعال خواهد شد")
-                        self.nlp = None
             except Exception as e:
                 self.logger.error(f"خطا در بارگذاری مدل NLP: {str(e)}")
                 self.nlp = None
+
+            if self.nlp is not None:
+                # متن‌های ورودی کوتاه می‌شوند؛ سند بزرگ‌تر نشانه خطاست و نباید تخصیص یابد
+                self.nlp.max_length = self.max_ner_chars + 1024
         else:
             self.logger.warning("کتابخانه spacy نصب نشده است. تحلیل موجودیت‌ها غیرفعال خواهد شد")
 
-    def extract(self, html_content: str, url: str, job_type: Optional[str] = None) -> Dict[str, Any]:
+    @staticmethod
+    def _load_ner_pipeline(name_or_path: str):
+        """
+        بارگذاری مدل spaCy فقط با اجزای مورد نیاز برای استخراج موجودیت‌ها.
+
+        Args:
+            name_or_path: نام یا مسیر مدل spaCy.
+
+        Returns:
+            خط لوله spaCy بارگذاری‌شده.
+        """
+        try:
+            # وزن‌های اجزای غیرضروری اصلاً بارگذاری نمی‌شوند
+            return _get_nlp(name_or_path, NER_EXCLUDED_PIPES)
+        except Exception as e:
+            get_logger(__name__).warning(
+                f"بارگذاری مدل بدون اجزای اضافی ممکن نبود، بارگذاری کامل: {str(e)}")
+            nlp = _get_nlp(name_or_path)
+
+        # در صورت بارگذاری کامل، اجزای غیرضروری دست‌کم در زمان اجرا غیرفعال می‌شوند
+        # (به جای select_pipes در هر فراخوانی، چون مدل بین نخ‌ها مشترک است)
+        with _MODEL_CACHE_LOCK:
+            for name in NER_EXCLUDED_PIPES:
+                if name in nlp.pipe_names:
+                    nlp.disable_pipe(name)
+        return nlp
+
+    @classmethod
+    def preload(cls, nlp_model_path: Optional[str] = None):
+        """
+        بارگذاری و گرم کردن مدل NLP پیش از اولین درخواست.
+        مدل در کش فرایند قرار می‌گیرد و نمونه‌های بعدی ContentExtractor از همان
+        مدل استفاده می‌کنند. پردازش یک متن نمونه باعث می‌شود هزینه‌های اولین
+        اجرا (مانند ساخت واژگان) پیش از درخواست واقعی پرداخت شود.
+
+        Args:
+            nlp_model_path: مسیر فایل مدل NLP (اختیاری).
+
+        Returns:
+            خط لوله spaCy بارگذاری‌شده یا None در صورت عدم دسترسی.
+        """
+        if spacy is None:
+            return None
+
+        if nlp_model_path and os.path.exists(nlp_model_path):
+            candidates = (nlp_model_path,)
+        else:
+            candidates = _default_nlp_models()
+
+        for index, name_or_path in enumerate(candidates):
+            try:
+                nlp = cls._load_ner_pipeline(name_or_path)
+                break
+            except Exception:
+                if index == len(candidates) - 1:
+                    raise
+
+        nlp(NLP_WARMUP_TEXT)
+        return nlp
+
+    def extract(self, html_content: Union[str, bytes], url: str, job_type: Optional[str] = None) -> Dict[str, Any]:
         """
         استخراج اطلاعات ساختاری از محتوای HTML صفحه.
         این متد صفحه را پردازش کرده و اطلاعاتی مانند عنوان، محتوای اصلی،
         تاریخ انتشار، نویسنده و موجودیت‌های استخراج‌شده را برمی‌گرداند.
 
         Args:
-            html_content: محتوای HTML صفحه.
+            html_content: محتوای HTML صفحه (رشته یا بایت‌های خام پاسخ).
             url: آدرس صفحه.
             job_type: نوع صفحه (مثلاً 'page', 'list', 'detail').
 
@@ -154,14 +793,92 @@ class ContentExtractor:
             دیکشنری شامل اطلاعات استخراج‌شده.
             شامل کلیدهای "url"، "title"، "content"، "date"، "author" و "entities".
         """
-        self.stats['total_extractions'] += 1
-        self.stats['last_extraction_time'] = datetime.now()
+        return self.extract_many([(html_content, url, job_type)])[0]
+
+    def extract_many(self, items: Iterable[Tuple[Union[str, bytes], str, Optional[str]]],
+                     batch_size: Optional[int] = None, n_process: int = 1) -> List[Dict[str, Any]]:
+        """
+        استخراج اطلاعات ساختاری از چندین صفحه با پردازش دسته‌ای موجودیت‌ها.
+        ابتدا ساختار همه صفحات استخراج می‌شود و سپس متن‌ها یکجا با nlp.pipe
+        به مدل NLP داده می‌شوند.
+
+        Args:
+            items: مجموعه‌ای از سه‌تایی‌های (html_content, url, job_type).
+            batch_size: اندازه دسته‌های ارسالی به مدل NLP (پیش‌فرض NLP_BATCH_SIZE).
+            n_process: تعداد فرایندهای spaCy برای پردازش موجودیت‌ها
+                (روی GPU همیشه یک فرایند استفاده می‌شود).
+
+        Returns:
+            لیست دیکشنری‌های اطلاعات استخراج‌شده به ترتیب ورودی.
+        """
+        results = [self._extract_structure(html_content, url, job_type)
+                   for html_content, url, job_type in items]
+        self._add_entities(results, batch_size, n_process)
+        return results
+
+    def _add_entities(self, results: List[Dict[str, Any]], batch_size: Optional[int] = None,
+                      n_process: int = 1) -> None:
+        """
+        تکمیل موجودیت‌های نتایج استخراج با یک فراخوانی دسته‌ای nlp.pipe.
+
+        Args:
+            results: نتایج استخراج ساختاری (در جا به‌روزرسانی می‌شوند).
+            batch_size: اندازه دسته‌های ارسالی به مدل NLP (پیش‌فرض NLP_BATCH_SIZE).
+            n_process: تعداد فرایندهای spaCy برای پردازش موجودیت‌ها.
+        """
+        if not self.nlp:
+            return
+
+        texts = []
+        keys = {}
+        for index, data in enumerate(results):
+            if not self._needs_entities(data):
+                continue
+
+            # متون تکراری از کش پاسخ داده می‌شوند
+            key = self._entity_cache_key(data['content'])
+            cached = self._get_cached_entities(key)
+            if cached is not None:
+                data['entities'] = cached
+            else:
+                keys[index] = key
+                texts.append((self._prepare_ner_text(data['content']), index))
+
+        if batch_size is None:
+            batch_size = NLP_BATCH_SIZE
+        if NLP_DEVICE == 'gpu':
+            n_process = 1
+
+        try:
+            for doc, index in self.nlp.pipe(texts, as_tuples=True,
+                                            batch_size=batch_size, n_process=n_process):
+                entities = self._entities_from_doc(doc)
+                self._store_entities(keys[index], entities)
+                results[index]['entities'] = entities
+        except Exception as e:
+            self.logger.error(f"خطا در استخراج موجودیت‌ها: {str(e)}")
+
+    def _extract_structure(self, html_content: Union[str, bytes], url: str,
+                           job_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        استخراج اطلاعات ساختاری صفحه بدون تحلیل موجودیت‌ها.
+
+        Args:
+            html_content: محتوای HTML صفحه (بایت‌ها مستقیماً به پارسر داده می‌شوند
+                و کدگذاری از روی متاتگ charset تشخیص داده می‌شود).
+            url: آدرس صفحه.
+            job_type: نوع صفحه.
+
+        Returns:
+            دیکشنری اطلاعات استخراج‌شده (با موجودیت‌های خالی).
+        """
+        self._record_stats(total=1)
 
         try:
             # اطمینان از وجود محتوای HTML
             if not html_content:
-                self.logger.warning(f"محتوای HTML خالی برای URL {url}")
-                self.stats['failed_extractions'] += 1
+                self.logger.warning("محتوای HTML خالی برای URL %s", url)
+                self._record_stats(failed=1)
                 return {
                     "url": url,
                     "title": "",
@@ -173,45 +890,36 @@ class ContentExtractor:
                 }
 
             # پارس HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, HTML_PARSER)
 
             # حذف عناصر جانبی و ناخواسته
             self._clean_soup(soup)
 
-            # استخراج اطلاعات اصلی با استفاده از پردازش موازی
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                # استخراج عنوان
-                title_future = executor.submit(self._extract_title, soup)
+            # عنوان و متاتگ‌ها ابتدا با عبارات منظم در ابتدای سند جستجو می‌شوند
+            head = _scan_head(html_content)
 
-                # استخراج محتوای اصلی
-                content_future = executor.submit(self._extract_main_content, soup, job_type)
+            # استخراج عنوان، محتوای اصلی، تاریخ و نویسنده با یک پیمایش درخت
+            page = _PageIndex(soup)
+            main_content = self._extract_main_content(page, job_type, html_content)
+            if 'title' in head:
+                title = self._clean_title(head['title'])
+            else:
+                title = self._extract_title(page)
+            date = head.get('date') or self._extract_date(page)
+            author = head.get('author') or self._extract_author(page)
 
-                # استخراج تاریخ
-                date_future = executor.submit(self._extract_date, soup)
-
-                # استخراج نویسنده
-                author_future = executor.submit(self._extract_author, soup)
-
-                # دریافت نتایج
-                title = title_future.result()
-                main_content = content_future.result()
-                date = date_future.result()
-                author = author_future.result()
-
-            # استخراج موجودیت‌ها (غیر موازی به دلیل وابستگی به محتوا)
-            entities = self._extract_entities(main_content) if self.nlp else {}
-
-            # ایجاد دیکشنری نتیجه
+            # ایجاد دیکشنری نتیجه (موجودیت‌ها به صورت دسته‌ای تکمیل می‌شوند)
             extracted_data = {
                 "url": url,
                 "title": title,
                 "content": main_content,
                 "date": date,
                 "author": author,
-                "entities": entities,
-                "job_type": job_type,
-                "extraction_time": datetime.now().isoformat()
+                "entities": {},
+                "job_type": job_type
             }
+            if self.emit_timestamp:
+                extracted_data["extraction_time"] = datetime.now().isoformat()
 
             # استخراج داده‌های اضافی بر اساس نوع صفحه
             if job_type == 'list':
@@ -219,14 +927,15 @@ class ContentExtractor:
             elif job_type == 'detail':
                 extracted_data["related_links"] = self._extract_related_links(soup, url)
 
-            self.stats['successful_extractions'] += 1
-            self.logger.info(f"اطلاعات استخراج‌شده از {url} با موفقیت به‌دست آمد")
+            self._record_stats(successful=1)
+            # گزارش به ازای هر صفحه؛ پیشرفت کلی توسط فراخواننده ثبت می‌شود
+            self.logger.debug("اطلاعات استخراج‌شده از %s با موفقیت به‌دست آمد", url)
 
             return extracted_data
 
         except Exception as e:
-            self.stats['failed_extractions'] += 1
-            self.logger.error(f"خطا در استخراج اطلاعات از {url}: {str(e)}")
+            self._record_stats(failed=1)
+            self.logger.error("خطا در استخراج اطلاعات از %s: %s", url, e)
 
             return {
                 "url": url,
@@ -238,7 +947,7 @@ class ContentExtractor:
                 "error": str(e)
             }
 
-    def extract_and_classify(self, html_content: str, url: str, job_type: Optional[str] = None) -> Dict[str, Any]:
+    def extract_and_classify(self, html_content: Union[str, bytes], url: str, job_type: Optional[str] = None) -> Dict[str, Any]:
         """
         استخراج و طبقه‌بندی محتوا در یک فرایند.
 
@@ -252,7 +961,32 @@ class ContentExtractor:
         """
         # استخراج محتوا
         extracted_data = self.extract(html_content, url, job_type)
+        return self._classify_and_store(extracted_data, url)
+
+    def _classify_and_store(self, extracted_data: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """
+        طبقه‌بندی و ذخیره‌سازی خودکار داده‌های استخراج‌شده (در صورت فعال بودن).
+
+        Args:
+            extracted_data: اطلاعات استخراج‌شده صفحه.
+            url: آدرس صفحه.
 
+        Returns:
+            همان دیکشنری تکمیل‌شده با نتایج طبقه‌بندی و ذخیره‌سازی.
+        """
+        return self._store_content(self._classify_content(extracted_data, url), url)
+
+    def _classify_content(self, extracted_data: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """
+        طبقه‌بندی داده‌های استخراج‌شده (در صورت فعال بودن طبقه‌بندی کننده).
+
+        Args:
+            extracted_data: اطلاعات استخراج‌شده صفحه.
+            url: آدرس صفحه.
+
+        Returns:
+            همان دیکشنری تکمیل‌شده با نتایج طبقه‌بندی.
+        """
         # طبقه‌بندی محتوا در صورت موفقیت استخراج و فعال بودن طبقه‌بندی کننده
         if self.use_classifier and self.classifier and 'error' not in extracted_data:
             try:
@@ -265,20 +999,33 @@ class ContentExtractor:
                     'domains': classification.get('domains', {}).get('domains', [])
                 })
 
-                self.logger.info(f"محتوای {url} با موفقیت طبقه‌بندی شد")
+                self.logger.debug("محتوای %s با موفقیت طبقه‌بندی شد", url)
             except Exception as e:
-                self.logger.error(f"خطا در طبقه‌بندی محتوای {url}: {str(e)}")
+                self.logger.error("خطا در طبقه‌بندی محتوای %s: %s", url, e)
                 extracted_data['classification_error'] = str(e)
 
+        return extracted_data
+
+    def _store_content(self, extracted_data: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """
+        ذخیره‌سازی خودکار داده‌های استخراج‌شده (در صورت فعال بودن).
+
+        Args:
+            extracted_data: اطلاعات استخراج‌شده صفحه.
+            url: آدرس صفحه.
+
+        Returns:
+            همان دیکشنری تکمیل‌شده با شناسه ذخیره‌سازی.
+        """
         # ذخیره‌سازی خودکار در صورت نیاز
         if self.auto_store and self.storage_manager and 'error' not in extracted_data:
             try:
                 stored_item = self.storage_manager.store_content(extracted_data)
                 if stored_item:
                     extracted_data['stored_id'] = stored_item.id
-                    self.logger.info(f"محتوای {url} با موفقیت در پایگاه داده ذخیره شد (ID: {stored_item.id})")
+                    self.logger.debug("محتوای %s با موفقیت در پایگاه داده ذخیره شد (ID: %s)", url, stored_item.id)
             except Exception as e:
-                self.logger.error(f"خطا در ذخیره‌سازی محتوای {url}: {str(e)}")
+                self.logger.error("خطا در ذخیره‌سازی محتوای %s: %s", url, e)
                 extracted_data['storage_error'] = str(e)
 
         return extracted_data
@@ -287,6 +1034,9 @@ class ContentExtractor:
                     job_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         استخراج دسته‌ای محتوا از چندین صفحه.
+        ساختار صفحات به صورت موازی استخراج می‌شود و موجودیت‌های همه صفحات
+        در یک مرحله با nlp.pipe تحلیل می‌شوند. روی پایتون free-threaded
+        (اجرا با PYTHON_GIL=0) نخ‌های این متد واقعاً موازی اجرا می‌شوند.
 
         Args:
             urls: لیست آدرس‌های صفحات.
@@ -294,7 +1044,7 @@ class ContentExtractor:
             job_types: لیست انواع صفحات.
 
         Returns:
-            لیست دیکشنری‌های شامل اطلاعات استخراج شده.
+            لیست دیکشنری‌های شامل اطلاعات استخراج شده (به ترتیب ورودی).
         """
         if not urls or not html_contents:
             return []
@@ -302,26 +1052,138 @@ class ContentExtractor:
         if job_types is None:
             job_types = ['page'] * len(urls)
 
-        results = []
+        # برای یک صفحه ایجاد استخر نخ فقط سربار است
+        if len(urls) == 1:
+            try:
+                return [self.extract_and_classify(html_contents[0], urls[0], job_types[0])]
+            except Exception as e:
+                self.logger.error("خطا در استخراج محتوای %s: %s", urls[0], e)
+                return [{"url": urls[0], "error": str(e)}]
 
-        # استفاده از ThreadPoolExecutor برای پردازش موازی
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_url = {
-                executor.submit(self.extract_and_classify, html, url, job_type): url
-                for url, html, job_type in zip(urls, html_contents, job_types)
-            }
+        # با GIL فعال، نخ‌ها برای مراحل پردازنده‌محور (پارس، NER و طبقه‌بندی) موازی
+        # اجرا نمی‌شوند؛ دسته‌های بزرگ در فرایندهای جداگانه پردازش می‌شوند
+        if len(urls) >= BULK_PROCESS_MIN_DOCS and _GIL_ENABLED:
+            try:
+                results = self.extract_batch(zip(html_contents, urls, job_types),
+                                             classify=self.use_classifier)
+            except concurrent.futures.BrokenExecutor as e:
+                # خرابی استخر فرایند (مثلاً کمبود حافظه در بارگذاری مدل‌ها) نباید کل دسته را از بین ببرد؛
+                # همین دسته با استخر نخ پردازش می‌شود و خطای هر صفحه جداگانه گزارش می‌شود
+                self.logger.warning("استخر فرایند استخراج از کار افتاد؛ پردازش دسته با نخ‌ها: %s", e)
+            else:
+                # ذخیره‌سازی در فرایند اصلی (اتصال پایگاه داده بین فرایندها مشترک نیست)
+                return [self._store_content(data, url) for data, url in zip(results, urls)]
+
+        executor = self._get_io_pool()
+
+        # مرحله 1: استخراج ساختار صفحات به صورت موازی
+        results = list(executor.map(self._extract_structure, html_contents, urls, job_types))
+
+        # مرحله 2: استخراج موجودیت‌های همه صفحات با یک فراخوانی دسته‌ای nlp.pipe
+        # (چند فرایند فقط زمانی که بیش از یک دسته متن وجود دارد ارزش راه‌اندازی دارد)
+        n_process = NLP_N_PROCESS if len(results) > NLP_BATCH_SIZE else 1
+        self._add_entities(results, n_process=n_process)
+
+        # مرحله 3: طبقه‌بندی و ذخیره‌سازی
+        futures = [executor.submit(self._classify_and_store, data, url)
+                   for data, url in zip(results, urls)]
+
+        for index, future in enumerate(futures):
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                self.logger.error("خطا در استخراج محتوای %s: %s", urls[index], e)
+                results[index] = {
+                    "url": urls[index],
+                    "error": str(e)
+                }
+
+        return results
+
+    def _get_io_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        دریافت استخر نخ مشترک bulk_extract (در اولین استفاده ساخته می‌شود و
+        بین فراخوانی‌ها باقی می‌ماند تا هزینه ایجاد و توقف نخ‌ها تکرار نشود).
+
+        Returns:
+            استخر نخ استخراج‌کننده.
+        """
+        if self._io_pool is None:
+            with self._pool_lock:
+                if self._io_pool is None:
+                    pool = concurrent.futures.ThreadPoolExecutor(max_workers=PARSE_WORKERS,
+                                                                 thread_name_prefix="ce-io")
+                    atexit.register(pool.shutdown, wait=False)
+                    self._io_pool = pool
+        return self._io_pool
+
+    def _get_process_pool(self, max_workers: int, classify: bool) -> concurrent.futures.ProcessPoolExecutor:
+        """
+        دریافت استخر فرایند extract_batch (در اولین استفاده ساخته می‌شود و بین
+        فراخوانی‌ها باقی می‌ماند تا فرایندهای کارگر و مدل‌های بارگذاری‌شده آن‌ها گرم بمانند).
+
+        Args:
+            max_workers: تعداد فرایندهای کارگر.
+            classify: آیا محتوا در فرایندهای کارگر طبقه‌بندی شود؟
+
+        Returns:
+            استخر فرایند استخراج‌کننده.
+        """
+        key = (max_workers, classify)
+        pool = self._process_pools.get(key)
+        if pool is None:
+            with self._pool_lock:
+                pool = self._process_pools.get(key)
+                if pool is None:
+                    # spawn: فرایند فرزند فورک‌شده نمونه Singleton، قفل‌ها، استخر نخ و اتصال پایگاه داده
+                    # فرایند اصلی را (احتمالاً در حالت گرفته‌شده توسط نخ‌های دیگر) به ارث می‌برد
+                    pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                                  mp_context=multiprocessing.get_context('spawn'),
+                                                                  initializer=_init_extract_worker,
+                                                                  initargs=(self.nlp_model_path, classify))
+                    atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+                    self._process_pools[key] = pool
+        return pool
+
+    def extract_batch(self, docs: Iterable[Tuple[Union[str, bytes], str, Optional[str]]],
+                      max_workers: Optional[int] = None,
+                      classify: bool = False) -> List[Dict[str, Any]]:
+        """
+        استخراج چندفرایندی محتوا برای دسته‌های بزرگ صفحات.
+        هر فرایند کارگر یک نمونه ContentExtractor (و مدل NLP) را یک بار بارگذاری
+        و گرم می‌کند؛ استخر بین فراخوانی‌ها باقی می‌ماند و دسته‌های بعدی از همان
+        فرایندها استفاده می‌کنند.
+
+        Args:
+            docs: مجموعه‌ای از سه‌تایی‌های (html_content, url, job_type).
+            max_workers: تعداد فرایندهای کارگر (پیش‌فرض: تعداد هسته‌ها).
+            classify: آیا محتوا در فرایندهای کارگر طبقه‌بندی شود؟
+
+        Returns:
+            لیست دیکشنری‌های اطلاعات استخراج‌شده به ترتیب ورودی.
+        """
+        docs = list(docs)
+        if not docs:
+            return []
 
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    data = future.result()
-                    results.append(data)
-                except Exception as e:
-                    self.logger.error(f"خطا در استخراج محتوای {url}: {str(e)}")
-                    results.append({
-                        "url": url,
-                        "error": str(e)
-                    })
+        max_workers = max_workers or os.cpu_count() or 1
+
+        # ارسال تکه‌های بزرگ‌تر برای کاهش هزینه ارتباط بین فرایندها
+        chunksize = max(1, len(docs) // (4 * max_workers))
+
+        executor = self._get_process_pool(max_workers, classify)
+        try:
+            results = list(executor.map(_extract_in_worker, docs, chunksize=chunksize))
+        except concurrent.futures.BrokenExecutor:
+            # استخر خراب‌شده کنار گذاشته می‌شود تا فراخوانی بعدی استخر جدیدی بسازد
+            with self._pool_lock:
+                if self._process_pools.get((max_workers, classify)) is executor:
+                    del self._process_pools[(max_workers, classify)]
+            raise
+
+        # آمار فرایندهای کارگر به آمار این نمونه منتقل می‌شود
+        failed = sum(1 for data in results if 'error' in data)
+        self._record_stats(total=len(results), successful=len(results) - failed, failed=failed)
 
         return results
 
@@ -332,218 +1194,211 @@ class ContentExtractor:
         Args:
             soup: شیء BeautifulSoup.
         """
-        # حذف اسکریپت‌ها و استایل‌ها
-        for tag in soup.find_all(['script', 'style', 'iframe', 'noscript']):
-            tag.decompose()
-
-        # حذف عناصر جانبی
-        for tag in soup.find_all(['header', 'footer', 'nav', 'aside']):
-            tag.decompose()
+        # حذف اسکریپت‌ها، استایل‌ها، عناصر جانبی و تگ‌های مبتنی بر کلاس‌های معمول
+        # تبلیغات و محتوای اضافی در یک پیمایش
+        for tag in soup.find_all(True):
+            # عناصر داخل یک زیردرخت حذف‌شده نیازی به حذف مجدد ندارند
+            if tag.decomposed:
+                continue
 
-        # حذف تگ‌های مبتنی بر کلاس‌های معمول تبلیغات و محتوای اضافی
-        ad_classes = ['ads', 'advertisement', 'banner', 'popup', 'social', 'sharing', 'footer', 'menu']
-        for cls in ad_classes:
-            for tag in soup.find_all(class_=lambda x: x and cls in x.lower()):
+            if tag.name in _DROP_TAGS:
                 tag.decompose()
+                continue
+
+            cls = tag.get('class')
+            if cls:
+                if not isinstance(cls, str):
+                    cls = ' '.join(cls)
+                if _AD_AUTOMATON is not None:
+                    is_ad = next(_AD_AUTOMATON.iter(cls.lower()), None) is not None
+                else:
+                    is_ad = _AD_CLASS_RE.search(cls) is not None
+                if is_ad:
+                    tag.decompose()
 
     @staticmethod
-    def _extract_main_content(soup: BeautifulSoup, job_type: Optional[str] = None) -> str:
+    def _extract_main_content(page: _PageIndex, job_type: Optional[str] = None,
+                              html_content: Union[str, bytes, None] = None) -> str:
         """
         استخراج محتوای اصلی صفحه با یافتن بزرگترین بلوک متنی.
+        در صورت نصب بودن trafilatura ابتدا از آن استفاده می‌شود و روش امتیازدهی
+        فقط زمانی اجرا می‌شود که trafilatura محتوایی نیابد.
 
         Args:
-            soup: شیء BeautifulSoup صفحه.
+            page: نمایه عناصر صفحه.
             job_type: نوع صفحه.
+            html_content: محتوای خام HTML صفحه (برای trafilatura).
 
         Returns:
             متن استخراج‌شده به عنوان محتوای اصلی.
         """
+        if trafilatura is not None and html_content:
+            try:
+                content = trafilatura.extract(html_content, favor_precision=True,
+                                              include_comments=False, target_language="fa")
+            except Exception:
+                content = None
+            if content:
+                return content
+
         # استراتژی‌های مختلف بر اساس نوع صفحه
         if job_type == 'detail':
             # روش‌های خاص برای صفحات جزئیات
             content_candidates = [
-                soup.find('article'),
-                soup.find('div', class_=re.compile(r'(content|article|post|body|text|main)')),
-                soup.find('main'),
-                soup.find('section', class_=re.compile(r'(content|article)'))
+                page.article,
+                page.content_div,
+                page.main,
+                page.content_section
             ]
 
             for candidate in content_candidates:
-                if candidate and len(candidate.get_text(strip=True)) > 200:
-                    return candidate.get_text(separator=" ", strip=True)
-
-        # روش‌های عمومی
-        candidates = soup.find_all(['article', 'div', 'section'])
-
-        # ایجاد لیست کاندیداها با امتیازدهی
-        scored_candidates = []
-        for candidate in candidates:
-            if not candidate or not isinstance(candidate, Tag):
-                continue
-
-            text = candidate.get_text(separator=" ", strip=True)
-            score = len(text)
-
-            # افزایش امتیاز برای محتوای با پاراگراف‌های متعدد
-            p_tags = candidate.find_all('p')
-            if p_tags and len(p_tags) > 2:
-                score += len(p_tags) * 50
-
-            # افزایش امتیاز برای محتوای با تگ‌های معنایی
-            if candidate.find_all(['h1', 'h2', 'h3']):
-                score += 100
-
-            # کاهش امتیاز برای محتوای با لینک‌های زیاد
-            a_tags = candidate.find_all('a')
-            if a_tags:
-                a_text = sum(len(a.get_text(strip=True)) for a in a_tags)
-                a_ratio = a_text / max(1, len(text))
-                if a_ratio > 0.5:
-                    score -= 200
-
-            scored_candidates.append((score, text))
+                if candidate:
+                    # رشته‌ها یک بار جمع‌آوری می‌شوند و برای طول و متن نهایی استفاده می‌شوند
+                    strings = list(candidate.stripped_strings)
+                    if sum(map(len, strings)) > 200:
+                        return " ".join(strings)
 
-        # مرتب‌سازی و انتخاب بهترین کاندیدا
-        if scored_candidates:
-            scored_candidates.sort(reverse=True)
-            return scored_candidates[0][1]
+        # انتخاب بهترین کاندیدا (در صورت امتیاز برابر، مانند مرتب‌سازی قبلی متن بزرگ‌تر)
+        if page.best_blocks:
+            return max(block.get_text(separator=" ", strip=True) for block in page.best_blocks)
 
         # در صورت عدم یافتن محتوای مناسب، استفاده از کل متن صفحه
-        return soup.get_text(separator=" ", strip=True)
+        return page.soup.get_text(separator=" ", strip=True)
 
     @staticmethod
-    def _extract_title(soup: BeautifulSoup) -> str:
+    def _extract_title(page: _PageIndex) -> str:
         """
         استخراج عنوان صفحه از تگ‌های <title> یا <h1>.
 
         Args:
-            soup: شیء BeautifulSoup صفحه.
+            page: نمایه عناصر صفحه.
 
         Returns:
             عنوان استخراج‌شده.
         """
         # استراتژی 1: تگ title
-        if soup.title and soup.title.string:
-            title = soup.title.string.strip()
-            # حذف بخش‌های ثابت سایت از عنوان (مانند نام سایت)
-            title = re.sub(r'\s*[|]\s*.+$', '', title)
-            title = re.sub(r'\s*[-]\s*.+$', '', title)
-            return title
+        if page.title and page.title.string:
+            return ContentExtractor._clean_title(page.title.string.strip())
 
         # استراتژی 2: تگ h1 اصلی
-        h1_tags = soup.find_all('h1')
-        if h1_tags:
-            for h1 in h1_tags:
-                if h1.get_text(strip=True):
-                    return h1.get_text(strip=True)
+        for h1 in page.h1_tags:
+            text = page.stripped_text(h1)
+            if text:
+                return text
 
         # استراتژی 3: جستجو در کلاس‌های معمول عنوان
-        title_classes = ['title', 'heading', 'post-title', 'article-title', 'main-title']
-        for cls in title_classes:
-            title_elem = soup.find(class_=re.compile(cls, re.I))
-            if title_elem and title_elem.get_text(strip=True):
-                return title_elem.get_text(strip=True)
+        for cls in _TITLE_CLASSES:
+            title_elem = page.classes.get(cls)
+            if title_elem and page.stripped_text(title_elem):
+                return page.stripped_text(title_elem)
 
         # استراتژی 4: اولین h2 اگر h1 یافت نشد
-        h2 = soup.find('h2')
-        if h2 and h2.get_text(strip=True):
-            return h2.get_text(strip=True)
+        h2 = page.h2
+        if h2 and page.stripped_text(h2):
+            return page.stripped_text(h2)
 
         return ""
 
     @staticmethod
-    def _extract_date(soup: BeautifulSoup) -> str:
+    def _clean_title(title: str) -> str:
+        """
+        حذف بخش‌های ثابت سایت از عنوان (مانند نام سایت).
+
+        Args:
+            title: متن تگ title.
+
+        Returns:
+            عنوان پاکسازی‌شده.
+        """
+        title = _TITLE_TAIL_PIPE_RE.sub('', title)
+        title = _TITLE_TAIL_DASH_RE.sub('', title)
+        return title
+
+    @staticmethod
+    def _extract_date(page: _PageIndex) -> str:
         """
         استخراج تاریخ انتشار از تگ‌های <time> یا متا.
 
         Args:
-            soup: شیء BeautifulSoup صفحه.
+            page: نمایه عناصر صفحه.
 
         Returns:
             تاریخ استخراج‌شده.
         """
         # استراتژی 1: تگ time
-        time_tags = soup.find_all('time')
-        for tag in time_tags:
+        for tag in page.time_tags:
             if tag.has_attr('datetime'):
                 return tag['datetime'].strip()
-            elif tag.get_text(strip=True):
-                return tag.get_text(strip=True)
+            elif page.stripped_text(tag):
+                return page.stripped_text(tag)
 
         # استراتژی 2: متاتگ‌های مربوط به تاریخ
-        meta_tags = [
-            ('meta', {'property': 'article:published_time'}),
-            ('meta', {'property': 'article:modified_time'}),
-            ('meta', {'name': 'date'}),
-            ('meta', {'name': 'pubdate'}),
-            ('meta', {'name': 'publish_date'})
-        ]
-
-        for tag_name, attrs in meta_tags:
-            tag = soup.find(tag_name, attrs)
+        for key in _DATE_META_KEYS:
+            tag = page.meta.get(key)
             if tag and tag.get('content'):
                 return tag['content'].strip()
 
         # استراتژی 3: جستجو در کلاس‌های معمول تاریخ
-        date_classes = ['date', 'time', 'published', 'pubdate', 'timestamp']
-        for cls in date_classes:
-            date_elem = soup.find(class_=re.compile(cls, re.I))
-            if date_elem and date_elem.get_text(strip=True):
-                return date_elem.get_text(strip=True)
+        for cls in _DATE_CLASSES:
+            date_elem = page.classes.get(cls)
+            if date_elem and page.stripped_text(date_elem):
+                return page.stripped_text(date_elem)
 
         # استراتژی 4: جستجوی الگوهای تاریخ در متن
-        html_text = soup.get_text()
-        date_patterns = [
-            r'تاریخ(?:\s*انتشار)?[:]\s*(\d{4}/\d{1,2}/\d{1,2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}\s+[آ-یa-zA-Z]+\s+\d{4})',
-            r'(\d{4}/\d{1,2}/\d{1,2}|\d{1,2}/\d{1,2}/\d{4})',
-            r'(\d{1,2}\s+[آ-یa-zA-Z]+\s+\d{4})'
-        ]
+        # یک گذر ترکیبی؛ در صورت نبود هیچ تاریخی کار همین‌جا تمام می‌شود
+        html_text = page.text
+        match = _DATE_COMBINED_RE.search(html_text)
+        if not match:
+            return ""
 
-        for pattern in date_patterns:
-            match = re.search(pattern, html_text)
-            if match:
-                return match.group(1).strip()
+        position = match.start()
+        index = next(i for i in range(len(_DATE_PATTERNS)) if match.group(f'p{i}') is not None)
 
-        return ""
+        # الگوهای با اولویت بالاتر فقط پس از این موقعیت ممکن است تطابق داشته باشند
+        for pattern in _DATE_PATTERNS[:index]:
+            higher = pattern.search(html_text, position)
+            if higher:
+                return higher.group(1).strip()
+
+        return _DATE_PATTERNS[index].match(html_text, position).group(1).strip()
 
     @staticmethod
-    def _extract_author(soup: BeautifulSoup) -> str:
+    def _extract_author(page: _PageIndex) -> str:
         """
         استخراج نام نویسنده از تگ‌های مختلف.
 
         Args:
-            soup: شیء BeautifulSoup صفحه.
+            page: نمایه عناصر صفحه.
 
         Returns:
             نام نویسنده استخراج‌شده.
         """
         # استراتژی 1: متاتگ نویسنده
-        meta_author = soup.find('meta', {'name': 'author'})
+        meta_author = page.meta.get(_AUTHOR_META_KEY)
         if meta_author and meta_author.get('content'):
             return meta_author['content'].strip()
 
         # استراتژی 2: تگ‌های با کلاس یا شناسه مرتبط با نویسنده
-        author_classes = ['author', 'writer', 'byline', 'by']
-
-        for cls in author_classes:
-            author_tag = soup.find(class_=re.compile(cls, re.I))
-            if author_tag and author_tag.get_text(strip=True):
+        for cls in _AUTHOR_CLASSES:
+            author_tag = page.classes.get(cls)
+            if author_tag and page.stripped_text(author_tag):
                 # پاکسازی متن استخراج شده
-                author_text = author_tag.get_text(strip=True)
+                author_text = page.stripped_text(author_tag)
                 # حذف پیشوندهای متداول
-                author_text = re.sub(r'^(?:نویسنده|نگارنده|نوشته)[:]\s*', '', author_text, flags=re.I)
+                author_text = _AUTHOR_PREFIX_RE.sub('', author_text)
                 return author_text
 
-        # استراتژی 3: جستجوی الگوهای نویسنده در متن
-        html_text = soup.get_text()
-        author_patterns = [
-            r'نویسنده[:]\s*([آ-یA-Za-z\s]+)',
-            r'نگارنده[:]\s*([آ-یA-Za-z\s]+)',
-            r'نوشته[:]\s*([آ-یA-Za-z\s]+)'
-        ]
-
-        for pattern in author_patterns:
-            match = re.search(pattern, html_text)
+        # استراتژی 3: نشانه‌گذاری ساختاریافته نویسنده
+        author_ref = page.author_ref
+        if author_ref is not None:
+            author_text = author_ref.get('content') or page.stripped_text(author_ref)
+            if author_text:
+                return author_text.strip()
+
+        # استراتژی 4: جستجوی الگوهای نویسنده در متن
+        html_text = page.text
+        for pattern in _AUTHOR_PATTERNS:
+            match = pattern.search(html_text)
             if match:
                 author = match.group(1).strip()
                 # اعتبارسنجی طول نام
@@ -562,44 +1417,131 @@ class ContentExtractor:
         Returns:
             دیکشنری شامل موجودیت‌های استخراج‌شده به تفکیک برچسب.
         """
-        entities: Dict[str, List[str]] = {}
-
         if not self.nlp or not text:
-            return entities
+            return {}
+
+        key = self._entity_cache_key(text)
+        cached = self._get_cached_entities(key)
+        if cached is not None:
+            return cached
 
         try:
-            # پیش‌پردازش و محدود کردن طول متن برای عملکرد بهتر
-            if len(text) > 10000:
-                text = text[:10000]  # محدود کردن طول برای بهبود کارایی
+            # پردازش متن با مدل spaCy
+            entities = self._entities_from_doc(self.nlp(self._prepare_ner_text(text)))
+        except Exception as e:
+            self.logger.error(f"خطا در استخراج موجودیت‌ها: {str(e)}")
+            return {}
 
-            # نرمال‌سازی متن
-            normalized_text = normalize_persian_text(text)
+        self._store_entities(key, entities)
+        return entities
 
-            # پردازش متن با مدل spaCy
-            doc = self.nlp(normalized_text)
+    @staticmethod
+    def _entity_cache_key(text: str) -> bytes:
+        """
+        ساخت کلید کش موجودیت‌ها از هش متن.
+
+        Args:
+            text: متن ورودی.
 
-            # استخراج و دسته‌بندی موجودیت‌ها
-            for ent in doc.ents:
-                label = ent.label_
+        Returns:
+            هش ۱۶ بایتی متن.
+        """
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
 
-                if label not in entities:
-                    entities[label] = []
+    def _get_cached_entities(self, key: bytes) -> Optional[Dict[str, List[str]]]:
+        """
+        دریافت موجودیت‌های کش‌شده برای یک کلید.
 
-                # نرمال‌سازی و افزودن موجودیت
-                entity_text = ent.text.strip()
+        Args:
+            key: کلید کش.
 
-                # اضافه کردن موجودیت اگر تکراری نباشد
-                if entity_text and entity_text not in entities[label]:
-                    entities[label].append(entity_text)
+        Returns:
+            کپی موجودیت‌ها یا None در صورت عدم وجود در کش.
+        """
+        with self._entity_cache_lock:
+            cached = self._entity_cache.get(key)
+            if cached is None:
+                return None
+            self._entity_cache.move_to_end(key)
 
-            # حذف تکرارهای موجودیت و مرتب‌سازی
-            for label in entities:
-                entities[label] = sorted(list(set(entities[label])))
+        return {label: list(values) for label, values in cached.items()}
 
-        except Exception as e:
-            self.logger.error(f"خطا در استخراج موجودیت‌ها: {str(e)}")
+    def _store_entities(self, key: bytes, entities: Dict[str, List[str]]) -> None:
+        """
+        ذخیره موجودیت‌های استخراج‌شده در کش LRU.
 
-        return entities
+        Args:
+            key: کلید کش.
+            entities: موجودیت‌های استخراج‌شده.
+        """
+        frozen = {label: tuple(values) for label, values in entities.items()}
+        with self._entity_cache_lock:
+            self._entity_cache[key] = frozen
+            self._entity_cache.move_to_end(key)
+            if len(self._entity_cache) > ENTITY_CACHE_SIZE:
+                self._entity_cache.popitem(last=False)
+
+    @staticmethod
+    def _needs_entities(data: Dict[str, Any]) -> bool:
+        """
+        بررسی ارزش تحلیل موجودیت‌ها برای نتیجه استخراج یک صفحه.
+
+        Args:
+            data: دیکشنری اطلاعات استخراج‌شده.
+
+        Returns:
+            آیا تحلیل موجودیت‌ها انجام شود؟
+        """
+        if 'error' in data or data.get('job_type') in NER_SKIP_JOB_TYPES:
+            return False
+
+        # متن‌های کوتاه معمولاً موجودیت مفیدی ندارند
+        return len(data['content']) >= NER_MIN_CHARS
+
+    def _prepare_ner_text(self, text: str) -> str:
+        """
+        آماده‌سازی متن برای مدل NLP (محدودسازی طول و نرمال‌سازی).
+
+        Args:
+            text: متن ورودی.
+
+        Returns:
+            متن نرمال‌شده.
+        """
+        # محدود کردن طول متن پیش از نرمال‌سازی (در آخرین مرز جمله)
+        if len(text) > self.max_ner_chars:
+            text = text[:self.max_ner_chars]
+            end = max(text.rfind(mark) for mark in _SENTENCE_ENDS)
+            if end > 0:
+                text = text[:end + 1]
+
+        # نرمال‌سازی متن
+        return normalize_persian_text(text)
+
+    @staticmethod
+    def _entities_from_doc(doc) -> Dict[str, List[str]]:
+        """
+        تبدیل موجودیت‌های یک سند spaCy به دیکشنری برچسب‌ها.
+
+        Args:
+            doc: سند پردازش‌شده spaCy.
+
+        Returns:
+            دیکشنری شامل موجودیت‌های استخراج‌شده به تفکیک برچسب.
+        """
+        buckets: Dict[str, set] = defaultdict(set)
+
+        # استخراج و دسته‌بندی موجودیت‌ها (مجموعه‌ها تکرارها را حذف می‌کنند)
+        for ent in doc.ents:
+            # برچسب‌ها بین همه اسناد مشترک‌اند و یک نسخه از هر کدام کافی است
+            bucket = buckets[sys.intern(ent.label_)]
+            entity_text = ent.text.strip()
+            if entity_text:
+                # موجودیت‌های پرتکرار در کل پیکره یک نسخه مشترک از رشته دارند
+                bucket.add(sys.intern(entity_text))
+
+        # مرتب‌سازی موجودیت‌های هر برچسب
+        return {label: sorted(values) for label, values in buckets.items()}
 
     @staticmethod
     def _extract_list_items(soup: BeautifulSoup) -> List[Dict[str, str]]:
@@ -614,19 +1556,19 @@ class ContentExtractor:
         """
         items = []
 
-        # یافتن کانتینر لیست
-        list_containers = [
-            soup.find('ul', class_=re.compile(r'(list|items|posts|articles)')),
-            soup.find('div', class_=re.compile(r'(list|items|posts|articles)')),
-            soup.find('section', class_=re.compile(r'(list|items|posts|articles)'))
-        ]
-
-        container = next((c for c in list_containers if c is not None), None)
+        # یافتن کانتینر لیست (یک پیمایش برای بررسی وجود؛ در صورت نبود هیچ کانتینری
+        # جستجوی جداگانه هر نوع تگ که هر کدام کل درخت را می‌پیمایند انجام نمی‌شود)
+        container = None
+        if soup.find(['ul', 'div', 'section'], class_=_LIST_CLASS_RE) is not None:
+            list_containers = (
+                soup.find(name, class_=_LIST_CLASS_RE) for name in ('ul', 'div', 'section')
+            )
+            container = next((c for c in list_containers if c is not None), None)
 
         if not container:
             # در صورت عدم یافتن کانتینر مشخص، جستجوی مستقیم آیتم‌ها
             item_elements = soup.find_all(['article', 'div', 'li'],
-                class_=re.compile(r'(item|post|article)'))
+                class_=_ITEM_CLASS_RE)
         else:
             # جستجو در کانتینر
             item_elements = container.find_all(['article', 'div', 'li'])
@@ -652,7 +1594,7 @@ class ContentExtractor:
                 item_data['link'] = link
 
             # استخراج خلاصه
-            summary_elem = item.find(['p', 'div'], class_=re.compile(r'(summary|excerpt|desc)'))
+            summary_elem = item.find(['p', 'div'], class_=_SUMMARY_CLASS_RE)
             if summary_elem:
                 item_data['summary'] = summary_elem.get_text(strip=True)
 
@@ -674,16 +1616,29 @@ class ContentExtractor:
         Returns:
             لیست لینک‌های مرتبط (هر لینک شامل عنوان و آدرس).
         """
-        related_links = []
+        unique_links = []
+        seen_urls = set()
+
+        def add_link(title: str, href: str) -> bool:
+            """افزودن لینک غیرتکراری؛ با رسیدن به سقف 10 لینک True برمی‌گرداند"""
+            if href not in seen_urls:
+                seen_urls.add(href)
+                unique_links.append({'title': title, 'url': href})
+            return len(unique_links) >= 10
+
+        # آدرس پایه برای تکمیل لینک‌های نسبی (یک بار برای همه لینک‌ها)
+        parsed_current = urlparse(current_url)
+        base_url = f"{parsed_current.scheme}://{parsed_current.netloc}"
 
         # استراتژی 1: جستجو در کانتینرهای معمول لینک‌های مرتبط
         related_containers = [
-            soup.find('div', class_=re.compile(r'(related|similar|suggested)')),
-            soup.find('section', class_=re.compile(r'(related|similar|suggested)')),
-            soup.find('ul', class_=re.compile(r'(related|similar|suggested)'))
+            soup.find('div', class_=_RELATED_CLASS_RE),
+            soup.find('section', class_=_RELATED_CLASS_RE),
+            soup.find('ul', class_=_RELATED_CLASS_RE)
         ]
 
         container = next((c for c in related_containers if c is not None), None)
+        found_in_container = False
 
         if container:
             # جستجوی لینک‌ها در کانتینر
@@ -696,26 +1651,25 @@ class ContentExtractor:
 
                 # تکمیل لینک‌های نسبی
                 if not href.startswith(('http://', 'https://')):
-                    parsed_current = urlparse(current_url)
-                    base_url = f"{parsed_current.scheme}://{parsed_current.netloc}"
                     href = urljoin(base_url, href)
 
-                related_links.append({
-                    'title': a_tag.get_text(strip=True),
-                    'url': href
-                })
+                found_in_container = True
+                # پس از 10 لینک یکتا ادامه پیمایش کانتینر بی‌فایده است
+                if add_link(a_tag.get_text(strip=True), href):
+                    break
 
         # استراتژی 2: جستجوی عمومی در بخش پایین صفحه
-        if not related_links:
+        if not found_in_container:
             # محدود کردن جستجو به نیمه پایین صفحه
             body = soup.find('body')
-            if body:
-                all_elements = body.find_all()
-
+            # صفحه بدون هیچ لینکی نیازی به شمارش و پیمایش عناصر ندارد
+            if body and body.find('a', href=True) is not None:
                 # فرض کنیم لینک‌های مرتبط در نیمه دوم صفحه قرار دارند
-                start_index = len(all_elements) // 2
+                # (عناصر شمرده و سپس بدون ساخت لیست از نیمه پیمایش می‌شوند)
+                start_index = sum(1 for node in body.descendants if isinstance(node, Tag)) // 2
+                elements = (node for node in body.descendants if isinstance(node, Tag))
 
-                for element in all_elements[start_index:]:
+                for element in islice(elements, start_index, None):
                     if element.name == 'a' and element.has_attr('href'):
                         href = element['href']
 
@@ -725,30 +1679,33 @@ class ContentExtractor:
 
                         # تکمیل لینک‌های نسبی
                         if not href.startswith(('http://', 'https://')):
-                            parsed_current = urlparse(current_url)
-                            base_url = f"{parsed_current.scheme}://{parsed_current.netloc}"
                             href = urljoin(base_url, href)
 
                         # افزودن لینک در صورت وجود متن
-                        if element.get_text(strip=True):
-                            related_links.append({
-                                'title': element.get_text(strip=True),
-                                'url': href
-                            })
+                        title = element.get_text(strip=True)
+                        if title and add_link(title, href):
+                            break
 
-        # حذف لینک‌های تکراری و محدود کردن به 10 لینک
-        unique_links = []
-        seen_urls = set()
-
-        for link in related_links:
-            if link['url'] not in seen_urls:
-                seen_urls.add(link['url'])
-                unique_links.append(link)
+        return unique_links
 
-                if len(unique_links) >= 10:
-                    break
+    def _record_stats(self, total: int = 0, successful: int = 0, failed: int = 0) -> None:
+        """
+        به‌روزرسانی اتمیک شمارنده‌های آمار استخراج.
 
-        return unique_links
+        Args:
+            total: تعداد استخراج‌های آغازشده.
+            successful: تعداد استخراج‌های موفق.
+            failed: تعداد استخراج‌های ناموفق.
+        """
+        with self._stats_lock:
+            stats = self.stats
+            if total:
+                stats['total_extractions'] += total
+                self._last_extraction_ns = time.monotonic_ns()
+            if successful:
+                stats['successful_extractions'] += successful
+            if failed:
+                stats['failed_extractions'] += failed
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -757,17 +1714,77 @@ class ContentExtractor:
         Returns:
             آمار استخراج محتوا
         """
+        # تصویر سازگار از شمارنده‌ها
+        with self._stats_lock:
+            stats = self.stats.copy()
+            last_extraction_ns = self._last_extraction_ns
+
         # محاسبه زمان اجرا
-        runtime_seconds = (datetime.now() - self.stats['start_time']).total_seconds()
+        runtime_seconds = (datetime.now() - stats['start_time']).total_seconds()
 
         # محاسبه نرخ موفقیت
         success_rate = 0
-        if self.stats['total_extractions'] > 0:
-            success_rate = self.stats['successful_extractions'] / self.stats['total_extractions']
+        if stats['total_extractions'] > 0:
+            success_rate = stats['successful_extractions'] / stats['total_extractions']
 
         # آمار به‌روزرسانی شده
-        stats = self.stats.copy()
+        if last_extraction_ns is not None:
+            elapsed_ns = time.monotonic_ns() - last_extraction_ns
+            stats['last_extraction_time'] = datetime.now() - timedelta(microseconds=elapsed_ns // 1000)
         stats['runtime_seconds'] = runtime_seconds
         stats['success_rate'] = success_rate
 
-        return stats
\ No newline at end of file
+        return stats
+
+
+# نمونه استخراج‌کننده هر فرایند کارگر در extract_batch
+_worker_extractor: Optional[ContentExtractor] = None
+
+
+_worker_classify = False
+
+
+def _init_extract_worker(nlp_model_path: Optional[str], classify: bool = False) -> None:
+    """
+    مقداردهی اولیه فرایند کارگر extract_batch (یک بار برای هر فرایند استخر ماندگار).
+
+    Args:
+        nlp_model_path: مسیر مدل NLP.
+        classify: آیا محتوا در فرایند کارگر طبقه‌بندی شود؟
+    """
+    global _worker_extractor, _worker_classify
+    try:
+        # گرم کردن مدل پیش از اولین سند (مدل در کش فرایند می‌ماند و نمونه کارگر از آن استفاده می‌کند)
+        ContentExtractor.preload(nlp_model_path)
+    except Exception:
+        pass
+    _worker_extractor = ContentExtractor.create_private(nlp_model_path, use_classifier=classify, auto_store=False)
+    _worker_classify = classify
+
+
+def _extract_in_worker(doc: Tuple[Union[str, bytes], str, Optional[str]]) -> Dict[str, Any]:
+    """
+    استخراج یک صفحه در فرایند کارگر.
+
+    Args:
+        doc: سه‌تایی (html_content, url, job_type).
+
+    Returns:
+        دیکشنری اطلاعات استخراج‌شده.
+    """
+    html_content, url, job_type = doc
+    data = _worker_extractor.extract(html_content, url, job_type)
+    if _worker_classify:
+        # ذخیره‌سازی در فرایند اصلی انجام می‌شود
+        data = _worker_extractor._classify_content(data, url)
+    return data
+
+
+# بارگذاری زودهنگام مدل NLP برای حذف تأخیر اولین درخواست (با متغیر محیطی)؛
+# فرایندهای فرزند (مانند کارگرهای تجزیه spawn) متغیرهای محیطی را به ارث می‌برند اما به مدل نیاز ندارند
+if (os.getenv('CRAWLER_PRELOAD_NLP', '').lower() in ('1', 'true', 't')
+        and multiprocessing.parent_process() is None):
+    try:
+        ContentExtractor.preload(os.getenv('NLP_MODEL_PATH'))
+    except Exception as e:
+        get_logger(__name__).warning("خطا در بارگذاری زودهنگام مدل NLP: %s", e)
@@ -5,27 +5,213 @@
 """
 
 import os
+import io
+import sys
 import time
+import random
+import heapq
+import itertools
+import zlib
 import threading
 import queue
+import multiprocessing
+import concurrent.futures
+from collections import OrderedDict
+from contextlib import contextmanager, ExitStack
 from urllib.parse import urljoin, urlparse
 import json
 from datetime import datetime
 import xml.etree.ElementTree as ET
 
-from utils.logger import get_logger, get_crawler_logger
-from utils.http import RequestManager, normalize_url
+from utils.logger import get_logger, get_crawler_logger, start_background_logging, stop_background_logging
+from utils.http import RequestManager, normalize_url, cached_urlparse
 from core.structure_discovery import StructureDiscovery
-from utils.text import extract_links, extract_main_content, extract_title, extract_date, extract_author
+from utils.page_parser import extract_page_data, parse_page, page_links
+
+# تلاش برای import orjson (سریال‌سازی سریع‌تر نقاط بازیابی)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# تلاش برای import pybloom_live (فیلتر بلوم مقیاس‌پذیر برای URLهای بازدید شده)
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
 
 # تنظیم لاگرها
 logger = get_logger(__name__)
 crawler_logger = get_crawler_logger()
 
+# تعداد فرایندهای تجزیه صفحات (0 برای تجزیه درون نخ‌های کارگر)
+PARSE_PROCESSES = int(os.getenv('CRAWLER_PARSE_PROCESSES', os.cpu_count() or 1))
+
+# تعداد بخش‌های وضعیت خزش (توانی از دو، هر بخش قفل جداگانه دارد)
+STATE_SHARDS = 16
+
+# شمارنده‌های آمار وضعیت خزش (به ترتیب خانه‌های لیست شمارنده هر بخش)
+_STAT_KEYS = ('total_urls', 'successful_urls', 'failed_urls', 'skipped_urls')
+_TOTAL, _SUCCESSFUL, _FAILED, _SKIPPED = range(len(_STAT_KEYS))
+
+# خانه‌های رکورد فشرده هر URL ناموفق (تاپل به جای دیکشنری)
+_FAILURE_FIELDS = ('attempts', 'last_attempt', 'last_status_code', 'last_error')
+_ATTEMPTS, _LAST_ATTEMPT, _LAST_STATUS_CODE, _LAST_ERROR = range(len(_FAILURE_FIELDS))
+_NO_FAILURE = (0, 0.0, 0, None)
+
+# اندازه پشته نخ‌های دریافت (بایت)؛ این نخ‌ها فقط منتظر ورودی/خروجی شبکه‌اند و پشته کوچک
+# اجازه می‌دهد صدها نخ دریافت بدون رزرو حافظه مجازی زیاد اجرا شوند
+FETCH_THREAD_STACK_SIZE = 512 * 1024
+
+# حداکثر تعداد کارهایی که یک نخ در هر بار دزدیدن از صف نخ دیگر برمی‌دارد
+STEAL_BATCH_SIZE = 32
+
+# کمینه و بیشینه انتظار (ثانیه) بین دورهای جستجوی کار در صف‌ها
+STEAL_BACKOFF_MIN = 0.00001
+STEAL_BACKOFF_MAX = 0.001
+
+# ظرفیت اولیه و نرخ خطای فیلتر بلوم URLهای بازدید شده (برای هر بخش)
+VISITED_BLOOM_CAPACITY = 1000000 // STATE_SHARDS
+VISITED_BLOOM_ERROR_RATE = 1e-7
+
+
+def _new_visited_set():
+    """
+    ساخت ساختار عضویت URLهای بازدید شده
+
+    در صورت نصب بودن pybloom_live از فیلتر بلوم مقیاس‌پذیر (حدود دو بایت به ازای هر URL)
+    و در غیر این صورت از set معمولی استفاده می‌شود. هر دو add و in را پشتیبانی می‌کنند.
+
+    Returns:
+        ScalableBloomFilter یا set
+    """
+    if ScalableBloomFilter is None:
+        return set()
+
+    return ScalableBloomFilter(initial_capacity=VISITED_BLOOM_CAPACITY,
+                               error_rate=VISITED_BLOOM_ERROR_RATE,
+                               mode=ScalableBloomFilter.LARGE_SET_GROWTH)
+
+
+def _dump_visited_set(visited):
+    """
+    سریال‌سازی یک فیلتر بلوم مقیاس‌پذیر با قالب فایل خود pybloom_live (ScalableBloomFilter.tofile)
+
+    فقط سرآیندها و آرایه‌های بیتی فیلترها (کپی حافظه پیوسته) نوشته می‌شوند؛ بنابراین زیر قفل
+    بخش ارزان است. شمارنده و ظرفیت هر فیلتر نیز ذخیره می‌شوند تا فیلتر بازیابی‌شده درست رشد کند.
+
+    Args:
+        visited: ScalableBloomFilter
+
+    Returns:
+        bytes: فیلتر سریال‌شده
+    """
+    buffer = io.BytesIO()
+    visited.tofile(buffer)
+    return buffer.getvalue()
+
+
+def _load_visited_sets(data):
+    """
+    خواندن فیلترهای بلوم همه بخش‌ها که پشت سر هم با _dump_visited_set نوشته شده‌اند
+
+    Args:
+        data: محتوای فایل جانبی فیلترهای بلوم
+
+    Returns:
+        list: یک ScalableBloomFilter برای هر بخش
+    """
+    buffer = io.BytesIO(data)
+    visited = [ScalableBloomFilter.fromfile(buffer) for _ in range(STATE_SHARDS)]
+    if buffer.read(1):
+        raise ValueError("تعداد فیلترهای بلوم فایل با تعداد بخش‌های وضعیت خزش یکسان نیست")
+    return visited
+
+
+def _dumps_json(data):
+    """
+    سریال‌سازی داده به JSON (بایت) با orjson در صورت وجود
+
+    Args:
+        data: داده قابل سریال‌سازی (مقادیر datetime به قالب ISO تبدیل می‌شوند)
+
+    Returns:
+        bytes: متن JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+
+    return json.dumps(data, ensure_ascii=False,
+                      default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value)
+                      ).encode('utf-8')
+
+
+def _loads_json(data):
+    """
+    تجزیه JSON (بایت یا رشته) با orjson در صورت وجود
+
+    Args:
+        data: متن JSON
+
+    Returns:
+        داده تجزیه‌شده
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def _write_atomic(path, data):
+    """
+    نوشتن اتمیک یک فایل (نوشتن در فایل موقت و جایگزینی با os.replace)
+
+    Args:
+        path: مسیر فایل مقصد
+        data: محتوای بایتی
+
+    Returns:
+        None
+    """
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _failure_record(info):
+    """
+    تبدیل رکورد URL ناموفق خوانده‌شده از نقطه بازیابی به تاپل فشرده
+
+    Args:
+        info: لیست ذخیره‌شده یا دیکشنری نقاط بازیابی قدیمی
+
+    Returns:
+        tuple: (تعداد تلاش‌ها، زمان آخرین تلاش، آخرین کد وضعیت، آخرین خطا)
+    """
+    if isinstance(info, dict):
+        last_attempt = info.get('last_attempt')
+        try:
+            last_attempt = datetime.fromisoformat(last_attempt).timestamp()
+        except (TypeError, ValueError):
+            last_attempt = 0.0
+        info = (info.get('attempts', 1), last_attempt, info.get('last_status_code'), info.get('last_error'))
+
+    attempts, last_attempt, status_code, error = info
+    return (int(attempts), float(last_attempt), status_code or 0, error)
+
 
 class CrawlJob:
     """کلاس نمایش‌دهنده یک کار خزش"""
 
+    # به ازای هر لینک کشف‌شده یک نمونه ساخته می‌شود؛ بدون __dict__ حافظه کمتری مصرف می‌شود
+    __slots__ = ('url', 'depth', 'priority', 'parent_url', 'referrer', 'job_type', 'created_at', 'domain', 'path')
+
     def __init__(self, url, depth=0, priority=0, parent_url=None, referrer=None, job_type='page'):
         """
         مقداردهی اولیه کار خزش
@@ -44,10 +230,10 @@ class CrawlJob:
         self.parent_url = parent_url
         self.referrer = referrer
         self.job_type = job_type
-        self.created_at = datetime.now()
+        self.created_at = time.monotonic()  # زمان ایجاد (ساعت یکنوا، برای مقایسه سن کارها)
 
         # از URL، دامنه و مسیر استخراج می‌شود
-        parsed = urlparse(url)
+        parsed = cached_urlparse(url)
         self.domain = parsed.netloc
         self.path = parsed.path
 
@@ -111,7 +297,7 @@ class CrawlJob:
             'domain': self.domain,
             'path': self.path,
             'parent_url': self.parent_url,
-            'created_at': self.created_at.isoformat()
+            'created_at': datetime.fromtimestamp(time.time() - (time.monotonic() - self.created_at)).isoformat()
         }
 
     def is_high_priority(self):
@@ -159,31 +345,85 @@ class CrawlState:
         """
         مقداردهی اولیه وضعیت خزش
 
+        ساختارهای وضعیت به STATE_SHARDS بخش تقسیم شده‌اند و هر بخش قفل مخصوص به خود را دارد
+        تا نخ‌هایی که URLهای متفاوت را پردازش می‌کنند برای یک قفل سراسری رقابت نکنند.
+
         Args:
             max_urls: حداکثر تعداد URL برای ذخیره‌سازی در تاریخچه
             checkpoint_file: مسیر فایل برای ذخیره نقاط بازیابی
         """
-        self.visited_urls = set()
-        self.url_history = {}  # نگاشت URL به زمان و وضعیت بازدید
-        self.failed_urls = {}  # نگاشت URL به تعداد تلاش‌ها و خطاهای مربوطه
-        self.in_progress = set()  # URLهای در حال پردازش
         self.checkpointed = False  # آیا نقطه بازیابی ایجاد شده است؟
         self.max_urls = max_urls
         self.checkpoint_file = checkpoint_file
 
+        # ساختارهای بخش‌بندی‌شده (هر بخش فقط زیر قفل خودش تغییر می‌کند)
+        self._locks = [threading.Lock() for _ in range(STATE_SHARDS)]
+        # فقط برای بررسی عضویت؛ اطلاعات بازدیدهای اخیر در url_history نگهداری می‌شود
+        self._visited = [_new_visited_set() for _ in range(STATE_SHARDS)]
+        # نگاشت URL به تاپل (زمان بازدید، کد وضعیت، نوع محتوا) به ترتیب بازدید، قدیمی‌ترین در ابتدا
+        self._url_history = [OrderedDict() for _ in range(STATE_SHARDS)]
+        # نگاشت URL به تاپل (تعداد تلاش‌ها، زمان آخرین تلاش، آخرین کد وضعیت، آخرین خطا)
+        self._failed = [{} for _ in range(STATE_SHARDS)]
+        self._in_progress = [set() for _ in range(STATE_SHARDS)]  # URLهای در حال پردازش
+        # شمارنده‌های آمار هر بخش (لیست اعداد به ترتیب _STAT_KEYS؛ زیر قفل همان بخش افزایش می‌یابند)
+        self._counters = [[0] * len(_STAT_KEYS) for _ in range(STATE_SHARDS)]
+
+        # URLهای بازدید شده از آخرین نقطه بازیابی (فقط در نبود فیلتر بلوم، برای فایل جانبی JSONL)
+        self._dirty_visited = [[] for _ in range(STATE_SHARDS)]
+        self._journal_path = None  # مسیر نقطه بازیابی که فایل جانبی آن با این وضعیت هم‌گام است
+
         # آمار و اطلاعات
-        self.stats = {
-            'total_urls': 0,
-            'successful_urls': 0,
-            'failed_urls': 0,
-            'skipped_urls': 0,
-            'start_time': datetime.now(),
-            'last_update_time': datetime.now()
-        }
+        self.start_time = datetime.now()
+        self._last_update = time.time()  # زمان آخرین به‌روزرسانی (اعشاری، در آمار به datetime تبدیل می‌شود)
 
-        # قفل‌ها برای همگام‌سازی چندنخی
+        # قفل عملیات کل وضعیت (ذخیره و بارگذاری نقطه بازیابی)
         self.state_lock = threading.RLock()
 
+    @staticmethod
+    def _shard(normalized_url):
+        """
+        شماره بخش یک URL نرمال‌شده
+
+        از crc32 به جای hash استفاده می‌شود تا شماره بخش بین اجراها ثابت بماند
+        (فیلترهای بلوم هر بخش در نقطه بازیابی ذخیره می‌شوند).
+
+        Args:
+            normalized_url: آدرس نرمال‌شده
+
+        Returns:
+            int: شماره بخش
+        """
+        return zlib.crc32(normalized_url.encode('utf-8')) & (STATE_SHARDS - 1)
+
+    @contextmanager
+    def _all_shards(self):
+        """گرفتن قفل همه بخش‌ها به ترتیب ثابت (برای عملیاتی که کل وضعیت را می‌بینند)"""
+        with self.state_lock, ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            yield
+
+    @property
+    def visited_count(self):
+        """تعداد URLهای بازدید شده"""
+        return sum(len(visited) for visited in self._visited)
+
+    @property
+    def failed_urls(self):
+        """نمای ادغام‌شده URLهای ناموفق همه بخش‌ها"""
+        merged = {}
+        for failed in self._failed:
+            merged.update(failed)
+        return merged
+
+    @property
+    def url_history(self):
+        """نمای ادغام‌شده تاریخچه بازدید همه بخش‌ها"""
+        merged = {}
+        for history in self._url_history:
+            merged.update(history)
+        return merged
+
     def add_visited(self, url, status_code=200, content_type=None):
         """
         افزودن یک URL به لیست بازدید شده
@@ -196,30 +436,35 @@ class CrawlState:
         Returns:
             None
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
-            self.visited_urls.add(normalized_url)
+        normalized_url = normalize_url(url)
+        shard = self._shard(normalized_url)
+        now = time.time()
 
-            self.url_history[normalized_url] = {
-                'visited_at': datetime.now(),
-                'status_code': status_code,
-                'content_type': content_type
-            }
+        with self._locks[shard]:
+            visited = self._visited[shard]
+            if ScalableBloomFilter is None and normalized_url not in visited:
+                self._dirty_visited[shard].append(normalized_url)
+            visited.add(normalized_url)
+
+            history = self._url_history[shard]
+            if normalized_url in history:
+                history.move_to_end(normalized_url)
+            history[normalized_url] = (now, status_code, content_type)
 
-            if normalized_url in self.in_progress:
-                self.in_progress.remove(normalized_url)
+            self._in_progress[shard].discard(normalized_url)
 
             # به‌روزرسانی آمار
-            self.stats['total_urls'] += 1
-            self.stats['successful_urls'] += 1
-            self.stats['last_update_time'] = datetime.now()
+            counters = self._counters[shard]
+            counters[_TOTAL] += 1
+            counters[_SUCCESSFUL] += 1
 
-            # کنترل اندازه تاریخچه
-            if len(self.url_history) > self.max_urls:
+            # کنترل اندازه تاریخچه (سهم هر بخش از max_urls)
+            if len(history) > max(self.max_urls // STATE_SHARDS, 1):
                 # حذف قدیمی‌ترین URL‌ها
-                oldest = sorted(self.url_history.items(), key=lambda x: x[1]['visited_at'])[:100]
-                for old_url, _ in oldest:
-                    del self.url_history[old_url]
+                for _ in range(min(max(100 // STATE_SHARDS, 1), len(history))):
+                    history.popitem(last=False)
+
+        self._last_update = now
 
     def add_failed(self, url, error=None, status_code=None):
         """
@@ -233,30 +478,37 @@ class CrawlState:
         Returns:
             None
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
+        normalized_url = normalize_url(url)
+        shard = self._shard(normalized_url)
+        now = time.time()
 
-            if normalized_url in self.failed_urls:
-                self.failed_urls[normalized_url]['attempts'] += 1
-                self.failed_urls[normalized_url]['last_error'] = error
-                self.failed_urls[normalized_url]['last_status_code'] = status_code
-                self.failed_urls[normalized_url]['last_attempt'] = datetime.now()
-            else:
-                self.failed_urls[normalized_url] = {
-                    'attempts': 1,
-                    'first_attempt': datetime.now(),
-                    'last_attempt': datetime.now(),
-                    'last_error': error,
-                    'last_status_code': status_code
-                }
+        with self._locks[shard]:
+            failed = self._failed[shard]
+            attempts = failed.get(normalized_url, _NO_FAILURE)[_ATTEMPTS] + 1
+            failed[normalized_url] = (attempts, now, status_code or 0, error)
 
-            if normalized_url in self.in_progress:
-                self.in_progress.remove(normalized_url)
+            self._in_progress[shard].discard(normalized_url)
 
             # به‌روزرسانی آمار
-            self.stats['total_urls'] += 1
-            self.stats['failed_urls'] += 1
-            self.stats['last_update_time'] = datetime.now()
+            counters = self._counters[shard]
+            counters[_TOTAL] += 1
+            counters[_FAILED] += 1
+
+        self._last_update = now
+
+    def add_skipped(self, url):
+        """
+        ثبت یک URL ردشده در آمار
+
+        Args:
+            url: آدرس URL ردشده (نرمال‌شده)
+
+        Returns:
+            None
+        """
+        shard = self._shard(url)
+        with self._locks[shard]:
+            self._counters[shard][_SKIPPED] += 1
 
     def add_in_progress(self, url):
         """
@@ -268,9 +520,35 @@ class CrawlState:
         Returns:
             None
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
-            self.in_progress.add(normalized_url)
+        normalized_url = normalize_url(url)
+        shard = self._shard(normalized_url)
+        with self._locks[shard]:
+            self._in_progress[shard].add(normalized_url)
+
+    def filter_unseen(self, normalized_urls):
+        """
+        فیلتر دسته‌ای URLهایی که نه بازدید شده‌اند و نه در حال پردازش هستند
+
+        URLها بر اساس بخش گروه‌بندی می‌شوند تا قفل هر بخش فقط یک بار گرفته شود.
+
+        Args:
+            normalized_urls: لیست URLهای نرمال‌شده
+
+        Returns:
+            list: URLهای دیده‌نشده با همان ترتیب ورودی
+        """
+        by_shard = {}
+        for normalized_url in normalized_urls:
+            by_shard.setdefault(self._shard(normalized_url), []).append(normalized_url)
+
+        seen = set()
+        for shard, shard_urls in by_shard.items():
+            with self._locks[shard]:
+                visited = self._visited[shard]
+                in_progress = self._in_progress[shard]
+                seen.update(url for url in shard_urls if url in visited or url in in_progress)
+
+        return [url for url in normalized_urls if url not in seen]
 
     def was_visited(self, url):
         """
@@ -282,9 +560,10 @@ class CrawlState:
         Returns:
             bool: آیا URL قبلاً بازدید شده است؟
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
-            return normalized_url in self.visited_urls
+        normalized_url = normalize_url(url)
+        shard = self._shard(normalized_url)
+        with self._locks[shard]:
+            return normalized_url in self._visited[shard]
 
     def is_in_progress(self, url):
         """
@@ -296,9 +575,10 @@ class CrawlState:
         Returns:
             bool: آیا URL در حال پردازش است؟
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
-            return normalized_url in self.in_progress
+        normalized_url = normalize_url(url)
+        shard = self._shard(normalized_url)
+        with self._locks[shard]:
+            return normalized_url in self._in_progress[shard]
 
     def was_failed(self, url):
         """
@@ -310,9 +590,10 @@ class CrawlState:
         Returns:
             bool: آیا URL قبلاً ناموفق بوده است؟
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
-            return normalized_url in self.failed_urls
+        normalized_url = normalize_url(url)
+        shard = self._shard(normalized_url)
+        with self._locks[shard]:
+            return normalized_url in self._failed[shard]
 
     def should_retry(self, url, max_retries=3):
         """
@@ -325,12 +606,27 @@ class CrawlState:
         Returns:
             bool: آیا URL باید مجدداً امتحان شود؟
         """
-        with self.state_lock:
-            normalized_url = normalize_url(url)
-            if normalized_url not in self.failed_urls:
-                return True
+        # خواندن یک کلید دیکشنری اتمیک است و نیازی به قفل بخش ندارد
+        normalized_url = normalize_url(url)
+        return self._failed[self._shard(normalized_url)].get(normalized_url, _NO_FAILURE)[_ATTEMPTS] < max_retries
+
+    @property
+    def stats(self):
+        """
+        آمار تجمیعی همه بخش‌ها
+
+        شمارنده‌ها بدون گرفتن قفل خوانده می‌شوند (خواندن عدد صحیح در CPython اتمیک است)؛
+        مجموع ممکن است شامل به‌روزرسانی‌های هم‌زمان بخش‌ها به صورت ناقص باشد.
+
+        Returns:
+            dict: دیکشنری آمار
+        """
+        totals = [sum(column) for column in zip(*self._counters)]
 
-            return self.failed_urls[normalized_url]['attempts'] < max_retries
+        stats = dict(zip(_STAT_KEYS, totals))
+        stats['start_time'] = self.start_time
+        stats['last_update_time'] = datetime.fromtimestamp(self._last_update)
+        return stats
 
     def get_stats(self):
         """
@@ -339,21 +635,26 @@ class CrawlState:
         Returns:
             dict: دیکشنری آمار
         """
-        with self.state_lock:
-            # محاسبه زمان سپری شده
-            elapsed = (datetime.now() - self.stats['start_time']).total_seconds()
-            rate = self.stats['successful_urls'] / max(elapsed, 1) * 60
+        stats = self.stats
 
-            stats = self.stats.copy()
-            stats['elapsed_seconds'] = int(elapsed)
-            stats['urls_per_minute'] = int(rate)
+        # محاسبه زمان سپری شده
+        elapsed = (datetime.now() - stats['start_time']).total_seconds()
+        rate = stats['successful_urls'] / max(elapsed, 1) * 60
 
-            return stats
+        stats['elapsed_seconds'] = int(elapsed)
+        stats['urls_per_minute'] = int(rate)
+
+        return stats
 
     def save_checkpoint(self, checkpoint_file=None):
         """
         ذخیره وضعیت فعلی در یک نقطه بازیابی
 
+        فقط گرفتن نسخه کپی وضعیت زیر قفل انجام می‌شود و سریال‌سازی و نوشتن فایل خارج از قفل است.
+        فایل اصلی ابتدا در یک فایل موقت نوشته و سپس به صورت اتمیک جایگزین می‌شود. در نبود
+        pybloom_live، URLهای بازدید شده در فایل جانبی JSONL نگهداری می‌شوند و در هر ذخیره فقط
+        URLهای جدید از ذخیره قبلی به آن اضافه می‌شوند.
+
         Args:
             checkpoint_file: مسیر فایل برای ذخیره‌سازی (اختیاری)
 
@@ -365,27 +666,72 @@ class CrawlState:
             logger.warning("مسیر فایل نقطه بازیابی مشخص نشده است")
             return False
 
+        dirty_visited = None
         try:
-            with self.state_lock:
-                checkpoint_data = {
-                    'visited_urls': list(self.visited_urls),
-                    'failed_urls': self.failed_urls,
-                    'stats': self.stats,
-                    'checkpoint_time': datetime.now().isoformat()
-                }
+            stats = self.stats
 
-                # ایجاد پوشه در صورت نیاز
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with self._all_shards():
+                failed_urls = {url: info for failed in self._failed for url, info in failed.items()}
+                recent_urls = [url for history in self._url_history for url in history]
 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(checkpoint_data, f, ensure_ascii=False)
+                if ScalableBloomFilter is not None:
+                    # زیر قفل فقط کپی آرایه‌های بیتی؛ ترکیب و نوشتن فایل پس از آزاد شدن قفل‌ها
+                    visited_snapshot = [_dump_visited_set(visited) for visited in self._visited]
+                    new_visited = None
+                else:
+                    visited_snapshot = None
+                    # لیست‌های URLهای جدید برداشته می‌شوند و در صورت شکست نوشتن بازگردانده می‌شوند
+                    dirty_visited = self._dirty_visited
+                    self._dirty_visited = [[] for _ in range(STATE_SHARDS)]
+                    if self._journal_path == file_path:
+                        new_visited = [url for dirty in dirty_visited for url in dirty]
+                    else:
+                        # اولین ذخیره در این مسیر: فایل جانبی از ابتدا با همه URLها ساخته می‌شود
+                        new_visited = [url for visited in self._visited for url in visited]
 
-                self.checkpointed = True
-                logger.info(f"نقطه بازیابی در {file_path} ذخیره شد")
-                return True
+            visited_blob = None
+            if visited_snapshot is not None:
+                visited_blob = b''.join(visited_snapshot)
+
+            # ایجاد پوشه در صورت نیاز
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+            checkpoint_data = {
+                'failed_urls': failed_urls,
+                'stats': stats,
+                'checkpoint_time': datetime.now().isoformat()
+            }
+
+            if visited_blob is not None:
+                # فیلترهای بلوم قابل پیمایش نیستند؛ در فایل جانبی دودویی ذخیره می‌شوند
+                # و فقط URLهای اخیر برای نسخه‌های بدون pybloom_live در JSON می‌مانند
+                bloom_path = f"{file_path}.bloom"
+                _write_atomic(bloom_path, visited_blob)
+                checkpoint_data['visited_bloom'] = os.path.basename(bloom_path)
+                checkpoint_data['visited_urls'] = recent_urls
+            else:
+                journal_path = f"{file_path}.visited.jsonl"
+                mode = 'ab' if self._journal_path == file_path else 'wb'
+                with open(journal_path, mode) as f:
+                    f.write(b''.join(_dumps_json(url) + b'\n' for url in new_visited))
+                self._journal_path = file_path
+                checkpoint_data['visited_journal'] = os.path.basename(journal_path)
+
+            _write_atomic(file_path, _dumps_json(checkpoint_data))
+
+            self.checkpointed = True
+            logger.info(f"نقطه بازیابی در {file_path} ذخیره شد")
+            return True
 
         except Exception as e:
             logger.error(f"خطا در ذخیره نقطه بازیابی: {str(e)}")
+
+            # URLهایی که به فایل جانبی نرسیدند در ذخیره بعدی دوباره نوشته می‌شوند
+            # (تکرار احتمالی خطوط فایل جانبی هنگام بارگذاری بی‌اثر است)
+            if dirty_visited is not None:
+                with self._all_shards():
+                    for shard, dirty in enumerate(dirty_visited):
+                        self._dirty_visited[shard][:0] = dirty
             return False
 
     def load_checkpoint(self, checkpoint_file=None):
@@ -404,31 +750,79 @@ class CrawlState:
             return False
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                checkpoint_data = json.load(f)
-
-            with self.state_lock:
-                self.visited_urls = set(checkpoint_data.get('visited_urls', []))
-                self.failed_urls = checkpoint_data.get('failed_urls', {})
-                loaded_stats = checkpoint_data.get('stats', {})
-
-                # ترکیب آمار قدیمی با جدید
-                self.stats = {
-                    'total_urls': loaded_stats.get('total_urls', 0),
-                    'successful_urls': loaded_stats.get('successful_urls', 0),
-                    'failed_urls': loaded_stats.get('failed_urls', 0),
-                    'skipped_urls': loaded_stats.get('skipped_urls', 0),
-                    'start_time': datetime.fromisoformat(loaded_stats.get('start_time'))
-                    if isinstance(loaded_stats.get('start_time'), str)
-                    else datetime.now(),
-                    'last_update_time': datetime.now()
-                }
+            with open(file_path, 'rb') as f:
+                checkpoint_data = _loads_json(f.read())
+
+            checkpoint_dir = os.path.dirname(file_path)
 
+            visited = None
+            if checkpoint_data.get('visited_bloom') and ScalableBloomFilter is None:
+                logger.warning("نقطه بازیابی URLهای بازدید شده را در فیلتر بلوم نگه می‌دارد اما pybloom_live نصب نیست؛ "
+                               "فقط URLهای اخیر بازیابی می‌شوند و سایر صفحات دوباره خزیده خواهند شد")
+            elif checkpoint_data.get('visited_bloom'):
+                bloom_path = os.path.join(checkpoint_dir, checkpoint_data['visited_bloom'])
+                try:
+                    with open(bloom_path, 'rb') as f:
+                        visited = _load_visited_sets(f.read())
+                except Exception as e:
+                    logger.warning(f"فیلتر بلوم نقطه بازیابی قابل بارگذاری نیست؛ فقط URLهای اخیر بازیابی می‌شوند: {str(e)}")
+
+            if visited is None:
+                visited = [_new_visited_set() for _ in range(STATE_SHARDS)]
+
+            failed = [{} for _ in range(STATE_SHARDS)]
+            for failed_url, info in checkpoint_data.get('failed_urls', {}).items():
+                failed_url = sys.intern(failed_url)
+                failed[self._shard(failed_url)][failed_url] = _failure_record(info)
+
+            for visited_url in checkpoint_data.get('visited_urls', []):
+                visited_url = sys.intern(visited_url)
+                visited[self._shard(visited_url)].add(visited_url)
+
+            journal_path = None
+            if checkpoint_data.get('visited_journal'):
+                journal_path = os.path.join(checkpoint_dir, checkpoint_data['visited_journal'])
+                if os.path.exists(journal_path):
+                    with open(journal_path, 'rb') as f:
+                        for line in f:
+                            try:
+                                visited_url = sys.intern(_loads_json(line))
+                            except ValueError:
+                                # خط ناقص انتهای فایل (ذخیره نیمه‌کاره)
+                                continue
+                            visited[self._shard(visited_url)].add(visited_url)
+
+            url_history = [OrderedDict() for _ in range(STATE_SHARDS)]
+            for history_url, info in checkpoint_data.get('url_history', {}).items():
+                history_url = sys.intern(history_url)
+                if isinstance(info, dict):
+                    # قالب نقاط بازیابی قدیمی
+                    info = (0.0, info.get('status_code'), info.get('content_type'))
+                url_history[self._shard(history_url)][history_url] = tuple(info)
+
+            loaded_stats = checkpoint_data.get('stats', {})
+
+            with self._all_shards():
+                self._visited = visited
+                self._failed = failed
                 if 'url_history' in checkpoint_data:
-                    self.url_history = checkpoint_data['url_history']
+                    self._url_history = url_history
+
+                # URLهای بارگذاری‌شده از فایل جانبی دوباره نوشته نمی‌شوند
+                self._dirty_visited = [[] for _ in range(STATE_SHARDS)]
+                self._journal_path = file_path if journal_path and ScalableBloomFilter is None else None
+
+                # ترکیب آمار قدیمی با جدید (مجموع‌ها در بخش اول نگهداری می‌شوند)
+                self._counters = [[0] * len(_STAT_KEYS) for _ in range(STATE_SHARDS)]
+                self._counters[0] = [loaded_stats.get(key, 0) for key in _STAT_KEYS]
+
+                self.start_time = (datetime.fromisoformat(loaded_stats.get('start_time'))
+                                   if isinstance(loaded_stats.get('start_time'), str)
+                                   else datetime.now())
+                self._last_update = time.time()
 
                 logger.info(f"نقطه بازیابی از {file_path} بارگذاری شد")
-                logger.info(f"{len(self.visited_urls)} URL بازدید شده و {len(self.failed_urls)} URL ناموفق بازیابی شد")
+                logger.info(f"{self.visited_count} URL بازدید شده و {len(checkpoint_data.get('failed_urls', {}))} URL ناموفق بازیابی شد")
 
                 self.checkpointed = True
                 return True
@@ -444,6 +838,7 @@ class URLPriorityPolicyManager:
     def __init__(self):
         """مقداردهی اولیه مدیریت سیاست‌ها"""
         self.policies = []
+        self.compile()
 
     def add_policy(self, name, condition_func, priority_func, weight=1.0, enabled=True):
         """
@@ -466,6 +861,38 @@ class URLPriorityPolicyManager:
             'weight': weight,
             'enabled': enabled
         })
+        self.compile()
+
+    def compile(self):
+        """
+        ساخت تابع محاسبه اولویت از روی سیاست‌های فعال
+
+        سیاست‌های فعال یک بار به چندتایی (شرط، تابع اولویت، وزن) تبدیل می‌شوند تا در هر
+        فراخوانی نیازی به جستجوی کلیدهای دیکشنری و بررسی فعال بودن نباشد. پس از تغییر
+        مستقیم policies (مثلاً غیرفعال کردن یک سیاست) باید دوباره فراخوانی شود.
+
+        Returns:
+            تابع (url, job) -> int
+        """
+        compiled = tuple((policy['condition'], policy['priority'], policy['weight'])
+                         for policy in self.policies if policy['enabled'])
+
+        def calculate(url, job):
+            priority = 0
+            total_weight = 0
+
+            for condition, priority_func, weight in compiled:
+                if condition(url, job):
+                    priority += priority_func(url, job) * weight
+                    total_weight += weight
+
+            if total_weight > 0:
+                priority = priority / total_weight
+
+            return int(priority)
+
+        self._fast = calculate
+        return calculate
 
     def calculate_priority(self, url, job=None):
         """
@@ -478,22 +905,7 @@ class URLPriorityPolicyManager:
         Returns:
             int: اولویت محاسبه شده
         """
-        priority = 0
-        total_weight = 0
-
-        for policy in self.policies:
-            if not policy['enabled']:
-                continue
-
-            if policy['condition'](url, job):
-                priority_value = policy['priority'](url, job)
-                priority += priority_value * policy['weight']
-                total_weight += policy['weight']
-
-        if total_weight > 0:
-            priority = priority / total_weight
-
-        return int(priority)
+        return self._fast(url, job)
 
     def get_default_policies(self):
         """
@@ -538,18 +950,335 @@ class URLPriorityPolicyManager:
         self.add_policy(
             name="path_length_policy",
             condition_func=lambda url, job: True,
-            priority_func=lambda url, job: urlparse(url).path.count('/') * 5,
+            priority_func=lambda url, job: cached_urlparse(url).path.count('/') * 5,
             weight=0.8
         )
 
+        # اگر فقط سیاست‌های پیش‌فرض ثبت شده‌اند، نسخه درون‌خطی آن‌ها جایگزین حلقه عمومی می‌شود
+        if len(self.policies) == 5:
+            self._fast = _default_priority
+
         return self
 
 
+def _default_priority(url, job):
+    """
+    محاسبه اولویت با سیاست‌های پیش‌فرض به صورت درون‌خطی
+    (معادل calculate_priority با سیاست‌های get_default_policies، بدون فراخوانی lambda)
+
+    Args:
+        url: آدرس URL
+        job: شیء کار خزش (اختیاری)
+
+    Returns:
+        int: اولویت محاسبه شده
+    """
+    priority = 0
+    total_weight = 0
+
+    if job is not None:
+        # سیاست عمق
+        priority += job.depth * 10 * 1.0
+        total_weight += 1.0
+
+        # سیاست‌های نوع کار (لیست، جزئیات، sitemap)
+        job_type = job.job_type
+        if job_type == 'list':
+            priority += -20 * 1.5
+            total_weight += 1.5
+        elif job_type == 'detail':
+            priority += -10 * 1.0
+            total_weight += 1.0
+        elif job_type == 'sitemap':
+            priority += -30 * 2.0
+            total_weight += 2.0
+
+    # سیاست مسیر کوتاه
+    priority += cached_urlparse(url).path.count('/') * 5 * 0.8
+    total_weight += 0.8
+
+    return int(priority / total_weight)
+
+
+class _PrioritySubQueue:
+    """
+    صف اولویت سبک برای صف‌های داخلی JobMultiQueue
+
+    انتظار مسدودکننده در خود JobMultiQueue (با سمافور) انجام می‌شود، بنابراین صف‌های داخلی
+    هرگز منتظر نمی‌مانند و به جای queue.PriorityQueue (قفل به همراه دو متغیر شرطی و اعلان
+    در هر عملیات) فقط یک هیپ با یک قفل ساده هستند.
+    """
+
+    __slots__ = ('queue', 'mutex')
+
+    def __init__(self):
+        """مقداردهی اولیه صف"""
+        self.queue = []
+        self.mutex = threading.Lock()
+
+    def put(self, item):
+        """
+        افزودن یک عنصر به صف
+
+        Args:
+            item: عنصر برای افزودن
+        """
+        with self.mutex:
+            heapq.heappush(self.queue, item)
+
+    def put_many(self, items):
+        """
+        افزودن چند عنصر به صف با یک بار گرفتن قفل
+
+        Args:
+            items: عناصر برای افزودن
+        """
+        if not items:
+            return
+
+        with self.mutex:
+            for item in items:
+                heapq.heappush(self.queue, item)
+
+    def get_nowait(self):
+        """
+        برداشتن عنصر با بالاترین اولویت
+
+        Returns:
+            عنصر سر صف
+
+        Raises:
+            queue.Empty: در صورت خالی بودن صف
+        """
+        with self.mutex:
+            if not self.queue:
+                raise queue.Empty
+            return heapq.heappop(self.queue)
+
+    def peek(self):
+        """
+        مشاهده عنصر با بالاترین اولویت (بدون قفل؛ فقط برای انتخاب تقریبی صف)
+
+        Returns:
+            عنصر سر صف یا None در صورت خالی بودن
+        """
+        try:
+            return self.queue[0]
+        except IndexError:
+            return None
+
+    def take_half(self, limit):
+        """
+        برداشتن نیمی از عناصر صف (به ترتیب اولویت) با یک بار گرفتن قفل
+
+        Args:
+            limit: حداکثر تعداد عناصر برداشته‌شده
+
+        Returns:
+            list: عناصر برداشته‌شده (ممکن است خالی باشد)
+        """
+        with self.mutex:
+            count = min(limit, (len(self.queue) + 1) // 2)
+            return [heapq.heappop(self.queue) for _ in range(count)]
+
+    def qsize(self):
+        """
+        تعداد عناصر صف (بدون قفل)
+
+        Returns:
+            int: تعداد عناصر
+        """
+        return len(self.queue)
+
+    def empty(self):
+        """
+        بررسی خالی بودن صف (بدون قفل)
+
+        Returns:
+            bool: آیا صف خالی است؟
+        """
+        return not self.queue
+
+
+class JobMultiQueue:
+    """
+    صف اولویت چندگانه (Multiqueue) برای کارهای خزش
+
+    کارها به نوبت (round-robin) در چند صف اولویت مستقل قرار می‌گیرند. هر نخ کارگر می‌تواند
+    مالک یکی از صف‌ها باشد و ابتدا از صف خود برمی‌دارد و فقط در صورت خالی بودن آن از صف
+    نخ‌های دیگر (با شروع از یک صف تصادفی) کار می‌دزدد؛ برداشتن بدون مالک، سر دو صف تصادفی را
+    مقایسه می‌کند. به این ترتیب نخ‌ها به جای یک قفل مشترک روی صف‌های جداگانه کار می‌کنند و
+    چون کارها به طور یکنواخت پخش می‌شوند، ترتیب اولویت به صورت تقریبی حفظ می‌شود.
+    رابط آن با queue.PriorityQueue سازگار است (put، get، task_done، join، qsize، empty).
+    """
+
+    def __init__(self, num_queues=3):
+        """
+        مقداردهی اولیه صف چندگانه
+
+        Args:
+            num_queues: تعداد صف‌های داخلی (حداقل 3 برای حفظ ترتیب تقریبی)
+        """
+        self._queues = [_PrioritySubQueue() for _ in range(max(num_queues, 3))]
+        self._next_queue = itertools.count()  # شمارنده نوبت صف‌ها برای put
+
+        # شمارش عناصر موجود برای انتظار مسدودکننده در get
+        self._available = threading.Semaphore(0)
+
+        # شمارش کارهای ناتمام برای join و task_done
+        self._tasks_lock = threading.Lock()
+        self._all_tasks_done = threading.Condition(self._tasks_lock)
+        self._unfinished_tasks = 0
+
+    def put(self, item):
+        """
+        افزودن یک کار به صف بعدی (به نوبت)
+
+        Args:
+            item: کار خزش
+
+        Returns:
+            None
+        """
+        with self._tasks_lock:
+            self._unfinished_tasks += 1
+
+        self._queues[next(self._next_queue) % len(self._queues)].put(item)
+        self._available.release()
+
+    def put_many(self, items):
+        """
+        افزودن چند کار به صورت دسته‌ای
+
+        کارها به نوبت بین صف‌ها پخش می‌شوند و هر صف فقط یک بار قفل می‌شود.
+
+        Args:
+            items: لیست کارهای خزش
+
+        Returns:
+            None
+        """
+        if not items:
+            return
+
+        with self._tasks_lock:
+            self._unfinished_tasks += len(items)
+
+        num_queues = len(self._queues)
+        start = next(self._next_queue)
+        for offset in range(min(num_queues, len(items))):
+            self._queues[(start + offset) % num_queues].put_many(items[offset::num_queues])
+
+        self._available.release(len(items))
+
+    def get(self, block=True, timeout=None, owner=None):
+        """
+        برداشتن کار از صف مالک یا با اولویت بالاتر از میان سر دو صف تصادفی
+
+        Args:
+            block: آیا تا موجود شدن کار منتظر بماند؟
+            timeout: حداکثر زمان انتظار (ثانیه)
+            owner: شماره نخ مالک صف (اختیاری)؛ در صورت خالی بودن صف مالک از صف‌های دیگر دزدیده می‌شود
+
+        Returns:
+            کار خزش
+
+        Raises:
+            queue.Empty: در صورت خالی بودن صف‌ها پس از زمان انتظار
+        """
+        if not self._available.acquire(block, timeout):
+            raise queue.Empty
+
+        if owner is not None:
+            candidates = (self._queues[owner % len(self._queues)],)
+        else:
+            first, second = random.sample(self._queues, 2)
+            first_head, second_head = first.peek(), second.peek()
+            if first_head is None or (second_head is not None and second_head < first_head):
+                first, second = second, first
+            candidates = (first, second)
+
+        for candidate in candidates:
+            try:
+                return candidate.get_nowait()
+            except queue.Empty:
+                continue
+
+        # وجود حداقل یک کار تضمین شده است؛ دزدیدن از صف‌های دیگر با شروع از یک صف تصادفی
+        # (اگر کار هنوز در حال قرار گرفتن در صف توسط نخ دیگری باشد، تا پیدا شدن آن تکرار می‌شود)
+        start = random.randrange(len(self._queues))
+        backoff = 0
+        while True:
+            for index in range(len(self._queues)):
+                victim = self._queues[(start + index) % len(self._queues)]
+                if owner is None:
+                    try:
+                        return victim.get_nowait()
+                    except queue.Empty:
+                        continue
+
+                # دزدیدن دسته‌ای: نیمی از کارهای صف قربانی یک‌جا به صف مالک منتقل می‌شود
+                # تا دفعات دزدیدن (و رقابت روی قفل قربانی) کاهش یابد
+                stolen = victim.take_half(STEAL_BATCH_SIZE)
+                if stolen:
+                    candidates[0].put_many(stolen[1:])
+                    return stolen[0]
+
+            # کار موجود برای لحظه‌ای دیده نمی‌شود (در حال انتقال بین صف‌ها)؛ انتظار با افزایش نمایی
+            # به جای چرخش مداوم روی صف‌ها
+            time.sleep(backoff)
+            backoff = min(backoff * 2 or STEAL_BACKOFF_MIN, STEAL_BACKOFF_MAX)
+
+    def get_nowait(self):
+        """برداشتن کار بدون انتظار"""
+        return self.get(block=False)
+
+    def task_done(self):
+        """
+        اعلام تکمیل یک کار برداشته‌شده
+
+        Raises:
+            ValueError: در صورت فراخوانی بیش از تعداد کارهای قرارداده‌شده
+        """
+        with self._all_tasks_done:
+            unfinished = self._unfinished_tasks - 1
+            if unfinished < 0:
+                raise ValueError('task_done() called too many times')
+            if unfinished == 0:
+                self._all_tasks_done.notify_all()
+            self._unfinished_tasks = unfinished
+
+    def join(self):
+        """انتظار تا تکمیل همه کارهای قرارداده‌شده"""
+        with self._all_tasks_done:
+            while self._unfinished_tasks:
+                self._all_tasks_done.wait()
+
+    def qsize(self):
+        """
+        تعداد تقریبی کارهای موجود در صف‌ها (بدون گرفتن قفل صف‌ها)
+
+        Returns:
+            int: تعداد کارها
+        """
+        return sum(len(q.queue) for q in self._queues)
+
+    def empty(self):
+        """
+        بررسی خالی بودن همه صف‌ها
+
+        Returns:
+            bool: آیا صفی کار ندارد؟
+        """
+        return all(q.empty() for q in self._queues)
+
+
 class Crawler:
     """کلاس اصلی خزشگر هوشمند"""
 
     def __init__(self, base_url, config_dir=None, max_threads=4, max_depth=5, politeness_delay=1.0,
-                 respect_robots=False, use_db_storage=True):
+                 respect_robots=False, use_db_storage=True, extract_generic_pages=False, fetch_threads=None,
+                 max_per_host=None):
         """
         مقداردهی اولیه خزشگر
 
@@ -561,6 +1290,9 @@ class Crawler:
             politeness_delay: تأخیر بین درخواست‌ها برای رعایت ادب (ثانیه)
             respect_robots: آیا محدودیت‌های robots.txt رعایت شود؟
             use_db_storage: آیا داده‌ها در دیتابیس ذخیره شوند؟
+            extract_generic_pages: آیا محتوای صفحات عمومی (غیر از لیست و جزئیات) هم استخراج شود؟
+            fetch_threads: تعداد نخ‌های دریافت صفحات (اختیاری، پیش‌فرض چهار برابر max_threads)
+            max_per_host: حداکثر درخواست هم‌زمان به هر میزبان (اختیاری، پیش‌فرض max_threads؛ صفر برای بدون محدودیت)
         """
         self.base_url = base_url
         self.config_dir = config_dir or os.path.join(
@@ -573,14 +1305,23 @@ class Crawler:
 
         # پارامترهای خزش
         self.max_threads = int(os.getenv('MAX_THREADS', max_threads))
+        self.fetch_threads = int(os.getenv('FETCH_THREADS', fetch_threads or self.max_threads * 4))
+        # نخ‌های دریافت بیشتر نباید فشار هم‌زمان روی میزبان را بیش از max_threads افزایش دهند (رعایت ادب)
+        self.max_per_host = int(os.getenv('MAX_PER_HOST',
+                                          self.max_threads if max_per_host is None else max_per_host)) or None
         self.max_depth = int(os.getenv('MAX_DEPTH', max_depth))
         self.politeness_delay = float(os.getenv('CRAWL_DELAY', politeness_delay))
         self.respect_robots = respect_robots
         self.use_db_storage = use_db_storage
+        self.extract_generic_pages = extract_generic_pages
 
         # تنظیم دامنه اصلی
         self.domain = urlparse(base_url).netloc
 
+        # پیشوندهای URLهای داخلی برای بررسی دامنه بدون تجزیه URL
+        self._domain_prefixes = (f"https://{self.domain}/", f"http://{self.domain}/")
+        self._domain_roots = (f"https://{self.domain}", f"http://{self.domain}")
+
         # مسیر فایل‌های پیکربندی و نقاط بازیابی
         self.checkpoint_file = os.path.join(self.config_dir, f"{self.domain}_crawl_state.json")
 
@@ -591,35 +1332,60 @@ class Crawler:
         self.priority_manager = URLPriorityPolicyManager()
         self.priority_manager.get_default_policies()
 
-        # صف کار و وضعیت خزش
-        self.job_queue = queue.PriorityQueue()
+        # صف کار (چند صف اولویت مستقل برای کاهش رقابت نخ‌ها) و وضعیت خزش
+        self.job_queue = JobMultiQueue(self.fetch_threads)  # یک صف برای هر نخ دریافت
+
+        # استخر نخ‌های پردازش پاسخ‌ها (در start ساخته می‌شود) و سمافور محدودکننده پاسخ‌های در انتظار پردازش
+        self._executor = None
+        self._parse_slots = threading.BoundedSemaphore(2 * self.max_threads)
+        self._fetchers_started = threading.Event()
+
+        # شنونده‌های نوشتن پس‌زمینه لاگ‌ها (در start راه‌اندازی می‌شوند)
+        self._log_listeners = []
+
+        # سمافور درخواست‌های هم‌زمان هر میزبان (در صورت تعیین max_per_host)
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
         self.crawl_state = CrawlState(checkpoint_file=self.checkpoint_file)
 
         # مدیریت درخواست‌ها
+        # خزش فقط لینک‌های داخلی یک دامنه را دنبال می‌کند؛ استخر اتصال مشترک نشست، اتصالات keep-alive
+        # این میزبان را بین همه نخ‌های دریافت به اشتراک می‌گذارد، بنابراین تقسیم صف‌ها بر اساس میزبان
+        # (که همه کارها را به یک نخ می‌سپرد) لازم نیست و صف‌ها به نوبت بین نخ‌ها پخش می‌شوند
         self.request_manager = RequestManager(
             base_url=base_url,
             default_delay=self.politeness_delay,
-            respect_robots=False  # همیشه محدودیت‌های robots.txt را نادیده می‌گیریم
+            respect_robots=False,  # همیشه محدودیت‌های robots.txt را نادیده می‌گیریم
+            pool_maxsize=self.fetch_threads  # یک نشست مشترک با اتصالات keep-alive برای همه نخ‌های دریافت
         )
 
+        # استخر فرایندهای تجزیه صفحات (ساخت تنبل در اولین استفاده)
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
+        self._parse_pool_disabled = False
+
         # متغیرهای کنترل خزش
         self.running = False
         self.threads = []
         self.stop_event = threading.Event()
 
-        # آمار و اطلاعات اضافی
-        self.stats_lock = threading.Lock()
+        # تعداد نخ‌های زنده خزشگر؛ فقط هنگام شروع و پایان نخ‌ها با قفل تغییر می‌کند و بدون قفل خوانده می‌شود
+        self._alive_threads = 0
+        self._alive_lock = threading.Lock()
+
+        # آمار و اطلاعات اضافی (بدون قفل؛ بیشینه اندازه صف یک مقدار تقریبی برای گزارش است)
         self.max_queue_size = 0
-        self.last_job_time = datetime.now()
+        self.last_job_time = time.monotonic()  # زمان‌های یکنواخت (ثانیه اعشاری)
         self.checkpoint_interval = 300  # ۵ دقیقه
-        self.last_checkpoint_time = datetime.now()
+        self.last_checkpoint_time = time.monotonic()
 
-        # آمار ذخیره‌سازی
-        self.storage_stats = {
-            'stored_content_count': 0,
-            'failed_storage_count': 0,
-            'stored_by_type': {}
-        }
+        # نشانه تغییر وضعیت از آخرین نقطه بازیابی (نخ نقطه بازیابی فقط در صورت تغییر ذخیره می‌کند)
+        self._checkpoint_dirty = threading.Event()
+
+        # آمار ذخیره‌سازی (شمارنده‌های جداگانه هر نخ بدون قفل؛ در storage_stats تجمیع می‌شوند)
+        self._storage_stats_local = threading.local()
+        self._storage_stats_shards = []
+        self._storage_stats_shards_lock = threading.Lock()
 
         # اضافه کردن ماژول‌های استخراج، طبقه‌بندی و ذخیره‌سازی
         if self.use_db_storage:
@@ -703,17 +1469,17 @@ class Crawler:
         if job_type != 'sitemap':
             # بررسی آیا این URL قبلاً بازدید شده یا در صف است
             if self.crawl_state.was_visited(normalized_url) or self.crawl_state.is_in_progress(normalized_url):
-                self.crawl_state.stats['skipped_urls'] += 1
+                self.crawl_state.add_skipped(normalized_url)
                 return False
 
             # بررسی محدودیت عمق
             if depth > self.max_depth:
-                self.crawl_state.stats['skipped_urls'] += 1
+                self.crawl_state.add_skipped(normalized_url)
                 return False
 
             # بررسی محدودیت دامنه (فقط URL‌های داخلی)
-            if self.domain != urlparse(normalized_url).netloc:
-                self.crawl_state.stats['skipped_urls'] += 1
+            if not self._is_internal(normalized_url):
+                self.crawl_state.add_skipped(normalized_url)
                 return False
 
         # تشخیص نوع کار اگر ارائه نشده
@@ -729,28 +1495,94 @@ class Crawler:
             else:
                 job_type = 'page'
 
+        # ایجاد کار جدید
+        job = CrawlJob(normalized_url, depth, priority or 0, parent_url, parent_url, job_type)
+
         # محاسبه اولویت اگر ارائه نشده
         if priority is None:
-            temp_job = CrawlJob(normalized_url, depth, 0, parent_url, parent_url, job_type)
-            priority = self.priority_manager.calculate_priority(normalized_url, temp_job)
-
-        # ایجاد کار جدید
-        job = CrawlJob(normalized_url, depth, priority, parent_url, parent_url, job_type)
+            job.priority = self.priority_manager.calculate_priority(normalized_url, job)
 
         # افزودن به صف
         self.job_queue.put(job)
 
         # به‌روزرسانی آمارها
-        with self.stats_lock:
-            queue_size = self.job_queue.qsize()
-            if queue_size > self.max_queue_size:
-                self.max_queue_size = queue_size
+        self._update_max_queue_size()
 
         return True
 
+    def _thread_storage_stats(self):
+        """
+        دریافت شمارنده‌های آمار ذخیره‌سازی نخ جاری (فقط همین نخ آن‌ها را تغییر می‌دهد)
+
+        Returns:
+            dict: شمارنده‌های نخ جاری
+        """
+        stats = getattr(self._storage_stats_local, 'stats', None)
+        if stats is None:
+            stats = {
+                'stored_content_count': 0,
+                'failed_storage_count': 0,
+                'stored_by_type': {}
+            }
+            self._storage_stats_local.stats = stats
+            with self._storage_stats_shards_lock:
+                self._storage_stats_shards.append(stats)
+        return stats
+
+    @property
+    def storage_stats(self):
+        """
+        آمار ذخیره‌سازی تجمیع‌شده همه نخ‌ها
+
+        شمارنده‌ها بدون قفل خوانده می‌شوند؛ مجموع ممکن است به‌روزرسانی‌های هم‌زمان را کمی دیرتر نشان دهد.
+
+        Returns:
+            dict: آمار ذخیره‌سازی
+        """
+        merged = {
+            'stored_content_count': 0,
+            'failed_storage_count': 0,
+            'stored_by_type': {}
+        }
+        for stats in list(self._storage_stats_shards):
+            merged['stored_content_count'] += stats['stored_content_count']
+            merged['failed_storage_count'] += stats['failed_storage_count']
+            for content_type, count in list(stats['stored_by_type'].items()):
+                merged['stored_by_type'][content_type] = merged['stored_by_type'].get(content_type, 0) + count
+        return merged
+
+    def _update_max_queue_size(self):
+        """
+        به‌روزرسانی بیشینه اندازه صف بدون قفل
+
+        در صورت نوشتن هم‌زمان دو نخ ممکن است بیشینه کمی کمتر از مقدار واقعی ثبت شود
+        که برای یک آمار گزارشی قابل قبول است.
+        """
+        queue_size = self.job_queue.qsize()
+        if queue_size > self.max_queue_size:
+            self.max_queue_size = queue_size
+
+    def _is_internal(self, normalized_url):
+        """
+        بررسی تعلق یک URL نرمال‌شده به دامنه خزش
+
+        URLهای نرمال‌شده کوئری و فرگمنت ندارند، بنابراین برای آدرس‌های http(s) مقایسه پیشوند
+        با «scheme://domain/» معادل مقایسه netloc است و نیازی به urlparse نیست.
+
+        Args:
+            normalized_url: آدرس نرمال‌شده
+
+        Returns:
+            bool: آیا URL داخلی است؟
+        """
+        if normalized_url.startswith(('http://', 'https://')):
+            return normalized_url.startswith(self._domain_prefixes) or normalized_url in self._domain_roots
+
+        return self.domain == cached_urlparse(normalized_url).netloc
+
     def process_job(self, job):
         """
-        پردازش یک کار خزش
+        پردازش یک کار خزش (دریافت صفحه و پردازش پاسخ در همان نخ)
 
         Args:
             job: کار خزش برای پردازش
@@ -758,23 +1590,93 @@ class Crawler:
         Returns:
             dict: نتیجه پردازش
         """
+        if job.job_type == 'sitemap':
+            return self._process_sitemap(job)
+
+        return self._process_response(job, self._fetch_job(job))
+
+    def _process_sitemap(self, job):
+        """
+        پردازش کامل یک کار sitemap
+
+        Args:
+            job: کار خزش از نوع sitemap
+
+        Returns:
+            dict: نتیجه پردازش
+        """
+        # ثبت URL به عنوان در حال پردازش
+        self.crawl_state.add_in_progress(job.url)
+
+        crawler_logger.info("خزش %s (عمق %s, اولویت %s, نوع %s)", job.url, job.depth, job.priority, job.job_type)
+        return self._process_sitemap_job(job)
+
+    def _fetch_job(self, job):
+        """
+        مرحله دریافت یک کار خزش (ورودی/خروجی، بدون تجزیه صفحه)
+
+        Args:
+            job: کار خزش
+
+        Returns:
+            dict: پاسخ RequestManager
+        """
         url = job.url
 
         # ثبت URL به عنوان در حال پردازش
         self.crawl_state.add_in_progress(url)
 
-        try:
-            # لاگ اطلاعات کار
-            crawler_logger.info(f"خزش {url} (عمق {job.depth}, اولویت {job.priority}, نوع {job.job_type})")
-
-            # اگر کار از نوع sitemap است، به طور ویژه پردازش می‌کنیم
-            if job.job_type == 'sitemap':
-                return self._process_sitemap_job(job)
+        # لاگ اطلاعات کار
+        crawler_logger.info("خزش %s (عمق %s, اولویت %s, نوع %s)", url, job.depth, job.priority, job.job_type)
 
+        try:
             # درخواست صفحه
             use_selenium = job.job_type in ['list', 'detail']  # استفاده از سلنیوم برای صفحات پیچیده‌تر
-            response = self.request_manager.get(url, use_selenium=use_selenium)
+            if self.max_per_host is None:
+                return self.request_manager.get(url, use_selenium=use_selenium)
+
+            with self._host_slot(cached_urlparse(url).netloc):
+                return self.request_manager.get(url, use_selenium=use_selenium)
+        except Exception as e:
+            return {
+                'html': None,
+                'url': url,
+                'status_code': None,
+                'error': str(e),
+                'headers': None,
+                'soup': None
+            }
+
+    def _host_slot(self, host):
+        """
+        دریافت سمافور محدودیت درخواست‌های هم‌زمان یک میزبان
+
+        Args:
+            host: نام میزبان
+
+        Returns:
+            threading.BoundedSemaphore: سمافور میزبان
+        """
+        slot = self._host_slots.get(host)
+        if slot is None:
+            with self._host_slots_lock:
+                slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        return slot
 
+    def _process_response(self, job, response):
+        """
+        مرحله پردازش پاسخ یک کار خزش (استخراج داده، ذخیره و کشف لینک‌ها)
+
+        Args:
+            job: کار خزش
+            response: پاسخ دریافت‌شده در مرحله دریافت
+
+        Returns:
+            dict: نتیجه پردازش
+        """
+        url = job.url
+
+        try:
             # بررسی موفقیت
             if not response.get('html') or (response.get('status_code') and response.get('status_code') >= 400):
                 error_message = f"خطا در دریافت {url}: {response.get('error') or response.get('status_code')}"
@@ -807,7 +1709,9 @@ class Crawler:
             if self.use_db_storage and hasattr(self, 'content_extractor') and hasattr(self, 'classifier'):
                 try:
                     # استخراج محتوا
-                    extracted_data = self.content_extractor.extract(html_content, final_url, job_type=job.job_type)
+                    # ارسال بایت‌های خام پاسخ (در صورت وجود) برای جلوگیری از رمزگشایی مجدد
+                    extracted_data = self.content_extractor.extract(response.get('content') or html_content,
+                                                                    final_url, job_type=job.job_type)
 
                     # طبقه‌بندی محتوا
                     if 'content' in extracted_data and extracted_data['content']:
@@ -826,47 +1730,43 @@ class Crawler:
                         storage_result = self.storage_manager.store_content(extracted_data)
 
                         if storage_result:
-                            logger.info(f"محتوای {url} با موفقیت در دیتابیس ذخیره شد (ID: {storage_result.id})")
+                            logger.info("محتوای %s با موفقیت در دیتابیس ذخیره شد (ID: %s)", url, storage_result.id)
 
                             # به‌روزرسانی آمار ذخیره‌سازی
-                            with self.stats_lock:
-                                self.storage_stats['stored_content_count'] += 1
-                                content_type = extracted_data.get('content_type', 'other')
-                                self.storage_stats['stored_by_type'][content_type] = self.storage_stats[
-                                                                                         'stored_by_type'].get(
-                                    content_type, 0) + 1
+                            storage_stats = self._thread_storage_stats()
+                            storage_stats['stored_content_count'] += 1
+                            content_type = extracted_data.get('content_type', 'other')
+                            stored_by_type = storage_stats['stored_by_type']
+                            stored_by_type[content_type] = stored_by_type.get(content_type, 0) + 1
                         else:
-                            logger.warning(f"محتوای {url} در دیتابیس ذخیره نشد")
-                            with self.stats_lock:
-                                self.storage_stats['failed_storage_count'] += 1
+                            logger.warning("محتوای %s در دیتابیس ذخیره نشد", url)
+                            self._thread_storage_stats()['failed_storage_count'] += 1
 
                 except Exception as e:
-                    logger.error(f"خطا در استخراج، طبقه‌بندی یا ذخیره‌سازی محتوای {url}: {str(e)}")
-                    with self.stats_lock:
-                        self.storage_stats['failed_storage_count'] += 1
+                    logger.error("خطا در استخراج، طبقه‌بندی یا ذخیره‌سازی محتوای %s: %s", url, e)
+                    self._thread_storage_stats()['failed_storage_count'] += 1
 
             # اگر استخراج با ماژول‌های جدید انجام نشد، از روش قدیمی استفاده می‌کنیم
+            # (به همراه استخراج لینک‌های جدید، در استخر فرایندهای تجزیه)
+            extract_page_links = job.depth < self.max_depth
+            page_data, links = None, []
+            if extracted_data is None or extract_page_links:
+                page_data, links = self._parse_page(final_url, html_content, soup, job.job_type,
+                                                    extracted_data is None, extract_page_links)
             if extracted_data is None:
-                extracted_data = self._extract_page_data(final_url, html_content, soup, job.job_type)
+                extracted_data = page_data
 
             # استخراج لینک‌های جدید
             new_links = []
 
-            if job.depth < self.max_depth:
-                links = extract_links(html_content, final_url, internal_only=True)
-
-                # افزودن لینک‌های جدید به صف
-                for link in links:
-                    normalized_link = normalize_url(link)
-
-                    # بررسی محدودیت‌ها
-                    if self.domain != urlparse(normalized_link).netloc:
-                        continue
-
-                    if (self.crawl_state.was_visited(normalized_link) or
-                            self.crawl_state.is_in_progress(normalized_link)):
-                        continue
+            if extract_page_links:
+                # لینک‌ها در فرایند تجزیه نرمال‌سازی و بدون تکرار شده‌اند؛ فقط بررسی محدودیت دامنه
+                # (و intern کردن رشته‌هایی که از فرایند دیگر رسیده‌اند) باقی می‌ماند
+                normalized_links = [sys.intern(link) for link in links if self._is_internal(link)]
 
+                # ساخت کار لینک‌های جدید (بررسی بازدید با یک بار گرفتن قفل هر بخش)
+                new_jobs = []
+                for normalized_link in self.crawl_state.filter_unseen(normalized_links):
                     # تشخیص نوع لینک
                     pattern = self.structure_discovery.get_url_pattern(normalized_link)
                     link_job_type = 'page'
@@ -877,28 +1777,24 @@ class Crawler:
                         elif pattern.is_detail:
                             link_job_type = 'detail'
 
-                    # محاسبه اولویت
-                    temp_job = CrawlJob(normalized_link, job.depth + 1, 0, final_url, final_url, link_job_type)
-                    priority = self.priority_manager.calculate_priority(normalized_link, temp_job)
-
-                    # ایجاد و افزودن کار جدید
+                    # ایجاد کار جدید و محاسبه اولویت آن
                     new_job = CrawlJob(
                         normalized_link,
                         job.depth + 1,
-                        priority,
+                        0,
                         final_url,
                         final_url,
                         link_job_type
                     )
+                    new_job.priority = self.priority_manager.calculate_priority(normalized_link, new_job)
 
-                    self.job_queue.put(new_job)
+                    new_jobs.append(new_job)
                     new_links.append(normalized_link)
 
-                    # به‌روزرسانی آمار صف
-                    with self.stats_lock:
-                        queue_size = self.job_queue.qsize()
-                        if queue_size > self.max_queue_size:
-                            self.max_queue_size = queue_size
+                # افزودن همه کارهای صفحه به صف به صورت دسته‌ای و به‌روزرسانی آمار صف
+                if new_jobs:
+                    self.job_queue.put_many(new_jobs)
+                    self._update_max_queue_size()
 
             # ثبت URL به عنوان بازدید شده
             self.crawl_state.add_visited(
@@ -908,7 +1804,7 @@ class Crawler:
             )
 
             # به‌روزرسانی زمان آخرین کار
-            self.last_job_time = datetime.now()
+            self.last_job_time = time.monotonic()
 
             result = {
                 'success': True,
@@ -945,41 +1841,166 @@ class Crawler:
                 'error': error_message
             }
 
-    def worker(self):
-        """تابع اجرایی نخ‌های کارگر"""
+    def fetch_worker(self, index=None):
+        """
+        تابع اجرایی نخ‌های دریافت
+
+        این نخ‌ها فقط درخواست‌های HTTP را ارسال می‌کنند و پاسخ‌ها را در صف محدود پاسخ‌ها
+        قرار می‌دهند تا نخ‌های کارگر آن‌ها را پردازش کنند؛ به این ترتیب تعداد درخواست‌های
+        هم‌زمان به تعداد نخ‌های پردازش وابسته نیست. کارهای sitemap همین‌جا کامل پردازش می‌شوند.
+
+        Args:
+            index: شماره نخ (صف مالک آن در صف کارها)
+        """
+        # نخ‌های استخر پردازش توسط همین نخ‌ها ساخته می‌شوند؛ تا بازگرداندن اندازه پشته پیش‌فرض منتظر می‌مانیم
+        self._fetchers_started.wait()
+
         while not self.stop_event.is_set():
             try:
-                # گرفتن یک کار از صف با زمان انتظار
-                try:
-                    job = self.job_queue.get(timeout=5)
-                except queue.Empty:
-                    # اگر صف خالی است، ادامه می‌دهیم بدون فراخوانی task_done
+                job = self.job_queue.get(timeout=5, owner=index)
+            except queue.Empty:
+                continue
+
+            # کاری که به استخر پردازش سپرده شود، task_done را خودش (یا در صورت لغو، callback آن) اعلام می‌کند
+            handed_off = False
+            try:
+                if job.job_type == 'sitemap':
+                    self._log_result(job, self._process_sitemap(job))
+                    self._checkpoint_dirty.set()
+                    continue
+
+                response = self._fetch_job(job)
+
+                # انتظار برای جای خالی در استخر پردازش (با بررسی دوره‌ای درخواست توقف)
+                while not self.stop_event.is_set():
+                    if self._parse_slots.acquire(timeout=1):
+                        break
+                else:
                     continue
 
                 try:
-                    # پردازش کار
-                    result = self.process_job(job)
+                    future = self._executor.submit(self._handle_response, job, response)
+                except RuntimeError:
+                    # استخر پردازش در حال توقف است
+                    self._parse_slots.release()
+                    continue
 
-                    # لاگ نتیجه
-                    if result['success']:
-                        crawler_logger.info(
-                            f"خزش موفق {job.url} - استخراج {result.get('new_links_count', 0) if 'new_links_count' in result else result.get('extracted_urls', 0)} لینک جدید"
-                        )
-                    else:
-                        crawler_logger.warning(f"خزش ناموفق {job.url} - {result.get('error')}")
-
-                    # بررسی زمان ذخیره نقطه بازیابی
-                    now = datetime.now()
-                    if (now - self.last_checkpoint_time).total_seconds() > self.checkpoint_interval:
-                        self.crawl_state.save_checkpoint()
-                        self.last_checkpoint_time = now
-                finally:
-                    # اعلام تکمیل کار به صف - فقط یک بار فراخوانی می‌شود، در بلوک finally
+                handed_off = True
+                future.add_done_callback(self._release_parse_slot)
+
+            except Exception as e:
+                logger.error(f"خطا در نخ دریافت: {str(e)}")
+
+            finally:
+                # اعلام تکمیل کار به صف - دقیقاً یک بار برای هر کار برداشته‌شده
+                if not handed_off:
                     self.job_queue.task_done()
 
+    def _log_result(self, job, result):
+        """
+        لاگ نتیجه پردازش یک کار
+
+        Args:
+            job: کار خزش
+            result: نتیجه پردازش
+        """
+        # قالب‌بندی تنبل: در صورت غیرفعال بودن سطح لاگ، رشته پیام ساخته نمی‌شود
+        if result['success']:
+            crawler_logger.info(
+                "خزش موفق %s - استخراج %s لینک جدید", job.url,
+                result.get('new_links_count', 0) if 'new_links_count' in result else result.get('extracted_urls', 0)
+            )
+        else:
+            crawler_logger.warning("خزش ناموفق %s - %s", job.url, result.get('error'))
+
+    def _handle_response(self, job, response):
+        """
+        وظیفه پردازش یک پاسخ دریافت‌شده (در استخر نخ‌های پردازش اجرا می‌شود)
+
+        Args:
+            job: کار خزش
+            response: پاسخ دریافت‌شده توسط نخ دریافت
+        """
+        try:
+            # پردازش کار
+            result = self._process_response(job, response)
+
+            # لاگ نتیجه
+            self._log_result(job, result)
+
+            # علامت‌گذاری وضعیت برای ذخیره در نقطه بازیابی بعدی
+            if not self._checkpoint_dirty.is_set():
+                self._checkpoint_dirty.set()
+
+        except Exception as e:
+            logger.error(f"خطا در نخ کارگر: {str(e)}")
+
+        finally:
+            # اعلام تکمیل کار به صف - فقط یک بار فراخوانی می‌شود، در بلوک finally
+            self.job_queue.task_done()
+
+    def _release_parse_slot(self, future):
+        """
+        آزادسازی جای پاسخ در استخر پردازش پس از اتمام (یا لغو) وظیفه
+
+        Args:
+            future: وظیفه پردازش پاسخ
+        """
+        self._parse_slots.release()
+
+        # وظیفه لغوشده اجرا نشده است و task_done آن باید همین‌جا اعلام شود
+        if future.cancelled():
+            self.job_queue.task_done()
+
+    def _start_thread(self, target, name, args=()):
+        """
+        ساخت و شروع یک نخ خزشگر با ثبت آن در شمارنده نخ‌های زنده
+
+        شمارنده پیش از شروع نخ افزایش می‌یابد تا is_running بلافاصله پس از start درست باشد
+        و هنگام خروج تابع نخ (به هر دلیل) کاهش می‌یابد.
+
+        Args:
+            target: تابع اجرایی نخ
+            name: نام نخ
+            args: آرگومان‌های تابع نخ
+        """
+        def run():
+            try:
+                target(*args)
+            finally:
+                with self._alive_lock:
+                    self._alive_threads -= 1
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        with self._alive_lock:
+            self._alive_threads += 1
+        try:
+            thread.start()
+        except Exception:
+            with self._alive_lock:
+                self._alive_threads -= 1
+            raise
+
+        self.threads.append(thread)
+        return thread
+
+    def checkpoint_worker(self):
+        """
+        تابع اجرایی نخ ذخیره دوره‌ای نقطه بازیابی
+
+        هر checkpoint_interval ثانیه بیدار می‌شود و فقط در صورتی که از آخرین ذخیره کاری
+        پردازش شده باشد، نقطه بازیابی را ذخیره می‌کند.
+        """
+        while not self.stop_event.wait(self.checkpoint_interval):
+            if not self._checkpoint_dirty.is_set():
+                continue
+
+            self._checkpoint_dirty.clear()
+            try:
+                self.crawl_state.save_checkpoint()
+                self.last_checkpoint_time = time.monotonic()
             except Exception as e:
-                logger.error(f"خطا در نخ کارگر: {str(e)}")
-                # در صورت خطا، نباید task_done را فراخوانی کنیم زیرا قبلاً این کار را انجام داده‌ایم
+                logger.error(f"خطا در نخ نقطه بازیابی: {str(e)}")
 
     def start(self, initial_urls=None, load_checkpoint=True):
         """
@@ -1021,21 +2042,38 @@ class Crawler:
             for url in initial_urls:
                 self.add_job(url, depth=0, job_type='page')
 
+        # نوشتن لاگ‌ها در نخ‌های پس‌زمینه تا نخ‌های کارگر منتظر ورودی/خروجی لاگ نمانند
+        self._log_listeners = start_background_logging(logger, crawler_logger)
+
         # راه‌اندازی نخ‌های کارگر
         self.stop_event.clear()
+        self._fetchers_started.clear()
         self.threads = []
 
-        for i in range(self.max_threads):
-            thread = threading.Thread(
-                target=self.worker,
-                name=f"CrawlerWorker-{i + 1}",
-                daemon=True
-            )
-            thread.start()
-            self.threads.append(thread)
+        # استخر نخ‌های پردازش؛ نخ‌های دریافت پاسخ هر صفحه را به صورت یک وظیفه جداگانه به آن می‌سپارند
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_threads,
+            thread_name_prefix="CrawlerWorker"
+        )
+
+        # نخ‌های دریافت با پشته کوچک‌تر ساخته می‌شوند (اندازه پیش‌فرض پس از آن بازگردانده می‌شود)
+        try:
+            previous_stack_size = threading.stack_size(FETCH_THREAD_STACK_SIZE)
+        except (ValueError, RuntimeError):
+            previous_stack_size = None
+
+        try:
+            for i in range(self.fetch_threads):
+                self._start_thread(self.fetch_worker, f"CrawlerFetcher-{i + 1}", args=(i,))
+        finally:
+            if previous_stack_size is not None:
+                threading.stack_size(previous_stack_size)
+            self._fetchers_started.set()
+
+        self._start_thread(self.checkpoint_worker, "CrawlerCheckpoint")
 
         self.running = True
-        logger.info(f"خزشگر با {self.max_threads} نخ شروع به کار کرد")
+        logger.info(f"خزشگر با {self.fetch_threads} نخ دریافت و {self.max_threads} نخ پردازش شروع به کار کرد")
 
         return True
 
@@ -1062,6 +2100,11 @@ class Crawler:
             for thread in self.threads:
                 thread.join(timeout=10)
 
+        # توقف استخر پردازش (بدون انتظار، وظایف در صف لغو می‌شوند)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
         # ذخیره نقطه بازیابی
         if save_checkpoint:
             self.crawl_state.save_checkpoint()
@@ -1069,9 +2112,18 @@ class Crawler:
         # بستن منابع
         self.request_manager.close()
 
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = None
+
         self.running = False
         logger.info("خزشگر متوقف شد")
 
+        # بازگرداندن نوشتن مستقیم لاگ‌ها (رکوردهای باقی‌مانده نوشته می‌شوند)
+        stop_background_logging(self._log_listeners)
+        self._log_listeners = []
+
         return True
 
     def get_stats(self):
@@ -1083,29 +2135,28 @@ class Crawler:
         """
         stats = self.crawl_state.get_stats()
 
-        # افزودن آمار اضافی
-        with self.stats_lock:
-            stats['max_queue_size'] = self.max_queue_size
-            stats['current_queue_size'] = self.job_queue.qsize()
-            stats['active_threads'] = sum(1 for thread in self.threads if thread.is_alive())
+        # افزودن آمار اضافی (بدون قفل؛ مقادیر تقریبی لحظه‌ای هستند)
+        stats['max_queue_size'] = self.max_queue_size
+        stats['current_queue_size'] = self.job_queue.qsize()
+        stats['active_threads'] = self._alive_threads
 
-            # افزودن آمار ذخیره‌سازی
-            stats['storage'] = self.storage_stats
+        # افزودن آمار ذخیره‌سازی
+        stats['storage'] = self.storage_stats
 
-            # افزودن آمار استخراج محتوا
-            if self.use_db_storage and hasattr(self, 'content_extractor'):
-                try:
-                    stats['extraction'] = self.content_extractor.get_stats()
-                except Exception:
-                    pass
+        # افزودن آمار استخراج محتوا
+        if self.use_db_storage and hasattr(self, 'content_extractor'):
+            try:
+                stats['extraction'] = self.content_extractor.get_stats()
+            except Exception:
+                pass
 
-            # افزودن آمار ذخیره‌سازی از StorageManager
-            if self.use_db_storage and hasattr(self, 'storage_manager'):
-                try:
-                    storage_stats = self.storage_manager.get_stats()
-                    stats['storage_manager'] = storage_stats
-                except Exception:
-                    pass
+        # افزودن آمار ذخیره‌سازی از StorageManager
+        if self.use_db_storage and hasattr(self, 'storage_manager'):
+            try:
+                storage_stats = self.storage_manager.get_stats()
+                stats['storage_manager'] = storage_stats
+            except Exception:
+                pass
 
         return stats
 
@@ -1116,7 +2167,7 @@ class Crawler:
         Returns:
             bool: آیا خزشگر در حال اجراست؟
         """
-        return self.running and any(thread.is_alive() for thread in self.threads)
+        return self.running and self._alive_threads > 0
 
     def wait_for_completion(self, timeout=None):
         """
@@ -1168,112 +2219,72 @@ class Crawler:
         Returns:
             dict: داده‌های استخراج شده
         """
-        # استخراج اطلاعات پایه
-        data = {
-            'url': url,
-            'type': job_type,
-            'title': extract_title(html_content),
-            'date': extract_date(html_content),
-            'author': extract_author(html_content)
-        }
-
-        # دریافت سلکتورهای HTML متناسب با نوع صفحه
         selectors = self.structure_discovery.get_html_selectors(url, job_type)
+        return extract_page_data(url, html_content, soup, job_type, selectors, self.extract_generic_pages)
 
-        if job_type == 'list':
-            # استخراج محتوای لیستی
-            items = []
-
-            if soup and selectors and 'container' in selectors and 'item' in selectors:
-                container_selector = selectors['container']
-                item_selector = selectors['item']
-
-                container = soup.select_one(container_selector)
-                if container:
-                    for item_element in container.select(item_selector):
-                        item_data = {}
-
-                        # استخراج عنوان
-                        if 'title' in selectors:
-                            title_element = item_element.select_one(selectors['title'])
-                            if title_element:
-                                item_data['title'] = title_element.get_text().strip()
-
-                        # استخراج لینک
-                        if 'link' in selectors:
-                            link_element = item_element.select_one(selectors['link'])
-                            if link_element and link_element.has_attr('href'):
-                                href = link_element['href']
-                                item_data['link'] = urljoin(url, href)
-
-                        # استخراج خلاصه
-                        if 'summary' in selectors:
-                            summary_element = item_element.select_one(selectors['summary'])
-                            if summary_element:
-                                item_data['summary'] = summary_element.get_text().strip()
-
-                        items.append(item_data)
-
-            data['items'] = items
-            data['items_count'] = len(items)
-
-            # استخراج اطلاعات صفحه‌بندی
-            if soup and selectors and 'pagination' in selectors:
-                pagination_selector = selectors['pagination']
-                pagination_element = soup.select_one(pagination_selector)
-
-                if pagination_element:
-                    data['has_pagination'] = True
-
-                    # استخراج لینک‌های صفحه‌بندی
-                    pagination_links = []
-
-                    if 'pagination_links' in selectors:
-                        links_selector = selectors['pagination_links']
-                        for link in pagination_element.select(links_selector):
-                            if link.has_attr('href'):
-                                href = link['href']
-                                pagination_links.append(urljoin(url, href))
-
-                    data['pagination_links'] = pagination_links
-            else:
-                data['has_pagination'] = False
+    def _parse_page(self, url, html_content, soup, job_type, extract_data, extract_page_links):
+        """
+        استخراج داده‌ها و لینک‌های صفحه در استخر فرایندها (در صورت فعال بودن)
 
-        elif job_type == 'detail':
-            # استخراج محتوای صفحه جزئیات
-            if soup and selectors:
-                # استخراج محتوای اصلی
-                if 'content' in selectors:
-                    content_selector = selectors['content']
-                    content_element = soup.select_one(content_selector)
-
-                    if content_element:
-                        data['content'] = content_element.get_text().strip()
-                        data['content_html'] = str(content_element)
-                else:
-                    # استخراج محتوای اصلی با روش‌های عمومی
-                    data['content'] = extract_main_content(html_content)
+        تجزیه HTML کاملاً پردازنده‌محور است و در نخ‌های کارگر به دلیل GIL موازی نمی‌شود؛
+        بنابراین در فرایندهای جداگانه انجام می‌شود تا نخ‌ها به ارسال درخواست‌های HTTP ادامه دهند.
+        در صورت غیرفعال بودن یا خرابی استخر، همان کار در نخ فعلی انجام می‌شود.
 
-                # استخراج تاریخ از سلکتور اختصاصی
-                if 'date' in selectors and not data.get('date'):
-                    date_selector = selectors['date']
-                    date_element = soup.select_one(date_selector)
+        Args:
+            url: آدرس URL صفحه
+            html_content: محتوای HTML صفحه
+            soup: شیء BeautifulSoup (فقط برای اجرای درون نخ)
+            job_type: نوع صفحه
+            extract_data: آیا داده‌های صفحه استخراج شوند؟
+            extract_page_links: آیا لینک‌های داخلی صفحه استخراج شوند؟
 
-                    if date_element:
-                        data['date'] = date_element.get_text().strip()
+        Returns:
+            tuple: (داده‌های صفحه یا None، لیست لینک‌های نرمال‌شده و بدون تکرار)
+        """
+        # صفحات عمومی فقط برای کشف لینک خزیده می‌شوند (مگر استخراج آن‌ها خواسته شده باشد)
+        if extract_data and job_type not in ('list', 'detail') and not self.extract_generic_pages:
+            skipped_data = {'url': url, 'type': job_type}
+            if not extract_page_links:
+                return skipped_data, []
+            _, links = self._parse_page(url, html_content, soup, job_type, False, extract_page_links)
+            return skipped_data, links
 
-                # استخراج نویسنده از سلکتور اختصاصی
-                if 'author' in selectors and not data.get('author'):
-                    author_selector = selectors['author']
-                    author_element = soup.select_one(author_selector)
+        selectors = self.structure_discovery.get_html_selectors(url, job_type) if extract_data else None
 
-                    if author_element:
-                        data['author'] = author_element.get_text().strip()
-        else:
-            # صفحه عمومی - استخراج محتوای اصلی
-            data['content'] = extract_main_content(html_content)
+        pool = self._get_parse_pool()
+        if pool is not None:
+            try:
+                return pool.submit(parse_page, url, html_content, job_type, selectors,
+                                   extract_data, extract_page_links).result()
+            except concurrent.futures.BrokenExecutor as e:
+                logger.warning(f"استخر فرایندهای تجزیه از کار افتاد؛ تجزیه در نخ کارگر انجام می‌شود: {str(e)}")
+                with self._parse_pool_lock:
+                    self._parse_pool = None
+                    self._parse_pool_disabled = True
 
-        return data
+        page_data = extract_page_data(url, html_content, soup, job_type, selectors) if extract_data else None
+        links = page_links(html_content, url) if extract_page_links else []
+        return page_data, links
+
+    def _get_parse_pool(self):
+        """
+        دریافت استخر فرایندهای تجزیه صفحات (ساخت تنبل در اولین استفاده)
+
+        Returns:
+            ProcessPoolExecutor یا None در صورت غیرفعال بودن
+        """
+        if self._parse_pool is None and not self._parse_pool_disabled:
+            with self._parse_pool_lock:
+                if self._parse_pool is None and not self._parse_pool_disabled:
+                    if PARSE_PROCESSES > 0:
+                        # spawn: فورک کردن فرایندی که نخ‌های فعال دارد ممکن است قفل‌ها را در حالت گرفته‌شده کپی کند
+                        self._parse_pool = concurrent.futures.ProcessPoolExecutor(
+                            max_workers=PARSE_PROCESSES,
+                            mp_context=multiprocessing.get_context('spawn')
+                        )
+                    else:
+                        self._parse_pool_disabled = True
+        return self._parse_pool
 
     def _process_sitemap_job(self, job):
         """
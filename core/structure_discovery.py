@@ -13,6 +13,7 @@ import re
 import os
 import json
 import time
+import functools
 from urllib.parse import urlparse, parse_qs, urljoin
 from collections import defaultdict
 import numpy as np
@@ -23,6 +24,46 @@ from utils.http import RequestManager
 from database.operations import BaseDBOperations
 from models.domain import Domain
 
+# تلاش برای import pyahocorasick (جستجوی چندالگویی در یک گذر)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# اندازه کش الگو و سلکتورهای HTML هر URL
+URL_PATTERN_CACHE_SIZE = 8192
+
+# بخش‌های لفظی عبارت منظم الگو (جداشده با نویسه‌های عام . و .* و .*?)
+_REGEX_WILDCARD_RE = re.compile(r'\.\*\??|\.')
+_REGEX_META_CHARS = frozenset('\\[](){}|+*?^$')
+
+# حداقل طول توکن لفظی برای پیش‌دسته‌بندی
+MIN_LITERAL_TOKEN_LENGTH = 3
+
+
+def _required_literal(regex_source):
+    """
+    استخراج بلندترین بخش لفظی که در هر URL منطبق با الگو وجود دارد
+
+    Args:
+        regex_source: متن عبارت منظم الگو
+
+    Returns:
+        str: توکن لفظی یا None اگر الگو قابل تحلیل نباشد
+    """
+    source = regex_source
+    if source.startswith('^'):
+        source = source[1:]
+    if source.endswith('$'):
+        source = source[:-1]
+
+    pieces = _REGEX_WILDCARD_RE.split(source)
+    if any(_REGEX_META_CHARS.intersection(piece) for piece in pieces):
+        return None
+
+    token = max(pieces, key=len)
+    return token if len(token) >= MIN_LITERAL_TOKEN_LENGTH else None
+
 
 class URLPattern:
     """کلاس الگوی URL برای شناسایی و دسته‌بندی آدرس‌ها"""
@@ -713,6 +754,9 @@ class URLStructureDiscovery:
         self.common_parameters = {}
         self.important_sections = []
 
+        # پیش‌دسته‌بندی الگوها بر اساس توکن‌های لفظی (با تغییر لیست الگوها بازسازی می‌شود)
+        self._matcher = None
+
     def add_url(self, url):
         """
         افزودن یک URL به مجموعه داده‌ها
@@ -1250,11 +1294,60 @@ class URLStructureDiscovery:
         Returns:
             URLPattern: الگوی مطابقت‌یافته یا None
         """
-        for pattern in self.patterns:
-            if pattern.matches(url):
-                return pattern
+        patterns = self.patterns
+        matcher = self._matcher
+        if matcher is None or matcher[0] is not patterns or matcher[1] != len(patterns):
+            matcher = self._build_matcher()
+
+        _, _, automaton, tokens, candidates = matcher
+
+        # فقط الگوهایی بررسی می‌شوند که توکن لفظی آن‌ها در URL وجود دارد
+        candidates = set(candidates)
+        if automaton is not None:
+            for _, indexes in automaton.iter(url):
+                candidates.update(indexes)
+        else:
+            for token, indexes in tokens.items():
+                if token in url:
+                    candidates.update(indexes)
+
+        # ترتیب اصلی الگوها حفظ می‌شود تا اولین الگوی منطبق برگردانده شود
+        for index in sorted(candidates):
+            if patterns[index].matches(url):
+                return patterns[index]
         return None
 
+    def _build_matcher(self):
+        """
+        ساخت پیش‌دسته‌بند الگوها
+
+        برای هر الگو بلندترین بخش لفظی عبارت منظم آن استخراج می‌شود و همه توکن‌ها در یک
+        خودکار Aho-Corasick قرار می‌گیرند؛ الگوهایی که توکن قابل اطمینانی ندارند همیشه بررسی می‌شوند.
+
+        Returns:
+            tuple: (لیست الگوها، تعداد الگوها، خودکار، نگاشت توکن به اندیس‌ها، اندیس‌های بدون توکن)
+        """
+        patterns = self.patterns
+        tokens = defaultdict(list)
+        unfiltered = []
+
+        for index, pattern in enumerate(patterns):
+            token = _required_literal(pattern.regex.pattern)
+            if token is None:
+                unfiltered.append(index)
+            else:
+                tokens[token].append(index)
+
+        automaton = None
+        if ahocorasick is not None and tokens:
+            automaton = ahocorasick.Automaton()
+            for token, indexes in tokens.items():
+                automaton.add_word(token, tuple(indexes))
+            automaton.make_automaton()
+
+        self._matcher = (patterns, len(patterns), automaton, dict(tokens), tuple(unfiltered))
+        return self._matcher
+
     def get_pattern_for_url(self, url):
         """
         یافتن الگوی مناسب برای یک URL
@@ -1327,9 +1420,20 @@ class StructureDiscovery:
         # وضعیت شناسایی
         self.discovered = False
 
+        # کش الگو و سلکتورهای هر URL (با تغییر الگوها پاک می‌شود)
+        self._pattern_cache = functools.lru_cache(maxsize=URL_PATTERN_CACHE_SIZE)(
+            self.url_discoverer.get_pattern_for_url)
+        self._selectors_cache = functools.lru_cache(maxsize=URL_PATTERN_CACHE_SIZE)(
+            self._find_html_selectors)
+
         # بارگذاری الگوهای ذخیره شده در صورت وجود
         self._load_patterns()
 
+    def clear_caches(self):
+        """پاک‌سازی کش الگو و سلکتورهای URLها (پس از بارگذاری یا کشف الگوهای جدید)"""
+        self._pattern_cache.cache_clear()
+        self._selectors_cache.cache_clear()
+
     def _load_patterns(self):
         """بارگذاری الگوهای ذخیره شده از دیتابیس یا فایل"""
         # ابتدا تلاش برای بارگذاری از دیتابیس
@@ -1341,6 +1445,7 @@ class StructureDiscovery:
             file_loaded = self._load_patterns_from_files()
 
         self.discovered = db_loaded or file_loaded
+        self.clear_caches()
 
         if self.discovered:
             logger.info("الگوهای ساختاری با موفقیت بارگذاری شدند")
@@ -1492,6 +1597,7 @@ class StructureDiscovery:
             # کشف الگوهای URL
             logger.info("کشف الگوهای URL...")
             url_patterns = self.url_discoverer.discover_patterns()
+            self.clear_caches()
 
             # ذخیره الگوهای کشف شده
             if save:
@@ -1633,7 +1739,7 @@ class StructureDiscovery:
         Returns:
             URLPattern: الگوی URL یا None
         """
-        return self.url_discoverer.get_pattern_for_url(url)
+        return self._pattern_cache(url)
 
     def get_html_selectors(self, url, url_type=None):
         """
@@ -1643,6 +1749,19 @@ class StructureDiscovery:
             url: آدرس URL
             url_type: نوع URL (اختیاری، 'list', 'detail')
 
+        Returns:
+            dict: سلکتورهای HTML
+        """
+        return self._selectors_cache(url, url_type)
+
+    def _find_html_selectors(self, url, url_type):
+        """
+        یافتن سلکتورهای HTML یک آدرس از میان سلکتورهای کشف‌شده (بدون کش)
+
+        Args:
+            url: آدرس URL
+            url_type: نوع URL (یا None برای تشخیص خودکار)
+
         Returns:
             dict: سلکتورهای HTML
         """
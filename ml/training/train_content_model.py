@@ -13,7 +13,7 @@ import os
 import sys
 import json
 import argparse
-import pickle
+import joblib
 import numpy as np
 from datetime import datetime
 from typing import Tuple, Dict
@@ -315,8 +315,8 @@ def save_model(model_data: Dict, feature_extractor, label_encoder, model_path: s
         'feature_extractor_path': feature_extractor_path,
         'timestamp': datetime.now().isoformat()
     }
-    with open(model_path, 'wb') as f:
-        pickle.dump(model_package, f)
+    # ذخیره بدون فشرده‌سازی تا آرایه‌ها هنگام بارگذاری قابل نگاشت حافظه (mmap) باشند
+    joblib.dump(model_package, model_path, compress=0)
     logger.info(f"مدل تشخیص نوع محتوا با موفقیت در {model_path} ذخیره شد")
     return model_path
 
@@ -332,8 +332,7 @@ def load_model(model_path: str) -> Tuple:
         Tuple: (model, feature_extractor, label_encoder)
     """
     logger.info(f"بارگذاری مدل از {model_path}")
-    with open(model_path, 'rb') as f:
-        model_package = pickle.load(f)
+    model_package = joblib.load(model_path)
     model = model_package['model']
     label_encoder = model_package['label_encoder']
     feature_extractor_path = model_package.get('feature_extractor_path')
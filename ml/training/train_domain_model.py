@@ -12,7 +12,7 @@ import os
 import sys
 import json
 import argparse
-import pickle
+import joblib
 import numpy as np
 from datetime import datetime
 from typing import Tuple, Dict
@@ -302,8 +302,8 @@ def save_model(model_data: Dict, feature_extractor, mlb, model_path: str = None)
         'timestamp': datetime.now().isoformat()
     }
 
-    with open(model_path, 'wb') as f:
-        pickle.dump(model_package, f)
+    # ذخیره بدون فشرده‌سازی تا آرایه‌ها هنگام بارگذاری قابل نگاشت حافظه (mmap) باشند
+    joblib.dump(model_package, model_path, compress=0)
 
     logger.info(f"مدل طبقه‌بندی حوزه با موفقیت در {model_path} ذخیره شد")
     return model_path
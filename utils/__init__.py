@@ -5,11 +5,12 @@
     - logger: سیستم لاگ‌گیری یکپارچه
     - http: مدیریت درخواست‌های HTTP و تعامل با وب (شامل پردازش robots.txt و استفاده از Selenium)
     - text: توابع پردازش و نرمال‌سازی متن و استخراج اطلاعات از HTML
+    - page_parser: تجزیه صفحات (استخراج داده‌ها و لینک‌های داخلی) در فرایندهای کارگر تجزیه
     - ml: ابزارها و توابع کمکی برای عملیات یادگیری ماشین (مانند بارگذاری/ذخیره مدل، ارزیابی و به‌روزرسانی مدل‌ها)
 """
 
-from .logger import get_logger, get_crawler_logger
-from .http import RequestManager, RobotsTxtParser, make_request, normalize_url
+from .logger import get_logger, get_crawler_logger, start_background_logging, stop_background_logging
+from .http import RequestManager, RobotsTxtParser, make_request, normalize_url, cached_urlparse
 from .text import (
     clean_html,
     extract_text_from_tags,
@@ -23,15 +24,18 @@ from .text import (
     extract_links,
     is_similar_content
 )
-from .ml import MLUtils
+from .page_parser import extract_page_data, parse_page, page_links
 
 __all__ = [
     "get_logger",
     "get_crawler_logger",
+    "start_background_logging",
+    "stop_background_logging",
     "RequestManager",
     "RobotsTxtParser",
     "make_request",
     "normalize_url",
+    "cached_urlparse",
     "clean_html",
     "extract_text_from_tags",
     "normalize_persian_text",
@@ -43,5 +47,21 @@ __all__ = [
     "extract_author",
     "extract_links",
     "is_similar_content",
+    "extract_page_data",
+    "parse_page",
+    "page_links",
     "MLUtils"
 ]
+
+
+def __getattr__(name):
+    """
+    بارگذاری تنبل MLUtils
+
+    ماژول ml به numpy و sklearn وابسته است؛ فرایندهای کارگر تجزیه صفحات که فقط از
+    page_parser استفاده می‌کنند نباید هنگام import پکیج utils این کتابخانه‌ها را بارگذاری کنند.
+    """
+    if name == "MLUtils":
+        from .ml import MLUtils
+        return MLUtils
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
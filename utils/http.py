@@ -5,12 +5,15 @@
 """
 
 import os
+import re
+import sys
 import time
 import random
+import functools
 import urllib.robotparser
 from urllib.parse import urlparse, urljoin
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
 from requests.packages.urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -26,6 +29,14 @@ from utils.logger import get_logger
 # تنظیم لاگر
 logger = get_logger(__name__)
 
+# اندازه کش URLهای تجزیه و نرمال‌سازی شده
+# (هر لینک کشف‌شده چند بار در طول خط لوله خزش نرمال‌سازی و تجزیه می‌شود)
+URL_CACHE_SIZE = 65536
+
+# نویسه‌هایی که وجودشان در URL مطلق نیاز به تجزیه کامل دارد
+# (کوئری، فرگمنت، پارامترهای مسیر، کروشه‌های میزبان IPv6 و نویسه‌هایی که urlparse حذف می‌کند)
+_NON_CANONICAL_URL_RE = re.compile(r'[?#;\[\]\t\r\n]')
+
 # لیست User-Agent های متداول
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -116,7 +127,8 @@ class RobotsTxtParser:
 class RequestManager:
     """کلاس مدیریت درخواست‌های HTTP"""
 
-    def __init__(self, base_url=None, default_delay=1, respect_robots=True, use_selenium=False):
+    def __init__(self, base_url=None, default_delay=1, respect_robots=True, use_selenium=False,
+                 pool_maxsize=None, pool_connections=None):
         """
         مقداردهی اولیه مدیریت درخواست‌ها
 
@@ -125,11 +137,15 @@ class RequestManager:
             default_delay: تأخیر پیش‌فرض بین درخواست‌ها (ثانیه)
             respect_robots: آیا محدودیت‌های robots.txt رعایت شود؟
             use_selenium: آیا از سلنیوم برای بارگذاری صفحات استفاده شود؟
+            pool_maxsize: حداکثر اتصالات باز نگه‌داشته‌شده به هر میزبان (اختیاری، پیش‌فرض requests)
+            pool_connections: تعداد میزبان‌هایی که استخر اتصال آن‌ها نگه داشته می‌شود (اختیاری، پیش‌فرض requests)
         """
         self.base_url = base_url
         self.default_delay = float(os.getenv('CRAWL_DELAY', default_delay))
         self.respect_robots = respect_robots
         self.use_selenium = use_selenium
+        self.pool_maxsize = pool_maxsize or DEFAULT_POOLSIZE
+        self.pool_connections = pool_connections or DEFAULT_POOLSIZE
         self.last_request_time = 0
 
         # ایجاد نشست HTTP
@@ -163,12 +179,22 @@ class RequestManager:
         )
 
         # تنظیم آداپتور با استراتژی تلاش مجدد
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # (استخر اتصال به اندازه تعداد نخ‌های هم‌زمان تا اتصالات keep-alive دور ریخته نشوند؛
+        # در صورت پر بودن استخر، اتصال اضافی ساخته می‌شود و نخ مسدود نمی‌شود)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
-        # تنظیم User-Agent
-        session.headers.update({"User-Agent": self._get_random_user_agent()})
+        # تنظیم User-Agent و نگه‌داشتن اتصال برای درخواست‌های بعدی
+        session.headers.update({
+            "User-Agent": self._get_random_user_agent(),
+            "Connection": "keep-alive"
+        })
 
         return session
 
@@ -323,6 +349,7 @@ class RequestManager:
 
         return {
             'html': response.text,
+            'content': response.content,
             'url': response.url,
             'status_code': response.status_code,
             'headers': dict(response.headers),
@@ -509,6 +536,21 @@ def make_request(url, method='get', **kwargs):
         manager.close()
 
 
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def cached_urlparse(url):
+    """
+    تجزیه یک URL با کش نتایج (نتیجه urlparse یک namedtuple تغییرناپذیر است)
+
+    Args:
+        url: آدرس برای تجزیه
+
+    Returns:
+        ParseResult: اجزای URL
+    """
+    return urlparse(url)
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
 def normalize_url(url, base_url=None):
     """
     نرمال‌سازی یک URL
@@ -518,14 +560,19 @@ def normalize_url(url, base_url=None):
         base_url: آدرس پایه برای URL‌های نسبی
 
     Returns:
-        str: URL نرمال‌سازی شده
+        str: URL نرمال‌سازی شده (intern‌شده تا همه ساختارهای وضعیت خزش یک نسخه از رشته را نگه دارند)
     """
+    # مسیر سریع: URL مطلق بدون کوئری، فرگمنت و پارامتر از قبل نرمال است
+    if url.startswith(('http://', 'https://')):
+        if url.isascii() and not _NON_CANONICAL_URL_RE.search(url):
+            return sys.intern(url)
+
     # تبدیل URL نسبی به مطلق
-    if base_url and not url.startswith(('http://', 'https://')):
+    elif base_url:
         url = urljoin(base_url, url)
 
     # پردازش URL
-    parsed = urlparse(url)
+    parsed = cached_urlparse(url)
 
     # بازسازی URL با حذف پارامترهای غیرضروری
-    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
\ No newline at end of file
+    return sys.intern(f"{parsed.scheme}://{parsed.netloc}{parsed.path}")
\ No newline at end of file
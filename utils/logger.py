@@ -5,6 +5,7 @@
 """
 
 import os
+import queue
 import logging
 import logging.handlers
 from datetime import datetime
@@ -85,4 +86,48 @@ def get_crawler_logger():
     request_handler.setFormatter(logging.Formatter(request_format))
     logger.addHandler(request_handler)
 
-    return logger
\ No newline at end of file
+    return logger
+
+
+def start_background_logging(*loggers):
+    """
+    انتقال نوشتن لاگ‌ها به نخ‌های پس‌زمینه
+
+    هندلرهای هر لاگر به یک QueueListener منتقل می‌شوند و به جای آن‌ها یک QueueHandler قرار
+    می‌گیرد، بنابراین نخ فراخوان فقط رکورد را در صف قرار می‌دهد و منتظر قفل هندلرها و
+    نوشتن روی فایل یا کنسول نمی‌ماند.
+
+    Args:
+        *loggers: لاگرهایی که نوشتن آن‌ها باید به پس‌زمینه منتقل شود
+
+    Returns:
+        list: زوج‌های (لاگر، شنونده) برای ارسال به stop_background_logging
+    """
+    listeners = []
+    for logger in loggers:
+        handlers = list(logger.handlers)
+
+        # لاگرهای بدون هندلر یا لاگرهایی که از قبل در پس‌زمینه می‌نویسند
+        if not handlers or any(isinstance(handler, logging.handlers.QueueHandler) for handler in handlers):
+            continue
+
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        listener.start()
+        listeners.append((logger, listener))
+
+    return listeners
+
+
+def stop_background_logging(listeners):
+    """
+    توقف نوشتن پس‌زمینه و بازگرداندن هندلرهای اصلی لاگرها
+
+    Args:
+        listeners: خروجی start_background_logging
+    """
+    for logger, listener in listeners:
+        # رکوردهای باقی‌مانده در صف پیش از بازگشت نوشته می‌شوند
+        listener.stop()
+        logger.handlers = list(listener.handlers)
@@ -13,6 +13,7 @@ import os
 import pickle
 from datetime import datetime
 
+import joblib
 import numpy as np
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
@@ -31,7 +32,7 @@ class MLUtils:
     @staticmethod
     def load_model(model_path: str):
         """
-        بارگذاری مدل از فایل pickle.
+        بارگذاری مدل از فایل joblib (یا فایل pickle مدل‌های قدیمی).
 
         Args:
             model_path (str): مسیر فایل مدل
@@ -44,8 +45,13 @@ class MLUtils:
             return None
 
         try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
+            try:
+                # نگاشت حافظه آرایه‌های بزرگ مدل به جای بارگذاری کامل در heap
+                model = joblib.load(model_path, mmap_mode='r')
+            except (KeyError, pickle.UnpicklingError):
+                # سازگاری با مدل‌های قدیمی ذخیره‌شده با pickle
+                with open(model_path, 'rb') as f:
+                    model = pickle.load(f)
             logger.info(f"مدل با موفقیت از {model_path} بارگذاری شد")
             return model
         except Exception as e:
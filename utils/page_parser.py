@@ -0,0 +1,198 @@
+"""
+ماژول تجزیه صفحات برای خزشگر هوشمند داده‌های حقوقی
+
+این ماژول شامل توابع استخراج داده‌ها و لینک‌های داخلی صفحات است. این توابع در فرایندهای
+کارگر تجزیه (spawn) اجرا می‌شوند، بنابراین این ماژول نباید پکیج core (طبقه‌بند، استخراج‌کننده
+محتوا و مدل‌های NLP) را import کند تا هر فرایند کارگر فقط وابستگی‌های سبک تجزیه HTML را بارگذاری کند.
+"""
+
+import functools
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import soupsieve
+
+from utils.http import normalize_url
+from utils.text import extract_links, extract_main_content, extract_title, extract_date, extract_author
+
+
+@functools.lru_cache(maxsize=256)
+def compile_css(selector):
+    """
+    کامپایل یک سلکتور CSS (یک بار برای هر سلکتور در هر فرایند)
+
+    سلکتورهای کامپایل‌شده مستقیماً روی درخت BeautifulSoup اعمال می‌شوند و در حلقه آیتم‌های
+    صفحات لیستی نیازی به تجزیه و جستجوی مجدد سلکتور در هر فراخوانی نیست.
+
+    Args:
+        selector: سلکتور CSS
+
+    Returns:
+        SoupSieve: سلکتور کامپایل‌شده
+    """
+    return soupsieve.compile(selector)
+
+
+def extract_page_data(url, html_content, soup, job_type, selectors, extract_generic=True):
+    """
+    استخراج داده‌های صفحه بر اساس نوع آن
+
+    Args:
+        url: آدرس URL صفحه
+        html_content: محتوای HTML صفحه
+        soup: شیء BeautifulSoup
+        job_type: نوع صفحه ('page', 'list', 'detail')
+        selectors: سلکتورهای HTML متناسب با نوع صفحه
+        extract_generic: آیا محتوای صفحات عمومی (غیر از لیست و جزئیات) استخراج شود؟
+
+    Returns:
+        dict: داده‌های استخراج شده
+    """
+    # صفحات عمومی بدون نیاز به محتوا فقط با آدرس و نوع برگردانده می‌شوند
+    if not extract_generic and job_type not in ('list', 'detail'):
+        return {'url': url, 'type': job_type}
+
+    # استخراج اطلاعات پایه
+    data = {
+        'url': url,
+        'type': job_type,
+        'title': extract_title(html_content),
+        'date': extract_date(html_content),
+        'author': extract_author(html_content)
+    }
+
+    if job_type == 'list':
+        # استخراج محتوای لیستی
+        items = []
+
+        if soup and selectors and 'container' in selectors and 'item' in selectors:
+            container_selector = selectors['container']
+            item_selector = selectors['item']
+
+            container = compile_css(container_selector).select_one(soup)
+            if container:
+                for item_element in compile_css(item_selector).select(container):
+                    item_data = {}
+
+                    # استخراج عنوان
+                    if 'title' in selectors:
+                        title_element = compile_css(selectors['title']).select_one(item_element)
+                        if title_element:
+                            item_data['title'] = title_element.get_text().strip()
+
+                    # استخراج لینک
+                    if 'link' in selectors:
+                        link_element = compile_css(selectors['link']).select_one(item_element)
+                        if link_element and link_element.has_attr('href'):
+                            href = link_element['href']
+                            item_data['link'] = urljoin(url, href)
+
+                    # استخراج خلاصه
+                    if 'summary' in selectors:
+                        summary_element = compile_css(selectors['summary']).select_one(item_element)
+                        if summary_element:
+                            item_data['summary'] = summary_element.get_text().strip()
+
+                    items.append(item_data)
+
+        data['items'] = items
+        data['items_count'] = len(items)
+
+        # استخراج اطلاعات صفحه‌بندی
+        if soup and selectors and 'pagination' in selectors:
+            pagination_selector = selectors['pagination']
+            pagination_element = compile_css(pagination_selector).select_one(soup)
+
+            if pagination_element:
+                data['has_pagination'] = True
+
+                # استخراج لینک‌های صفحه‌بندی
+                pagination_links = []
+
+                if 'pagination_links' in selectors:
+                    links_selector = selectors['pagination_links']
+                    for link in compile_css(links_selector).select(pagination_element):
+                        if link.has_attr('href'):
+                            href = link['href']
+                            pagination_links.append(urljoin(url, href))
+
+                data['pagination_links'] = pagination_links
+        else:
+            data['has_pagination'] = False
+
+    elif job_type == 'detail':
+        # استخراج محتوای صفحه جزئیات
+        if soup and selectors:
+            # استخراج محتوای اصلی
+            if 'content' in selectors:
+                content_selector = selectors['content']
+                content_element = compile_css(content_selector).select_one(soup)
+
+                if content_element:
+                    data['content'] = content_element.get_text().strip()
+                    data['content_html'] = str(content_element)
+            else:
+                # استخراج محتوای اصلی با روش‌های عمومی
+                data['content'] = extract_main_content(html_content)
+
+            # استخراج تاریخ از سلکتور اختصاصی
+            if 'date' in selectors and not data.get('date'):
+                date_selector = selectors['date']
+                date_element = compile_css(date_selector).select_one(soup)
+
+                if date_element:
+                    data['date'] = date_element.get_text().strip()
+
+            # استخراج نویسنده از سلکتور اختصاصی
+            if 'author' in selectors and not data.get('author'):
+                author_selector = selectors['author']
+                author_element = compile_css(author_selector).select_one(soup)
+
+                if author_element:
+                    data['author'] = author_element.get_text().strip()
+    else:
+        # صفحه عمومی - استخراج محتوای اصلی
+        data['content'] = extract_main_content(html_content)
+
+    return data
+
+
+def parse_page(url, html_content, job_type, selectors, extract_data=True, extract_page_links=True):
+    """
+    تجزیه یک صفحه در فرایند کارگر (استخراج داده‌ها و لینک‌های داخلی)
+
+    Args:
+        url: آدرس URL صفحه
+        html_content: محتوای HTML صفحه
+        job_type: نوع صفحه
+        selectors: سلکتورهای HTML متناسب با نوع صفحه
+        extract_data: آیا داده‌های صفحه استخراج شوند؟
+        extract_page_links: آیا لینک‌های داخلی صفحه استخراج شوند؟
+
+    Returns:
+        tuple: (داده‌های صفحه یا None، لیست لینک‌ها)
+    """
+    page_data = None
+    if extract_data:
+        # شیء soup قابل ارسال بین فرایندها نیست و در صورت نیاز سلکتورها دوباره ساخته می‌شود
+        # (با همان پارسر RequestManager تا نتیجه سلکتورها یکسان بماند)
+        soup = BeautifulSoup(html_content, 'html.parser') if selectors and job_type in ('list', 'detail') else None
+        page_data = extract_page_data(url, html_content, soup, job_type, selectors)
+
+    links = page_links(html_content, url) if extract_page_links else []
+    return page_data, links
+
+
+def page_links(html_content, url):
+    """
+    استخراج لینک‌های داخلی نرمال‌شده و بدون تکرار یک صفحه
+
+    نرمال‌سازی و حذف تکرار نیز پردازنده‌محور است و همراه با تجزیه در فرایند کارگر انجام می‌شود.
+
+    Args:
+        html_content: محتوای HTML صفحه
+        url: آدرس URL صفحه
+
+    Returns:
+        list: لینک‌های نرمال‌شده (با حفظ ترتیب اولین ظهور)
+    """
+    return list(dict.fromkeys(normalize_url(link) for link in extract_links(html_content, url, internal_only=True)))
@@ -7,7 +7,7 @@
 import re
 import string
 import unicodedata
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import hashlib
 
 from utils.logger import get_logger
@@ -15,6 +15,20 @@ from utils.logger import get_logger
 # تنظیم لاگر
 logger = get_logger(__name__)
 
+# تلاش برای import lxml (پارسر C برای BeautifulSoup)
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# کلاس‌های کاندیدای محتوای اصلی صفحه
+_CONTENT_CLASS_RE = re.compile(r'(content|article|post|body|main)', re.I)
+
+# محدودسازی پارس به تگ‌های مورد نیاز (سایر تگ‌ها به درخت اضافه نمی‌شوند)
+_TITLE_STRAINER = SoupStrainer(['title', 'h1', 'h2', 'header'])
+_LINK_STRAINER = SoupStrainer('a', href=True)
+
 # کاراکترهای ویژه فارسی که باید یکدست شوند
 PERSIAN_CHARS_MAP = {
     'ك': 'ک',  # کاف عربی به کاف فارسی
@@ -63,7 +77,7 @@ def clean_html(html_content):
 
     try:
         # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
 
         # حذف تگ‌های اسکریپت و استایل
         for tag in soup.find_all(['script', 'style', 'header', 'footer', 'nav']):
@@ -100,7 +114,7 @@ def extract_text_from_tags(html_content, tags, class_=None, id=None):
 
     try:
         # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
 
         # جستجو با اعمال فیلترها
         results = []
@@ -228,15 +242,14 @@ def extract_main_content(html_content):
 
     try:
         # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
 
         # حذف تگ‌های غیرضروری
         for tag in soup.find_all(['script', 'style', 'header', 'footer', 'nav', 'aside']):
             tag.decompose()
 
         # یافتن بخش اصلی محتوا (با ابتکار)
-        main_tags = soup.find_all(['article', 'main', 'div'],
-                                  class_=re.compile(r'(content|article|post|body|main)', re.I))
+        main_tags = soup.find_all(['article', 'main', 'div'], class_=_CONTENT_CLASS_RE)
 
         if main_tags:
             # انتخاب بزرگترین بخش محتوا
@@ -273,8 +286,8 @@ def extract_title(html_content):
         return ""
 
     try:
-        # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # ایجاد شیء BeautifulSoup (فقط تگ‌های عنوان)
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=_TITLE_STRAINER)
 
         # بررسی تگ title
         title_tag = soup.title
@@ -319,7 +332,7 @@ def extract_date(html_content):
 
     try:
         # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
 
         # بررسی تگ‌های time
         time_tags = soup.find_all('time')
@@ -372,7 +385,7 @@ def extract_author(html_content):
 
     try:
         # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
 
         # بررسی متا تگ‌ها
         meta_tags = soup.find_all('meta', attrs={'name': re.compile(r'author', re.I)})
@@ -424,8 +437,8 @@ def extract_links(html_content, base_url=None, internal_only=False):
         return []
 
     try:
-        # ایجاد شیء BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # ایجاد شیء BeautifulSoup (فقط لینک‌ها)
+        soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=_LINK_STRAINER)
 
         # دریافت تمام تگ‌های a با href
         links = []